@@ -0,0 +1,40 @@
+"""v0.3.4 - Add expression index for YouTube duplicate detection
+
+Revision ID: v034_add_youtube_id_index
+Revises: v020_add_system_settings
+Create Date: 2026-10-16
+
+Playlist and single-video imports check whether a YouTube video already
+exists in the user's library by filtering on metadata_raw->>'youtube_id'.
+Without an index on that expression PostgreSQL scans every media_file row
+of the user for each lookup.
+
+New index: idx_media_file_user_youtube_id
+    - (user_id, (metadata_raw->>'youtube_id'))
+    - Partial: only rows that carry a youtube_id
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "v034_add_youtube_id_index"
+down_revision = "v020_add_system_settings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the youtube_id expression index without locking media_file."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_file_user_youtube_id "
+            "ON media_file (user_id, (metadata_raw->>'youtube_id')) "
+            "WHERE (metadata_raw->>'youtube_id') IS NOT NULL"
+        )
+
+
+def downgrade():
+    """Drop the youtube_id expression index."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_media_file_user_youtube_id")
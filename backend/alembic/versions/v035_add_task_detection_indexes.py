@@ -0,0 +1,48 @@
+"""v0.3.5 - Add indexes for stuck/abandoned task detection
+
+Revision ID: v035_add_task_detection_indexes
+Revises: v034_add_youtube_id_index
+Create Date: 2026-10-16
+
+The periodic TaskDetectionService scan filters active tasks by updated_at
+and media files by status plus upload_time. With only single-column indexes
+on status, PostgreSQL reads every matching status row and then checks the
+timestamp on each one.
+
+New indexes:
+    idx_task_active_updated_at
+        - task (updated_at)
+        - Partial: only pending/in_progress tasks, which stays small
+    idx_media_file_status_upload_time
+        - media_file (status, upload_time)
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "v035_add_task_detection_indexes"
+down_revision = "v034_add_youtube_id_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the task detection indexes without locking task or media_file."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_task_active_updated_at "
+            "ON task (updated_at) "
+            "WHERE status IN ('pending', 'in_progress')"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_media_file_status_upload_time "
+            "ON media_file (status, upload_time)"
+        )
+
+
+def downgrade():
+    """Drop the task detection indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_media_file_status_upload_time")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_task_active_updated_at")
@@ -21,6 +21,7 @@ from celery import Celery  # noqa: E402
 from celery.schedules import crontab  # noqa: E402
 from celery.signals import task_postrun  # noqa: E402
 from celery.signals import worker_process_init  # noqa: E402
+from celery.signals import worker_process_shutdown  # noqa: E402
 
 from app.core.config import settings  # noqa: E402
 
@@ -111,6 +112,14 @@ def init_worker_process(**kwargs):
     engine.dispose()
 
 
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Release process-wide yt-dlp instances before the worker process exits."""
+    from app.services.media_download_service import close_cached_youtube_dl
+
+    close_cached_youtube_dl()
+
+
 @task_postrun.connect
 def close_session_after_task(**kwargs):
     """Close database connections after each task to prevent stale connections."""
@@ -95,6 +95,10 @@ class Settings(BaseSettings):
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "large-v2")
     PYANNOTE_MODEL: str = os.getenv("PYANNOTE_MODEL", "pyannote/speaker-diarization")
     HUGGINGFACE_TOKEN: Optional[str] = os.getenv("HUGGINGFACE_TOKEN", None)
+    # Compile the speaker embedding model with torch.compile (CUDA only, opt-in)
+    SPEAKER_EMBEDDING_COMPILE: bool = (
+        os.getenv("SPEAKER_EMBEDDING_COMPILE", "false").lower() == "true"
+    )
 
     # Speaker diarization settings
     MIN_SPEAKERS: int = int(os.getenv("MIN_SPEAKERS", "1"))
@@ -128,6 +132,10 @@ class Settings(BaseSettings):
     OPENROUTER_BASE_URL: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
 
+    # Media URL downloads (yt-dlp)
+    # Concurrent ffprobe/ffmpeg subprocesses per worker process (0 = one per CPU)
+    MAX_FFPROBE_PARALLELISM: int = int(os.getenv("MAX_FFPROBE_PARALLELISM", "0"))
+
     # Performance optimization properties
     @property
     def effective_use_gpu(self) -> bool:
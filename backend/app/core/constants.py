@@ -118,6 +118,7 @@ VALID_RECORDING_QUALITIES = ["standard", "high", "maximum"]
 LLM_DEFAULT_MAX_TOKENS = 2000
 LLM_DEFAULT_TEMPERATURE = 0.3
 LLM_DEFAULT_TIMEOUT = 60
+LLM_HEALTH_CHECK_CACHE_TTL = 5.0  # seconds to reuse a health check / availability result
 
 # OpenSearch settings
 OPENSEARCH_DEFAULT_SIZE = 20
@@ -37,6 +37,14 @@ class TaskRecoveryConfig:
     # Orphaned task threshold (in hours)
     ORPHANED_TASK_THRESHOLD: int = 1
 
+    # Time a PROCESSING file may go without task activity before it is
+    # considered stuck (in seconds). Task progress is only recorded when a step
+    # reports it, so this must cover the longest step in MAX_TASK_DURATIONS.
+    STUCK_FILE_THRESHOLD: int = 3600  # 1 hour
+
+    # Timeout when asking Celery workers for their running tasks (in seconds)
+    CELERY_INSPECT_TIMEOUT: float = 5.0
+
     def __post_init__(self):
         if self.MAX_TASK_DURATIONS is None:
             self.MAX_TASK_DURATIONS = {
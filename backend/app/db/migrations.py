@@ -57,11 +57,10 @@ def run_migrations() -> None:
         elif "user" in tables:
             # Existing database without Alembic tracking
             if "system_settings" in tables:
-                # Has v0.2.0 schema - stamp as current
+                # Has v0.2.0 schema - stamp it, then apply newer migrations
                 logger.info("Existing v0.2.0 database detected, stamping version...")
                 config = get_alembic_config()
                 command.stamp(config, "v020_add_system_settings")
-                return
             else:
                 # v0.1.0 database - stamp baseline
                 logger.info("Existing v0.1.0 database detected, stamping baseline...")
@@ -113,6 +113,10 @@ async def lifespan(app: FastAPI):
             with suppress(asyncio.CancelledError):
                 await task
 
+    from app.services.media_download_service import close_cached_youtube_dl
+
+    close_cached_youtube_dl()
+
 
 # Create FastAPI app with lifespan and consistent routing configuration
 app = FastAPI(
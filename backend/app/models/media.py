@@ -8,10 +8,12 @@ from sqlalchemy import DateTime
 from sqlalchemy import Enum
 from sqlalchemy import Float
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
 from sqlalchemy import UniqueConstraint
+from sqlalchemy import text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -107,6 +109,18 @@ class MediaFile(Base):
         DateTime(timezone=True), nullable=True
     )  # Last recovery attempt time
 
+    __table_args__ = (
+        # Composite index for stuck/pending file scans (see v035 migration)
+        Index("idx_media_file_status_upload_time", "status", "upload_time"),
+        # Expression index for YouTube duplicate checks (see v034 migration)
+        Index(
+            "idx_media_file_user_youtube_id",
+            "user_id",
+            text("(metadata_raw->>'youtube_id')"),
+            postgresql_where=text("(metadata_raw->>'youtube_id') IS NOT NULL"),
+        ),
+    )
+
     # Relationships
     user = relationship("User", back_populates="media_files")
     transcript_segments = relationship(
@@ -274,6 +288,15 @@ class Task(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(Text, nullable=True)
 
+    # Partial index for stale active-task scans (see v035 migration)
+    __table_args__ = (
+        Index(
+            "idx_task_active_updated_at",
+            "updated_at",
+            postgresql_where=text("status IN ('pending', 'in_progress')"),
+        ),
+    )
+
     # Relationships
     user = relationship("User")
     media_file = relationship("MediaFile", back_populates="tasks")
@@ -159,6 +159,18 @@ class SpeakerIdentificationResponse(BaseModel):
     speaker_count: int
 
 
+class SpeakerPrediction(BaseModel):
+    """Single speaker prediction returned by LLM speaker identification"""
+
+    model_config = ConfigDict(extra="allow")
+
+    speaker_label: str = Field(..., description="Diarization label, e.g. SPEAKER_1")
+    predicted_name: str = Field(..., description="Predicted speaker name")
+    confidence: float = Field(..., description="Confidence score (0.0-1.0)")
+    reasoning: Optional[str] = Field(None, description="Evidence supporting the prediction")
+    evidence_types: list[str] = Field(default_factory=list, description="Kinds of evidence used")
+
+
 class SummaryTaskRequest(BaseModel):
     force_regenerate: bool = False
 
@@ -5,24 +5,68 @@ Provides unified interface for multiple LLM providers using synchronous HTTP req
 Designed specifically for Celery tasks - no asyncio conflicts.
 """
 
+import asyncio
+import hashlib
 import json
 import logging
 import re
+import threading
 import time
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property
+from functools import lru_cache
 from typing import Any
 from typing import Optional
 
 import requests
+from pydantic import ValidationError
+from pydantic_core import from_json
+from pydantic_core import to_json
 from requests.adapters import HTTPAdapter
+from sqlalchemy import String
+from sqlalchemy import and_
+from sqlalchemy import cast
+from sqlalchemy.orm import Session
 from urllib3.util.retry import Retry
 
 from app.core.config import settings
+from app.core.constants import LLM_HEALTH_CHECK_CACHE_TTL
 from app.core.constants import LLM_OUTPUT_LANGUAGES
+from app.schemas.summary import SpeakerPrediction
 
 logger = logging.getLogger(__name__)
 
+# Process-wide caches so bursts of status polling collapse into a single HTTP probe.
+# Health results are keyed by (provider, base_url, model, API key digest); availability
+# by user_id.
+_HEALTH_CACHE: dict[tuple, tuple[float, bool]] = {}
+_AVAILABILITY_CACHE: dict[Optional[int], tuple[float, bool]] = {}
+_HEALTH_LOCK = threading.Lock()
+# Fixed stripe of probe locks (keys hash onto one), so the lock set never grows
+_HEALTH_PROBE_LOCKS = tuple(threading.Lock() for _ in range(16))
+
+
+def _api_key_digest(api_key: Optional[str]) -> str:
+    """Digest used in cache keys so health results are never shared across API keys."""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()
+
+
+# Matches a whole response wrapped in a markdown code fence, capturing the fenced body
+_FENCED_JSON_RE = re.compile(r"\A```\s*(?:json|JSON)?\s*(.*?)\s*```\Z", re.DOTALL)
+
+# Reusable decoder for locating JSON objects embedded in free-form LLM output
+_JSON_DECODER = json.JSONDecoder()
+
+# Connection pool shared by all LLMService instances (see _get_shared_session)
+_SHARED_SESSION: Optional[requests.Session] = None
+_SHARED_SESSION_LOCK = threading.Lock()
+_SHARED_POOL_MAXSIZE = 32
+
+# Caps in-flight LLM requests per process to the pool size, so bursts of concurrent
+# identifications queue for a pooled connection instead of opening extra sockets
+_LLM_REQUEST_SEMAPHORE = threading.BoundedSemaphore(_SHARED_POOL_MAXSIZE)
+
 # OpenAI reasoning models that don't support temperature/sampling parameters
 # These models use internal reasoning processes incompatible with temperature control
 # See: https://learn.microsoft.com/en-us/azure/ai-foundry/openai/how-to/reasoning
@@ -33,6 +77,102 @@ OPENAI_REASONING_MODEL_PREFIXES = (
     "gpt-5",  # gpt-5 series
 )
 
+# Static portions of the speaker identification prompts, built once at import time
+_SPEAKER_ID_SYSTEM_INTRO = "You are an expert linguist and conversation analyst specializing in speaker identification. Your task is to analyze transcripts and identify speakers based on multiple contextual clues."
+
+_SPEAKER_ID_SYSTEM_GUIDELINES = """ANALYSIS METHODOLOGY:
+1. Speech Patterns & Style:
+   - Vocabulary complexity and professional terminology
+   - Sentence structure and communication style
+   - Use of technical jargon, industry-specific language
+   - Formal vs. informal speech patterns
+
+2. Content Analysis:
+   - Topics of expertise and knowledge domains
+   - Professional roles and responsibilities mentioned
+   - Personal anecdotes or experiences shared
+   - Areas where speakers demonstrate authority or deep knowledge
+
+3. Conversational Dynamics:
+   - Who asks questions vs. provides answers
+   - Leadership patterns and decision-making roles
+   - Deference patterns between speakers
+   - Introduction patterns and name mentions
+
+4. Context Clues:
+   - Direct name mentions in conversation
+   - Role references ("as the CEO", "from engineering", etc.)
+   - Historical context from previous conversations
+   - Cross-references to known speaker profiles
+
+CONFIDENCE SCORING:
+- 0.9-1.0: Multiple strong indicators align (name mentioned + role + speech pattern match)
+- 0.7-0.89: Strong contextual match with known profile (expertise area + communication style)
+- 0.5-0.69: Moderate confidence based on partial indicators
+- Below 0.5: Insufficient evidence for reliable identification
+
+Only provide predictions with confidence >= 0.5. Explain your reasoning clearly for each identification."""
+
+_SPEAKER_ID_TASK_INSTRUCTIONS = """TASK:
+Analyze this conversation transcript and identify each speaker label based on the methodology described. Look for patterns in:
+- Speech complexity and professional vocabulary usage
+- Areas of expertise demonstrated through conversation content
+- Leadership and authority patterns in the discussion
+- Any direct or indirect name mentions or role references
+- Communication styles and interpersonal dynamics
+
+For each speaker you can identify with reasonable confidence (>=0.5), provide a detailed analysis.
+
+RESPONSE FORMAT (JSON):
+{
+    "speaker_predictions": [
+        {
+            "speaker_label": "SPEAKER_1",
+            "predicted_name": "John Smith",
+            "confidence": 0.85,
+            "reasoning": "Detailed explanation of evidence including speech patterns, expertise areas, and specific quotes or behaviors that led to this identification",
+            "evidence_types": ["speech_pattern", "expertise", "role_reference", "name_mention"]
+        }
+    ],
+    "overall_confidence": "high",
+    "analysis_notes": "Brief summary of the identification process and any challenges encountered"
+}
+
+IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confidently identify any speakers, return an empty predictions array."""
+
+
+def _get_shared_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session used for all LLM requests.
+
+    Creating a session per LLMService meant a fresh TCP + TLS handshake for every
+    service built by create_from_settings() / is_llm_available(). A single pooled
+    session keeps connections to each provider alive between calls.
+    """
+    global _SHARED_SESSION
+    if _SHARED_SESSION is not None:
+        return _SHARED_SESSION
+
+    with _SHARED_SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            session = requests.Session()
+            # Retry strategy for reliability
+            retry_strategy = Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["HEAD", "GET", "POST"],
+            )
+            adapter = HTTPAdapter(
+                max_retries=retry_strategy,
+                pool_connections=_SHARED_POOL_MAXSIZE,
+                pool_maxsize=_SHARED_POOL_MAXSIZE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SHARED_SESSION = session
+    return _SHARED_SESSION
+
 
 class LLMProvider(str, Enum):
     OPENAI = "openai"
@@ -78,34 +218,18 @@ class LLMService:
         self.config = config
         self.user_context_window = config.max_tokens  # Store user's context window setting
 
-        # Create session with retry strategy for reliability
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "POST"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Reuse the process-wide pooled session so TCP/TLS connections survive across instances
+        self.session = _get_shared_session()
 
         # Provider-specific endpoint mappings
         def build_endpoint(base_url: str) -> str:
             """Build chat completions endpoint"""
-            clean_url = base_url.strip().rstrip("/")
-            if clean_url.endswith("/v1"):
-                return f"{clean_url}/chat/completions"
-            else:
-                return f"{clean_url}/v1/chat/completions"
+            return base_url.strip().rstrip("/").removesuffix("/v1") + "/v1/chat/completions"
 
         def build_ollama_endpoint(base_url: str) -> str:
             """Build Ollama chat endpoint using native API"""
-            clean_url = base_url.strip().rstrip("/")
             # Remove /v1 suffix if present since we're using native API
-            if clean_url.endswith("/v1"):
-                clean_url = clean_url[:-3]
-            return f"{clean_url}/api/chat"
+            return base_url.strip().rstrip("/").removesuffix("/v1") + "/api/chat"
 
         self.endpoints = {
             # Dynamic endpoints - respect custom base_url for OpenAI-compatible servers (vLLM, etc.)
@@ -128,6 +252,10 @@ class LLMService:
         if not self.endpoints.get(config.provider):
             raise ValueError(f"Invalid provider configuration for {config.provider}")
 
+        # Resolve models endpoints once - config does not change for the lifetime of the service
+        self._models_url = self._build_models_url(config.base_url)
+        self._connection_test_url = self._build_connection_test_url(self.endpoints[config.provider])
+
         # Log the resolved endpoint for debugging (helps diagnose connection issues like Issue #100)
         resolved_endpoint = self.endpoints.get(config.provider)
         logger.info(
@@ -151,7 +279,32 @@ class LLMService:
         model_lower = self.config.model.lower()
         return any(model_lower.startswith(prefix) for prefix in OPENAI_REASONING_MODEL_PREFIXES)
 
-    def _get_headers(self) -> dict[str, str]:
+    @staticmethod
+    def _build_models_url(base_url: Optional[str]) -> Optional[str]:
+        """Build the OpenAI-compatible models endpoint used by health checks."""
+        clean_url = base_url.strip().rstrip("/") if base_url else None
+        if not clean_url:
+            return None
+        return clean_url.removesuffix("/v1") + "/v1/models"
+
+    @staticmethod
+    def _build_connection_test_url(chat_endpoint: str) -> str:
+        """
+        Derive the models endpoint from the chat completions endpoint.
+
+        This ensures connection tests hit the same server that chat_completion() will use,
+        e.g. http://host:8000/v1/chat/completions -> http://host:8000/v1/models
+        """
+        if "/chat/completions" in chat_endpoint:
+            return chat_endpoint.replace("/chat/completions", "/models")
+        if "/api/chat" in chat_endpoint:
+            # Ollama uses /api/chat, models endpoint is /api/tags
+            return chat_endpoint.replace("/api/chat", "/api/tags")
+        # Fallback: try appending /models to base
+        return chat_endpoint.rsplit("/", 1)[0] + "/models"
+
+    @cached_property
+    def _headers(self) -> dict[str, str]:
         """
         Get headers for API request based on provider.
 
@@ -361,22 +514,29 @@ class LLMService:
 
     def _send_llm_request(self, url: str, payload: dict, headers: dict, timeout: int) -> dict:
         """Send HTTP request to LLM provider and return parsed JSON response."""
-        start_time = time.time()
-        response = self.session.post(url, json=payload, headers=headers, timeout=timeout)
-        request_time = time.time() - start_time
+        # Serialize straight to UTF-8 bytes in one pass; json= would build a str and then
+        # encode it, holding two full copies of a large transcript prompt in memory
+        body = to_json(payload)
+
+        with _LLM_REQUEST_SEMAPHORE:
+            start_time = time.time()
+            response = self.session.post(url, data=body, headers=headers, timeout=timeout)
+            request_time = time.time() - start_time
 
         logger.info(
             f"LLM request completed in {request_time:.2f}s with status {response.status_code}"
         )
 
         if response.status_code != 200:
-            error_detail = f"LLM API error ({response.status_code}): {response.text[:500]}{'...' if len(response.text) > 500 else ''}"
+            response_text = response.text
+            error_detail = f"LLM API error ({response.status_code}): {response_text[:500]}{'...' if len(response_text) > 500 else ''}"
             logger.error(error_detail)
-            raise Exception(f"LLM API error: {response.status_code} - {response.text}")
+            raise Exception(f"LLM API error: {response.status_code} - {response_text}")
 
         try:
-            return response.json()
-        except json.JSONDecodeError as e:
+            # Parse the raw body bytes directly - skips the intermediate str decode
+            return from_json(response.content)
+        except ValueError as e:
             logger.error(f"Failed to parse LLM response: {response.text}")
             raise Exception(f"Invalid JSON response: {e}") from e
 
@@ -385,7 +545,7 @@ class LLMService:
         Send chat completion request to LLM provider
         """
         url = self.endpoints[self.config.provider]
-        headers = self._get_headers()
+        headers = self._headers
         payload = self._prepare_payload(messages, **kwargs)
 
         total_content_length = sum(len(msg.get("content", "")) for msg in messages)
@@ -713,13 +873,10 @@ class LLMService:
 
         try:
             content = response.content.strip()
-            if content.startswith("```json") and content.endswith("```"):
-                content = content[7:-3].strip()
-            elif content.startswith("```") and content.endswith("```"):
-                content = content[3:-3].strip()
-
-            return json.loads(content)
-        except json.JSONDecodeError as e:
+            if not content.startswith("{"):
+                content = self._strip_markdown_fences(content)
+            return from_json(content)
+        except ValueError as e:
             logger.error(f"Failed to parse section {section_num} JSON: {e}")
             return {
                 "key_points": [f"Section {section_num}: Failed to parse structured summary"],
@@ -799,42 +956,37 @@ class LLMService:
         try:
             content = response.content.strip()
 
-            # Handle response prefilling: if content starts with partial JSON due to prefill,
-            # prepend the opening brace that was used in prefilling
-            if not content.startswith("{") and not content.startswith("```"):
-                content = "{" + content
-
-            # Extract JSON from code blocks
-            if content.startswith("```json") and content.endswith("```"):
-                content = content[7:-3].strip()
-            elif content.startswith("```") and content.endswith("```"):
-                content = content[3:-3].strip()
+            # Fast path: well-behaved providers return a bare JSON object
+            if not content.startswith("{"):
+                if content.startswith("```"):
+                    # Extract JSON from code blocks
+                    content = self._strip_markdown_fences(content)
+                else:
+                    # Handle response prefilling: content starts with partial JSON due to
+                    # prefill, so prepend the opening brace that was used in prefilling
+                    content = "{" + content
 
             # Parse JSON - accept ANY structure
-            summary_data = json.loads(content)
+            summary_data = from_json(content)
 
             # NO FIELD VALIDATION - accept any structure from custom prompts
 
             # Add metadata
-            metadata = {
+            summary_data["metadata"] = {
                 "provider": self.config.provider.value,
                 "model": self.config.model,
                 "usage_tokens": response.usage_tokens,
                 "transcript_length": transcript_length,
                 "user_context_window": self.user_context_window,
+                **(extra_metadata or {}),
             }
 
-            if extra_metadata:
-                metadata.update(extra_metadata)
-
-            summary_data["metadata"] = metadata
-
             logger.info(
                 f"Successfully parsed flexible summary with fields: {list(summary_data.keys())}"
             )
             return summary_data
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse summary JSON: {e}")
             logger.error(f"Response content: {response.content[:500]}...")
 
@@ -862,7 +1014,7 @@ class LLMService:
             Tuple of (success, message)
         """
         try:
-            headers = self._get_headers()
+            headers = self._headers
 
             # Claude/Anthropic providers don't have a models endpoint, test with a simple request
             if self.config.provider in [LLMProvider.CLAUDE, LLMProvider.ANTHROPIC]:
@@ -878,22 +1030,8 @@ class LLMService:
                     return False, "Connection established but model returned empty response"
 
             else:
-                # For OpenAI-compatible providers, derive models endpoint from chat completions endpoint
-                # This ensures we test the same server that chat_completion() will use
-                chat_endpoint = self.endpoints.get(self.config.provider)
-                if not chat_endpoint:
-                    return False, f"No endpoint configured for {self.config.provider}"
-
-                # Derive models endpoint from chat completions endpoint
-                # e.g., http://host:8000/v1/chat/completions → http://host:8000/v1/models
-                if "/chat/completions" in chat_endpoint:
-                    models_url = chat_endpoint.replace("/chat/completions", "/models")
-                elif "/api/chat" in chat_endpoint:
-                    # Ollama uses /api/chat, models endpoint is /api/tags
-                    models_url = chat_endpoint.replace("/api/chat", "/api/tags")
-                else:
-                    # Fallback: try appending /models to base
-                    models_url = chat_endpoint.rsplit("/", 1)[0] + "/models"
+                chat_endpoint = self.endpoints[self.config.provider]
+                models_url = self._connection_test_url
 
                 logger.debug(
                     f"Testing connection to {self.config.provider}: {models_url} (derived from {chat_endpoint})"
@@ -913,35 +1051,34 @@ class LLMService:
 
     def close(self):
         """
-        Close the session and clean up resources.
+        Release resources held by this LLMService instance.
 
-        Properly closes the HTTP session and releases any held connections.
-        Should be called when the LLMService instance is no longer needed.
+        The underlying HTTP session is shared across instances and kept open so its
+        pooled connections can be reused; this method is retained for API compatibility
+        and for use with context managers.
         """
-        if hasattr(self, "session"):
-            try:
-                self.session.close()
-                logger.debug(f"Closed session for {self.config.provider}")
-            except Exception as e:
-                logger.warning(f"Error closing session: {e}")
+        logger.debug(f"Released LLMService for {self.config.provider}")
 
     def _build_known_speakers_context(self, known_speakers: list) -> str:
         """Build context string from known speaker profiles."""
         if not known_speakers:
             return "\n\nNo known speaker profiles provided for comparison.\n"
 
-        context = "\n\nKNOWN SPEAKER PROFILES:\n"
-        for i, speaker in enumerate(known_speakers[:15]):  # Limit to prevent token overflow
-            description = speaker.get("description", "No description available")
-            context += f"{i + 1}. {speaker['name']}: {description}\n"
-        return context
+        # Limit to 15 profiles to prevent token overflow
+        profiles = "".join(
+            f"{i}. {speaker['name']}: {speaker.get('description', 'No description available')}\n"
+            for i, speaker in enumerate(known_speakers[:15], 1)
+        )
+        return "\n\nKNOWN SPEAKER PROFILES:\n" + profiles
 
     def _truncate_transcript_for_speakers(self, transcript: str, available_tokens: int) -> str:
         """Truncate transcript while preserving beginning and end context."""
-        max_chars = available_tokens * 3  # Rough char to token ratio
-        if len(transcript) <= max_chars:
+        estimated_tokens = self._estimate_tokens(transcript)
+        if estimated_tokens <= available_tokens:
             return transcript
 
+        # Scale by the transcript's own chars-per-token ratio so the kept text fills the budget
+        max_chars = int(len(transcript) * available_tokens / estimated_tokens)
         half_length = max_chars // 2
         return (
             transcript[:half_length]
@@ -949,65 +1086,53 @@ class LLMService:
             + transcript[-half_length:]
         )
 
-    def _strip_markdown_fences(self, content: str) -> str:
-        """Remove markdown code fences from content."""
-        if content.startswith("```json") and "```" in content[7:]:
-            fence_end = content.find("```", 7)
-            return content[7:fence_end].strip()
-
-        if content.startswith("```") and "```" in content[3:]:
-            fence_end = content.find("```", 3)
-            result = content[3:fence_end].strip()
-            if result.startswith(("json", "JSON")):
-                return result[4:].lstrip()
-            return result
+    @staticmethod
+    def _strip_markdown_fences(content: str) -> str:
+        """Remove a markdown code fence (```json ... ```) wrapping the whole content."""
+        match = _FENCED_JSON_RE.match(content)
+        return match.group(1) if match else content
 
-        return content
+    def _decode_json_from_response(self, content: str) -> Any:
+        """
+        Extract and decode the first JSON object embedded in LLM response content.
 
-    def _find_json_object_bounds(self, content: str) -> str:
-        """Find and extract complete JSON object from content."""
-        json_start = content.find("{")
-        if json_start > 0:
-            content = content[json_start:]
+        Uses the C-accelerated json scanner (raw_decode) to locate the end of the object
+        in a single pass, which also handles braces inside string values correctly.
 
+        Raises:
+            json.JSONDecodeError: If no valid JSON value can be decoded
+        """
         if not content.startswith("{"):
-            return content
-
-        brace_count = 0
-        for i, char in enumerate(content):
-            if char == "{":
-                brace_count += 1
-            elif char == "}":
-                brace_count -= 1
-                if brace_count == 0:
-                    return content[: i + 1]
-
-        return content
-
-    def _extract_json_from_response(self, content: str) -> str:
-        """Extract and clean JSON from LLM response content."""
-        content = self._strip_markdown_fences(content)
-        return self._find_json_object_bounds(content)
-
-    def _validate_speaker_prediction(self, pred: dict) -> bool:
-        """Validate a single speaker prediction has required fields and sufficient confidence."""
-        if not isinstance(pred, dict):
-            return False
+            content = self._strip_markdown_fences(content)
+            json_start = content.find("{")
+            if json_start > 0:
+                content = content[json_start:]
 
-        required_fields = ["speaker_label", "predicted_name", "confidence"]
-        if not all(field in pred for field in required_fields):
-            logger.warning(f"Skipping prediction with missing fields: {pred}")
-            return False
+        result, _ = _JSON_DECODER.raw_decode(content)
+        return result
 
-        confidence = pred.get("confidence", 0.0)
-        return isinstance(confidence, (int, float)) and confidence >= 0.5
+    def _validate_speaker_prediction(self, pred: Any) -> Optional[dict]:
+        """
+        Validate a single speaker prediction against the SpeakerPrediction schema.
+
+        Returns:
+            The validated prediction dict if it is well-formed with confidence >= 0.5,
+            otherwise None
+        """
+        try:
+            prediction = SpeakerPrediction.model_validate(pred)
+        except ValidationError:
+            logger.warning(f"Skipping invalid speaker prediction: {pred}")
+            return None
+
+        if prediction.confidence < 0.5:
+            return None
+        return prediction.model_dump(exclude_unset=True)
 
     def _parse_speaker_identification_response(self, response: LLMResponse) -> dict:
         """Parse and validate speaker identification LLM response."""
-        content = self._extract_json_from_response(response.content.strip())
-
         try:
-            result = json.loads(content)
+            result = self._decode_json_from_response(response.content.strip())
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM identification response as JSON: {e}")
             logger.error(f"Raw response content: {response.content[:500]}...")
@@ -1035,7 +1160,11 @@ class LLMService:
                 "error": "Invalid response format - speaker_predictions must be a list",
             }
 
-        valid_predictions = [p for p in predictions if self._validate_speaker_prediction(p)]
+        valid_predictions = [
+            validated
+            for pred in predictions
+            if (validated := self._validate_speaker_prediction(pred)) is not None
+        ]
 
         logger.info(
             f"Speaker identification completed: {len(valid_predictions)} valid predictions from {len(predictions)} total"
@@ -1079,52 +1208,22 @@ class LLMService:
             else:
                 language_instruction = ""
 
-            system_prompt = f"""You are an expert linguist and conversation analyst specializing in speaker identification. Your task is to analyze transcripts and identify speakers based on multiple contextual clues.{language_instruction}
-
-ANALYSIS METHODOLOGY:
-1. Speech Patterns & Style:
-   - Vocabulary complexity and professional terminology
-   - Sentence structure and communication style
-   - Use of technical jargon, industry-specific language
-   - Formal vs. informal speech patterns
-
-2. Content Analysis:
-   - Topics of expertise and knowledge domains
-   - Professional roles and responsibilities mentioned
-   - Personal anecdotes or experiences shared
-   - Areas where speakers demonstrate authority or deep knowledge
-
-3. Conversational Dynamics:
-   - Who asks questions vs. provides answers
-   - Leadership patterns and decision-making roles
-   - Deference patterns between speakers
-   - Introduction patterns and name mentions
-
-4. Context Clues:
-   - Direct name mentions in conversation
-   - Role references ("as the CEO", "from engineering", etc.)
-   - Historical context from previous conversations
-   - Cross-references to known speaker profiles
-
-CONFIDENCE SCORING:
-- 0.9-1.0: Multiple strong indicators align (name mentioned + role + speech pattern match)
-- 0.7-0.89: Strong contextual match with known profile (expertise area + communication style)
-- 0.5-0.69: Moderate confidence based on partial indicators
-- Below 0.5: Insufficient evidence for reliable identification
-
-Only provide predictions with confidence >= 0.5. Explain your reasoning clearly for each identification."""
+            system_prompt = f"{_SPEAKER_ID_SYSTEM_INTRO}{language_instruction}\n\n{_SPEAKER_ID_SYSTEM_GUIDELINES}"
 
             known_speakers_context = self._build_known_speakers_context(known_speakers)
 
+            # Order-preserving de-duplication with a single lookup per segment
             speaker_labels = list(
-                set(
-                    seg.get("speaker_label", "Unknown")
-                    for seg in speaker_segments
-                    if seg.get("speaker_label")
+                dict.fromkeys(
+                    label for seg in speaker_segments if (label := seg.get("speaker_label"))
                 )
             )
 
-            reserved_tokens = len(system_prompt) // 3 + len(known_speakers_context) // 3 + 2500
+            reserved_tokens = (
+                self._estimate_tokens(system_prompt)
+                + self._estimate_tokens(known_speakers_context)
+                + 2500
+            )
             available_tokens = max(1000, self.user_context_window - reserved_tokens)
             transcript_content = self._truncate_transcript_for_speakers(
                 transcript, available_tokens
@@ -1136,32 +1235,7 @@ Only provide predictions with confidence >= 0.5. Explain your reasoning clearly
 CURRENT SPEAKER LABELS: {", ".join(speaker_labels)}
 {known_speakers_context}
 
-TASK:
-Analyze this conversation transcript and identify each speaker label based on the methodology described. Look for patterns in:
-- Speech complexity and professional vocabulary usage
-- Areas of expertise demonstrated through conversation content
-- Leadership and authority patterns in the discussion
-- Any direct or indirect name mentions or role references
-- Communication styles and interpersonal dynamics
-
-For each speaker you can identify with reasonable confidence (>=0.5), provide a detailed analysis.
-
-RESPONSE FORMAT (JSON):
-{{
-    "speaker_predictions": [
-        {{
-            "speaker_label": "SPEAKER_1",
-            "predicted_name": "John Smith",
-            "confidence": 0.85,
-            "reasoning": "Detailed explanation of evidence including speech patterns, expertise areas, and specific quotes or behaviors that led to this identification",
-            "evidence_types": ["speech_pattern", "expertise", "role_reference", "name_mention"]
-        }}
-    ],
-    "overall_confidence": "high",
-    "analysis_notes": "Brief summary of the identification process and any challenges encountered"
-}}
-
-IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confidently identify any speakers, return an empty predictions array."""
+{_SPEAKER_ID_TASK_INSTRUCTIONS}"""
 
             messages = [
                 {"role": "system", "content": system_prompt},
@@ -1189,6 +1263,37 @@ IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confid
             logger.error(f"Speaker identification failed with error: {e}", exc_info=True)
             return {"speaker_predictions": [], "error": f"Identification process failed: {str(e)}"}
 
+    async def identify_speakers_async(
+        self,
+        transcript: str,
+        speaker_segments: list,
+        known_speakers: list,
+        output_language: str = "en",
+    ) -> dict:
+        """
+        Async variant of identify_speakers() for use from an event loop.
+
+        Prompt assembly and the blocking LLM request run in a worker thread, so several
+        identifications can be awaited concurrently (e.g. with asyncio.gather) while the
+        shared connection pool keeps their HTTP connections warm.
+
+        Args:
+            transcript: Full transcript text with speaker labels
+            speaker_segments: List of speaker segments with metadata including timestamps and text
+            known_speakers: List of known speaker profiles with names and descriptions
+            output_language: Language code for output reasoning (default: "en")
+
+        Returns:
+            Dictionary containing speaker predictions with confidence scores and reasoning
+        """
+        return await asyncio.to_thread(
+            self.identify_speakers,
+            transcript,
+            speaker_segments,
+            known_speakers,
+            output_language,
+        )
+
     def __enter__(self):
         """Context manager entry."""
         return self
@@ -1201,26 +1306,51 @@ IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confid
         """
         Quick health check using the models endpoint
 
+        Results are cached process-wide for LLM_HEALTH_CHECK_CACHE_TTL seconds per
+        (provider, base_url, model, API key). While one caller refreshes an expired result,
+        others get the previous result instead of waiting on the probe.
+
         Returns:
             True if LLM is available, False otherwise
         """
+        key = (
+            self.config.provider,
+            self.config.base_url,
+            self.config.model,
+            _api_key_digest(self.config.api_key),
+        )
+        with _HEALTH_LOCK:
+            checked_at, cached_ok = _HEALTH_CACHE.get(key, (0.0, None))
+        if cached_ok is not None and time.monotonic() - checked_at < LLM_HEALTH_CHECK_CACHE_TTL:
+            logger.debug(f"Using cached health check result for {self.config.provider}")
+            return cached_ok
+
+        probe_lock = _HEALTH_PROBE_LOCKS[hash(key) % len(_HEALTH_PROBE_LOCKS)]
+        if not probe_lock.acquire(blocking=False):
+            # A probe is already in flight; don't queue behind a slow endpoint
+            if cached_ok is not None:
+                return cached_ok
+            return self._probe_models_endpoint()
+
         try:
-            headers = self._get_headers()
+            result = self._probe_models_endpoint()
+        finally:
+            probe_lock.release()
+        with _HEALTH_LOCK:
+            _HEALTH_CACHE[key] = (time.monotonic(), result)
+        return result
 
-            # Build models endpoint URL
-            base_url = self.config.base_url.strip().rstrip("/") if self.config.base_url else None
-            if not base_url:
+    def _probe_models_endpoint(self) -> bool:
+        """Query the models endpoint and verify the configured model is served."""
+        try:
+            models_url = self._models_url
+            if not models_url:
                 logger.info("Health check failed: No base URL configured")
                 return False
 
-            if base_url.endswith("/v1"):
-                models_url = f"{base_url}/models"
-            else:
-                models_url = f"{base_url}/v1/models"
-
             logger.info(f"Health check using models endpoint: {models_url}")
 
-            response = self.session.get(models_url, headers=headers, timeout=10)
+            response = self.session.get(models_url, headers=self._headers, timeout=10)
             logger.info(f"Health check response status: {response.status_code}")
 
             if response.status_code == 200:
@@ -1274,45 +1404,45 @@ IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confid
         return None
 
     @staticmethod
-    def create_from_user_settings(user_id: int) -> Optional["LLMService"]:
-        """Create LLMService from user-specific database settings"""
+    def create_from_user_settings(
+        user_id: int, db: Optional[Session] = None
+    ) -> Optional["LLMService"]:
+        """
+        Create LLMService from user-specific database settings
+
+        Args:
+            user_id: User whose active LLM configuration should be loaded
+            db: Optional database session (creates new one if not provided)
+        """
         from app import models
         from app.db.base import SessionLocal
         from app.models.user_llm_settings import UserLLMSettings
         from app.utils.encryption import decrypt_api_key
 
-        db = SessionLocal()
-        try:
-            # Get user's active LLM configuration
-            active_config_setting = (
-                db.query(models.UserSetting)
-                .filter(
-                    models.UserSetting.user_id == user_id,
-                    models.UserSetting.setting_key == "active_llm_config_id",
-                )
-                .first()
-            )
+        should_close_db = db is None
+        if db is None:
+            db = SessionLocal()
 
-            if not active_config_setting or not active_config_setting.setting_value:
-                logger.info(
-                    f"No active LLM configuration for user {user_id}, checking system settings"
-                )
-                return LLMService.create_from_system_settings()
-
-            # Get the active LLM configuration
-            active_config_id = int(active_config_setting.setting_value)
+        try:
+            # Resolve the user's active LLM configuration in a single round-trip by joining
+            # on the "active_llm_config_id" setting rather than fetching it separately
             user_settings = (
                 db.query(UserLLMSettings)
-                .filter(
-                    UserLLMSettings.user_id == user_id,
-                    UserLLMSettings.id == active_config_id,
+                .join(
+                    models.UserSetting,
+                    and_(
+                        models.UserSetting.user_id == UserLLMSettings.user_id,
+                        models.UserSetting.setting_key == "active_llm_config_id",
+                        models.UserSetting.setting_value == cast(UserLLMSettings.id, String),
+                    ),
                 )
+                .filter(UserLLMSettings.user_id == user_id)
                 .first()
             )
 
             if not user_settings:
-                logger.warning(
-                    f"Active LLM config {active_config_id} not found for user {user_id}, checking system settings"
+                logger.info(
+                    f"No active LLM configuration for user {user_id}, checking system settings"
                 )
                 return LLMService.create_from_system_settings()
 
@@ -1351,7 +1481,8 @@ IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confid
             )
             return LLMService.create_from_system_settings()
         finally:
-            db.close()
+            if should_close_db:
+                db.close()
 
     @staticmethod
     def _get_provider_config(
@@ -1444,8 +1575,15 @@ IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confid
         return model, api_key, base_url
 
     @staticmethod
-    def create_from_system_settings() -> Optional["LLMService"]:
-        """Create LLMService from system settings"""
+    @lru_cache(maxsize=1)
+    def _build_system_config() -> Optional[LLMConfig]:
+        """
+        Validate system LLM settings and build the corresponding LLMConfig.
+
+        System settings come from the environment and are fixed for the lifetime of the
+        process, so the validated config is computed once and shared. Services are still
+        created per call because each caller owns (and closes) its own instance.
+        """
         if not settings.LLM_PROVIDER or settings.LLM_PROVIDER.strip() == "":
             logger.info("No LLM provider configured (LLM_PROVIDER not set)")
             return None
@@ -1461,19 +1599,25 @@ IMPORTANT: Only include predictions with confidence >= 0.5. If you cannot confid
             return None
 
         model, api_key, base_url = provider_config
+        return LLMConfig(
+            provider=provider,
+            model=model,
+            api_key=api_key,
+            base_url=base_url,
+            max_tokens=32768,  # Conservative system default
+            temperature=0.3,
+        )
 
-        try:
-            config = LLMConfig(
-                provider=provider,
-                model=model,
-                api_key=api_key,
-                base_url=base_url,
-                max_tokens=32768,  # Conservative system default
-                temperature=0.3,
-            )
+    @staticmethod
+    def create_from_system_settings() -> Optional["LLMService"]:
+        """Create LLMService from system settings"""
+        config = LLMService._build_system_config()
+        if config is None:
+            return None
 
+        try:
             logger.info(
-                f"Created LLMService from system settings: {provider}/{model}, context_window={config.max_tokens}"
+                f"Created LLMService from system settings: {config.provider}/{config.model}, context_window={config.max_tokens}"
             )
             return LLMService(config)
         except Exception as e:
@@ -1512,28 +1656,48 @@ async def is_llm_available(user_id: Optional[int] = None) -> bool:
     """
     Quick check to see if any LLM provider is available
 
+    Results are cached per user for LLM_HEALTH_CHECK_CACHE_TTL seconds so that
+    UI polling does not trigger a service build and HTTP probe on every request.
+
     Args:
         user_id: Optional user ID to check user-specific LLM settings
 
     Returns:
         True if at least one LLM provider is available, False otherwise
     """
-    try:
-        logger.info(f"Checking LLM availability for user {user_id}")
-        # First check if we can even create an LLM service
-        llm_service = LLMService.create_from_settings(user_id=user_id)
-        if llm_service is None:
-            logger.info("No LLM service configured")
-            return False
+    with _HEALTH_LOCK:
+        checked_at, cached_ok = _AVAILABILITY_CACHE.get(user_id, (0.0, None))
+    if cached_ok is not None and time.monotonic() - checked_at < LLM_HEALTH_CHECK_CACHE_TTL:
+        logger.debug(f"Using cached LLM availability for user {user_id}: {cached_ok}")
+        return cached_ok
 
-        logger.info(
-            f"LLM service created successfully: {llm_service.config.provider}/{llm_service.config.model}"
-        )
-        # Then check if it's actually working
-        health_ok = llm_service.health_check()
-        logger.info(f"Health check result: {health_ok}")
-        llm_service.close()
-        return health_ok
+    try:
+        # Service creation hits the database and the probe is blocking HTTP - keep both
+        # off the event loop so concurrent API requests are not stalled
+        health_ok = await asyncio.to_thread(_check_llm_available, user_id)
     except Exception as e:
         logger.error(f"LLM availability check failed: {e}", exc_info=True)
         return False
+
+    with _HEALTH_LOCK:
+        _AVAILABILITY_CACHE[user_id] = (time.monotonic(), health_ok)
+    return health_ok
+
+
+def _check_llm_available(user_id: Optional[int]) -> bool:
+    """Build the user's LLM service and run its health check (blocking)."""
+    logger.info(f"Checking LLM availability for user {user_id}")
+    # First check if we can even create an LLM service
+    llm_service = LLMService.create_from_settings(user_id=user_id)
+    if llm_service is None:
+        logger.info("No LLM service configured")
+        return False
+
+    logger.info(
+        f"LLM service created successfully: {llm_service.config.provider}/{llm_service.config.model}"
+    )
+    # Then check if it's actually working
+    health_ok = llm_service.health_check()
+    logger.info(f"Health check result: {health_ok}")
+    llm_service.close()
+    return health_ok
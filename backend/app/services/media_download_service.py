@@ -6,35 +6,65 @@ video downloading, metadata extraction, and integration with the media processin
 Supports YouTube, Vimeo, Twitter/X, TikTok, and 1800+ other platforms via yt-dlp.
 """
 
+import hashlib
 import io
+import json
 import logging
 import os
 import re
 import shutil
+import string
+import subprocess
 import tempfile
+import threading
 import uuid
+import weakref
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
+from typing import BinaryIO
 from typing import Callable
 from typing import Optional
+from typing import Union
+from urllib.parse import SplitResult
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
 
 import requests
 import yt_dlp
 from fastapi import HTTPException
 from fastapi import status
+from requests.adapters import HTTPAdapter
+from sqlalchemy import String
+from sqlalchemy import literal_column
 from sqlalchemy.orm import Session
+from urllib3.util.retry import Retry
 
 from app.core.config import settings
 from app.models.media import FileStatus
 from app.models.media import MediaFile
 from app.models.user import User
 from app.services.minio_service import upload_file
-from app.services.protected_media_providers import PROTECTED_MEDIA_PROVIDERS
 from app.services.protected_media_providers import ProtectedMediaProvider
+from app.services.protected_media_providers import find_provider
 from app.utils.thumbnail import generate_and_upload_thumbnail_sync
 
 logger = logging.getLogger(__name__)
 
+# PyAV ships with faster-whisper but is not a direct dependency
+try:
+    import av  # type: ignore[import-untyped]
+except ImportError:
+    av = None
+
 # Authentication and access error patterns with user-friendly messages
 AUTH_ERROR_PATTERNS = {
     "logged-in": "requires a logged-in account",
@@ -71,6 +101,46 @@ PLATFORM_GUIDANCE = {
 RECOMMENDED_PLATFORMS = ["YouTube", "Dailymotion", "Twitter/X"]
 
 
+# Platform names looked for in error messages, in priority order
+_ERROR_PLATFORMS = (
+    "vimeo",
+    "instagram",
+    "facebook",
+    "twitter",
+    "x.com",
+    "tiktok",
+    "linkedin",
+    "patreon",
+    "twitch",
+    "youtube",
+)
+
+
+def _compile_keyword_matcher(keywords: Iterable[str]) -> re.Pattern:
+    """Compile keywords into one regex reporting every (possibly overlapping) hit.
+
+    The zero-width lookahead lets a single scan of the text find all keywords,
+    instead of one substring search per keyword.
+    """
+    return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+
+
+def _first_keyword_match(matcher: re.Pattern, priority: dict[str, int], text: str) -> Optional[str]:
+    """Return the highest-priority keyword found in text, or None."""
+    found = {match.group(1) for match in matcher.finditer(text)}
+    return min(found, key=priority.__getitem__, default=None)
+
+
+_AUTH_ERROR_MATCHER = _compile_keyword_matcher(AUTH_ERROR_PATTERNS)
+_AUTH_ERROR_PRIORITY = {pattern: idx for idx, pattern in enumerate(AUTH_ERROR_PATTERNS)}
+_PLATFORM_MATCHER = _compile_keyword_matcher(_ERROR_PLATFORMS)
+_PLATFORM_PRIORITY = {platform: idx for idx, platform in enumerate(_ERROR_PLATFORMS)}
+
+
+# Leading yt-dlp prefixes stripped from non-auth error messages (chained ones too)
+_YTDLP_ERROR_PREFIXES = re.compile(r"^(?:ERROR: |DownloadError: |\[download\] |\[generic\] )+")
+
+
 def _detect_auth_error(error_message: str) -> tuple[bool, str]:
     """
     Detect if an error message indicates an authentication-related issue.
@@ -81,11 +151,10 @@ def _detect_auth_error(error_message: str) -> tuple[bool, str]:
     Returns:
         Tuple of (is_auth_error, matched_reason)
     """
-    error_lower = error_message.lower()
-    for pattern, reason in AUTH_ERROR_PATTERNS.items():
-        if pattern in error_lower:
-            return True, reason
-    return False, ""
+    pattern = _first_keyword_match(_AUTH_ERROR_MATCHER, _AUTH_ERROR_PRIORITY, error_message.lower())
+    if pattern is None:
+        return False, ""
+    return True, AUTH_ERROR_PATTERNS[pattern]
 
 
 def _get_platform_from_error(error_message: str) -> str:
@@ -98,26 +167,12 @@ def _get_platform_from_error(error_message: str) -> str:
     Returns:
         Platform name or empty string
     """
-    error_lower = error_message.lower()
-
     # Check for known platform names in the error
-    platforms = [
-        "vimeo",
-        "instagram",
-        "facebook",
-        "twitter",
-        "x.com",
-        "tiktok",
-        "linkedin",
-        "patreon",
-        "twitch",
-        "youtube",
-    ]
-    for platform in platforms:
-        if platform in error_lower:
-            # Normalize x.com to twitter
-            return "twitter" if platform == "x.com" else platform
-    return ""
+    platform = _first_keyword_match(_PLATFORM_MATCHER, _PLATFORM_PRIORITY, error_message.lower())
+    if platform is None:
+        return ""
+    # Normalize x.com to twitter
+    return "twitter" if platform == "x.com" else platform
 
 
 def create_user_friendly_error(error_message: str, url: str = "") -> str:
@@ -167,34 +222,194 @@ def create_user_friendly_error(error_message: str, url: str = "") -> str:
 
     # Not an auth error - return the original message but cleaned up
     # Remove common yt-dlp prefixes
-    cleaned = error_message
-    prefixes_to_remove = [
-        "ERROR: ",
-        "DownloadError: ",
-        "[download] ",
-        "[generic] ",
-    ]
-    for prefix in prefixes_to_remove:
-        if cleaned.startswith(prefix):
-            cleaned = cleaned[len(prefix) :]
-
-    return cleaned
-
-
-# Generic URL pattern - accepts any HTTP/HTTPS URL
-GENERIC_URL_PATTERN = re.compile(r"^https?://.+$")
-
-# YouTube URL validation regex - supports both videos and playlists
-YOUTUBE_URL_PATTERN = re.compile(
-    r"^https?://(www\.)?(youtube\.com/(watch\?v=|embed/|v/|playlist\?list=)|youtu\.be/)[\w\-_]+.*$"
+    return _YTDLP_ERROR_PREFIXES.sub("", error_message, count=1)
+
+
+# Generic URL pattern - accepts any HTTP/HTTPS URL (use with fullmatch)
+GENERIC_URL_PATTERN = re.compile(r"https?://.+")
+
+# YouTube URLs are recognised with urlsplit rather than a regex so validation
+# stays linear in the URL length for any input.
+YOUTUBE_HOSTS = frozenset({"youtube.com", "www.youtube.com", "m.youtube.com"})
+YOUTUBE_SHORT_HOSTS = frozenset({"youtu.be", "www.youtu.be"})
+_YOUTUBE_PATH_PREFIXES = ("/embed/", "/v/")
+
+
+def _starts_with_youtube_id(value: str) -> bool:
+    """Return True if value begins with a character valid in a YouTube ID."""
+    return bool(value) and (value[0].isalnum() or value[0] in "-_")
+
+
+@dataclass(frozen=True)
+class _URLInfo:
+    """A media URL split once into the parts the URL checks need."""
+
+    raw: str
+    scheme: str
+    host: str
+    path: str
+    is_youtube: bool
+    is_playlist: bool
+
+
+def _is_youtube_video(host: str, parts: SplitResult) -> bool:
+    """Return True if host/path/query identify a single YouTube video."""
+    if host in YOUTUBE_SHORT_HOSTS:
+        return _starts_with_youtube_id(parts.path[1:])
+    if host not in YOUTUBE_HOSTS:
+        return False
+    if parts.path == "/watch":
+        return _starts_with_youtube_id(parse_qs(parts.query).get("v", [""])[0])
+    if parts.path.startswith(_YOUTUBE_PATH_PREFIXES):
+        return _starts_with_youtube_id(parts.path.split("/", 2)[2])
+    return False
+
+
+@lru_cache(maxsize=256)
+def _parse_url(url: str) -> _URLInfo:
+    """Split url once; cached because the same URL is checked repeatedly.
+
+    The URL is not stripped: callers normalize user input first, and stray
+    whitespace makes the URL invalid rather than being silently corrected.
+    """
+    raw = url
+    try:
+        parts = urlsplit(raw)
+        host = parts.hostname or ""
+    except ValueError:
+        return _URLInfo(raw, "", "", "", False, False)
+
+    is_youtube = is_playlist = False
+    # Substring test skips the query parsing for non-YouTube URLs
+    if parts.scheme in ("http", "https") and ("youtube.com" in host or "youtu.be" in host):
+        is_playlist = (
+            host in YOUTUBE_HOSTS
+            and parts.path == "/playlist"
+            and _starts_with_youtube_id(parse_qs(parts.query).get("list", [""])[0])
+        )
+        is_youtube = is_playlist or _is_youtube_video(host, parts)
+    return _URLInfo(raw, parts.scheme, host, parts.path, is_youtube, is_playlist)
+
+
+def _as_url_info(url: Union[str, _URLInfo]) -> _URLInfo:
+    """Return url as a _URLInfo, parsing it if a plain string was given."""
+    return url if isinstance(url, _URLInfo) else _parse_url(url)
+
+
+def _download_retry_sleep(n: int) -> float:
+    """Exponential backoff (capped at one minute) between yt-dlp retries.
+
+    yt-dlp calls retry sleep functions as ``func(n=retry_index)``, so the
+    parameter name is part of the interface.
+    """
+    return min(2.0**n, 60.0)
+
+
+# Browser User-Agent sent by yt-dlp and by our own thumbnail requests
+_BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Shared HTTP session for thumbnail downloads; thumbnails mostly come from the
+# same few CDN hosts, so pooled keep-alive connections avoid repeated TLS handshakes.
+_THUMBNAIL_SESSION = requests.Session()
+_THUMBNAIL_SESSION.headers["User-Agent"] = _BROWSER_USER_AGENT
+_THUMBNAIL_ADAPTER = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_THUMBNAIL_SESSION.mount("https://", _THUMBNAIL_ADAPTER)
+_THUMBNAIL_SESSION.mount("http://", _THUMBNAIL_ADAPTER)
+
+
+# On-disk yt-dlp cache shared by every YoutubeDL we create, so player JS and
+# signature solutions fetched once are reused by metadata and download calls
+_YTDLP_CACHE_DIR = str(settings.TEMP_DIR / "yt-dlp-cache")
+
+
+# yt-dlp download options for highest quality with web-compatible output. Built
+# once at import; download_video() copies it and adds the per-call output paths.
+_DOWNLOAD_YDL_OPTIONS: Mapping[str, Any] = MappingProxyType(
+    {
+        # Download best H.264 quality for maximum browser compatibility
+        # Prefer H.264 video codec over AV1 to ensure playback works across all browsers
+        "format": "bestvideo[vcodec^=avc1][ext=mp4]+bestaudio[ext=m4a]/bestvideo[vcodec*=h264][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
+        "restrictfilenames": True,  # Avoid special characters in filename
+        "no_warnings": False,
+        "extractaudio": False,
+        "embed_subs": True,  # Embed subtitles if available
+        "writesubtitles": False,  # Don't write separate subtitle files
+        "writeautomaticsub": False,  # Don't write auto-generated subs
+        "ignoreerrors": False,
+        "no_playlist": True,  # Only download single video
+        "max_filesize": 15 * 1024 * 1024 * 1024,  # 15GB limit (matches upload limit)
+        # Ensure web-compatible MP4 output
+        "merge_output_format": "mp4",
+        # Use configured temp directory for yt-dlp cache and temporary files
+        "cachedir": _YTDLP_CACHE_DIR,
+        # Anti-blocking measures for YouTube
+        "extractor_args": {
+            "youtube": {
+                "player_client": [
+                    "android",
+                    "web",
+                ],  # Try Android client first, fallback to web
+                "player_skip": ["webpage", "configs"],  # Skip unnecessary requests
+            }
+        },
+        "http_headers": {
+            "User-Agent": _BROWSER_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-us,en;q=0.5",
+            "Sec-Fetch-Mode": "navigate",
+        },
+        "postprocessors": [
+            {
+                "key": "FFmpegVideoConvertor",
+                "preferedformat": "mp4",
+            }
+        ],
+        # Back off exponentially on HTTP errors such as 429 Too Many Requests
+        "retries": 5,
+        "fragment_retries": 5,
+        "retry_sleep_functions": {
+            "http": _download_retry_sleep,
+            "fragment": _download_retry_sleep,
+        },
+    }
 )
 
-# YouTube playlist URL validation regex
-YOUTUBE_PLAYLIST_PATTERN = re.compile(
-    r"^https?://(www\.)?youtube\.com/playlist\?list=([\w\-_]+).*$"
+# Options that change what extract_info() returns. Info extracted elsewhere and
+# passed to download_video() must come from an instance sharing these, or its
+# format list was built by a different player client than the download uses.
+_EXTRACTION_OPTION_KEYS = ("cachedir", "extractor_args", "http_headers")
+
+
+# Characters kept when deriving the expected download filename from a title
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\-_\.]")
+_SAFE_ASCII_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "-_.")
+_ASCII_FILENAME_TRANSLATION = str.maketrans(
+    {chr(code): "_" for code in range(128) if chr(code) not in _SAFE_ASCII_FILENAME_CHARS}
 )
 
 
+def _clean_download_title(title: str) -> str:
+    """Replace filename-unsafe characters in title with "_" and cap it at 100 chars.
+
+    ASCII titles (the common case) go through str.translate; other titles
+    need the Unicode-aware \\w class, so they use the regex.
+    """
+    if title.isascii():
+        return title.translate(_ASCII_FILENAME_TRANSLATION)[:100]
+    return _UNSAFE_FILENAME_CHARS.sub("_", title)[:100]
+
+
+# Extensions recognised when yt-dlp saved the download under an unexpected name
+DOWNLOADED_VIDEO_EXTENSIONS = frozenset({".mp4", ".webm", ".mkv", ".avi"})
+
+
 def _find_downloaded_file(output_path: str, clean_title: str, ext: str) -> str:
     """
     Find the downloaded file in the output directory.
@@ -211,82 +426,272 @@ def _find_downloaded_file(output_path: str, clean_title: str, ext: str) -> str:
         FileNotFoundError: If no video file is found
     """
     expected_filename = f"{clean_title}.{ext}"
-    downloaded_file = os.path.join(output_path, expected_filename)
+    fallback_file = None
+
+    # Single directory pass: prefer the expected name, otherwise remember the
+    # first video file (yt-dlp might change the name)
+    with os.scandir(output_path) as entries:
+        for entry in entries:
+            if entry.name == expected_filename:
+                return entry.path
+            if (
+                fallback_file is None
+                and os.path.splitext(entry.name)[1].lower() in DOWNLOADED_VIDEO_EXTENSIONS
+                and entry.is_file()
+            ):
+                fallback_file = entry.path
+
+    if fallback_file is not None:
+        return fallback_file
 
-    if os.path.exists(downloaded_file):
-        return downloaded_file
+    raise FileNotFoundError("Downloaded file not found")
 
-    # Look for any video file in the directory (yt-dlp might change the name)
-    for file in os.listdir(output_path):
-        if file.endswith((".mp4", ".webm", ".mkv", ".avi")):
-            return os.path.join(output_path, file)
 
-    raise FileNotFoundError("Downloaded file not found")
+# Longest video accepted for download, in seconds (4 hours)
+MAX_VIDEO_DURATION_SECONDS = 14400
 
 
-def _resolve_thumbnail_url(media_info: dict[str, Any]) -> Optional[str]:
+def _ydl_download(
+    ydl: yt_dlp.YoutubeDL, url: str, info: Optional[dict[str, Any]] = None
+) -> dict[str, Any]:
     """
-    Resolve the best thumbnail URL from media metadata.
+    Download url with ydl and return the processed info dict.
+
+    When info from an earlier extract_info() call is given it is processed
+    directly, skipping a second page/player-config fetch. Otherwise the URL
+    is extracted unprocessed, and url results are resolved before the
+    duration limit is checked. If processing given info fails (for
+    example because format URLs expired), the URL is extracted again, the
+    same recovery yt-dlp uses for --load-info-json.
+    """
+    if info is not None:
+        ie_result = ydl.sanitize_info(dict(info), remove_private_keys=True)
+    else:
+        # Extract info once without format processing; the same result is
+        # then processed and downloaded, so metadata is not fetched twice
+        ie_result = ydl.extract_info(url, download=False, process=False)
+        if ie_result.get("_type") in ("url", "url_transparent"):
+            # Results pointing at another URL usually carry no duration; resolve
+            # them without downloading so the limit below sees the real media
+            ie_result = ydl.sanitize_info(
+                ydl.process_ie_result(ie_result, download=False), remove_private_keys=True
+            )
 
-    Args:
-        media_info: Media metadata from yt-dlp
+    # Check duration (optional limit)
+    duration = ie_result.get("duration")
+    if duration and duration > MAX_VIDEO_DURATION_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Video is too long. Maximum duration is 4 hours.",
+        )
 
-    Returns:
-        Best available thumbnail URL or None
+    if info is None:
+        return ydl.process_ie_result(ie_result, download=True)
+
+    try:
+        return ydl.process_ie_result(ie_result, download=True)
+    except yt_dlp.DownloadError as e:
+        logger.warning(f"Download from extracted info failed for {url}, re-extracting: {e}")
+        return _ydl_download(ydl, url)
+
+
+# Caps concurrent ffprobe/ffmpeg subprocesses started from this process so that
+# parallel downloads cannot oversubscribe the CPU
+_CPU_COUNT = os.cpu_count() or 1
+_FFMPEG_SEMAPHORE = threading.BoundedSemaphore(
+    min(settings.MAX_FFPROBE_PARALLELISM, _CPU_COUNT)
+    if settings.MAX_FFPROBE_PARALLELISM > 0
+    else _CPU_COUNT
+)
+
+# ffprobe arguments limiting the probe to the container headers and first packet
+_SHALLOW_PROBE_ARGS = (
+    "-read_intervals",
+    "%+#1",
+    "-probesize",
+    "1000000",
+    "-analyzeduration",
+    "1000000",
+)
+
+# ffprobe is located once; a probe that runs longer than the timeout is
+# treated as a failure so a corrupt file cannot stall a download worker
+_FFPROBE_PATH = shutil.which("ffprobe") or "ffprobe"
+FFPROBE_TIMEOUT_SECONDS = 30
+
+
+def _run_ffprobe(path: str, *extra_args: str) -> dict[str, Any]:
+    """
+    Run ffprobe on a file and return its parsed JSON (format and streams).
+
+    Raises:
+        subprocess.SubprocessError: If ffprobe fails or times out
+        OSError: If ffprobe cannot be started
+        ValueError: If ffprobe prints invalid JSON
+    """
+    result = subprocess.run(  # noqa: S603
+        [
+            _FFPROBE_PATH,
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            *extra_args,
+            path,
+        ],
+        capture_output=True,
+        timeout=FFPROBE_TIMEOUT_SECONDS,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def _probe_is_complete(probe: dict[str, Any]) -> bool:
+    """Check whether a probe found the duration and at least one stream codec."""
+    return bool(probe.get("format", {}).get("duration")) and any(
+        stream.get("codec_name") for stream in probe.get("streams", [])
+    )
+
+
+class _HashingReader:
+    """Binary reader that feeds everything read through it into a SHA-256 digest.
+
+    Lets the file hash be computed while MinIO reads the upload, instead of
+    reading the whole file a second time.
+    """
+
+    def __init__(self, fileobj: BinaryIO) -> None:
+        self._fileobj = fileobj
+        self._sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._fileobj.read(size)
+        self._sha256.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+@lru_cache(maxsize=128)
+def _cached_probe(path: str, size: int, mtime: float) -> dict[str, Any]:
     """
-    thumbnails = media_info.get("thumbnails", [])
+    Run ffprobe on a file, memoised on its path, size and modification time.
 
-    # Fallback to single thumbnail URL if no thumbnails list
-    if not thumbnails:
-        return media_info.get("thumbnail")
+    A shallow probe that only reads the start of the file is tried first; the
+    full probe runs only when that misses the duration or codecs. The size and
+    mtime only form part of the cache key so that a file rewritten in place is
+    probed again. Callers must not mutate the result.
+    """
+    with _FFMPEG_SEMAPHORE:
+        try:
+            probe = _run_ffprobe(path, *_SHALLOW_PROBE_ARGS)
+            if _probe_is_complete(probe):
+                return probe
+        except (subprocess.SubprocessError, ValueError) as e:
+            logger.debug(f"Shallow ffprobe failed for {path}, running full probe: {e}")
 
-    # Find the highest quality thumbnail
-    max_width = 0
-    thumbnail_url = None
-    for thumb in thumbnails:
-        width = thumb.get("width", 0)
-        if width > max_width and thumb.get("url"):
-            max_width = width
-            thumbnail_url = thumb["url"]
+        return _run_ffprobe(path)
 
-    if thumbnail_url:
-        return thumbnail_url
 
-    # Fallback to standard YouTube thumbnail URLs if it's a YouTube video
-    return _get_fallback_thumbnail_url(media_info.get("id"), media_info.get("extractor", ""))
+def _probe_media_file(file_path: str) -> dict[str, Any]:
+    """Return ffprobe output for a file, reusing an earlier probe when unchanged."""
+    st = os.stat(file_path)
+    return _cached_probe(file_path, st.st_size, st.st_mtime)
 
 
-def _get_fallback_thumbnail_url(video_id: Optional[str], extractor: str) -> Optional[str]:
+def _probe_with_pyav(file_path: str) -> Optional[dict[str, Any]]:
     """
-    Try standard thumbnail URLs as fallback for known platforms.
+    Read basic stream metadata in-process with PyAV instead of spawning ffprobe.
+
+    PyAV is installed alongside faster-whisper, but it is not a direct
+    dependency, so this returns None when it is missing or cannot parse the
+    container and the caller falls back to ffprobe.
 
     Args:
-        video_id: Video ID
-        extractor: Platform extractor name
+        file_path: Path to the media file
 
     Returns:
-        Working thumbnail URL or None
+        Dictionary with basic metadata, or None if PyAV could not read it
     """
-    if not video_id:
+    if av is None:
         return None
 
-    # YouTube-specific fallback URLs
-    if "youtube" in extractor.lower():
-        potential_urls = [
-            f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg",
-            f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
-            f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
-        ]
+    try:
+        with av.open(file_path) as container:
+            video_stream = next(iter(container.streams.video), None)
+            audio_stream = next(iter(container.streams.audio), None)
 
-        for test_url in potential_urls:
-            try:
-                response = requests.head(test_url, timeout=10)
-                if response.status_code == 200:
-                    return test_url
-            except requests.exceptions.RequestException as e:
-                logger.debug(f"Thumbnail URL test failed for {test_url}: {e}")
+            metadata: dict[str, Any] = {
+                "content_type": "video/mp4",  # Default
+                "format": container.format.name,
+                "duration": container.duration / av.time_base if container.duration else 0.0,
+            }
+
+            if video_stream:
+                video_context = video_stream.codec_context
+                metadata.update(
+                    {
+                        "video_codec": video_context.name,
+                        "width": video_context.width,
+                        "height": video_context.height,
+                        "frame_rate": float(video_stream.average_rate)
+                        if video_stream.average_rate
+                        else None,
+                    }
+                )
+
+            if audio_stream:
+                audio_context = audio_stream.codec_context
+                metadata.update(
+                    {
+                        "audio_channels": audio_context.channels,
+                        "audio_sample_rate": audio_context.sample_rate,
+                    }
+                )
+
+            return metadata
+    except av.error.FFmpegError as e:
+        logger.debug(f"PyAV could not read {file_path}, falling back to ffprobe: {e}")
+        return None
 
-    return None
+
+def _thumbnail_rank(thumb: dict[str, Any]) -> tuple[int, int, int]:
+    """Sort key for yt-dlp thumbnails, matching yt-dlp's own ordering (higher is better)."""
+    return tuple(
+        thumb[key] if thumb.get(key) is not None else -1
+        for key in ("preference", "width", "height")
+    )
+
+
+def _resolve_thumbnail_url(media_info: dict[str, Any]) -> Optional[str]:
+    """
+    Resolve the best thumbnail URL from media metadata.
+
+    Picks from the thumbnails yt-dlp already resolved instead of probing
+    candidate URLs over the network; when there is none, the caller
+    generates a thumbnail from the downloaded video.
+
+    Args:
+        media_info: Media metadata from yt-dlp
+
+    Returns:
+        Best available thumbnail URL or None
+    """
+    thumbnails = media_info.get("thumbnails") or []
+
+    best = max(
+        (thumb for thumb in thumbnails if thumb.get("url")),
+        key=_thumbnail_rank,
+        default=None,
+    )
+    if best:
+        return best["url"]
+
+    # Fallback to single thumbnail URL if no usable thumbnails list
+    return media_info.get("thumbnail")
 
 
 def _get_thumbnail_with_fallback(
@@ -320,46 +725,80 @@ def _get_thumbnail_with_fallback(
 
     # Fallback to generating thumbnail from video
     try:
-        return generate_and_upload_thumbnail_sync(
-            user_id=user_id,
-            media_file_id=media_file_id,
-            video_path=video_path,
-            timestamp=5.0,
-        )
+        with _FFMPEG_SEMAPHORE:
+            return generate_and_upload_thumbnail_sync(
+                user_id=user_id,
+                media_file_id=media_file_id,
+                video_path=video_path,
+                timestamp=5.0,
+            )
     except Exception as fallback_error:
         logger.error(f"Fallback thumbnail generation also failed: {fallback_error}")
         return None
 
 
-def _check_existing_youtube_video(db: Session, user_id: int, video_id: str) -> Optional[MediaFile]:
+# Rendered verbatim (not with a bound key) so PostgreSQL can match it against
+# the idx_media_file_user_youtube_id expression index.
+_youtube_id_expr = MediaFile.metadata_raw.op("->>", return_type=String)(
+    literal_column("'youtube_id'")
+)
+
+
+def _get_existing_youtube_ids(db: Session, user_id: int) -> dict[str, int]:
     """
-    Check if a YouTube video already exists in the user's library.
+    Load every YouTube ID already in the user's library with one query.
 
     Args:
         db: Database session
         user_id: User ID
-        video_id: YouTube video ID
 
     Returns:
-        Existing MediaFile if found, None otherwise
+        Mapping of YouTube video ID to the existing MediaFile ID
     """
-    from sqlalchemy import text
+    rows = (
+        db.query(MediaFile.id, _youtube_id_expr)
+        .filter(MediaFile.user_id == user_id, _youtube_id_expr.isnot(None))
+        .all()
+    )
+    return {yid: file_id for file_id, yid in rows}
 
-    return (
-        db.query(MediaFile)
-        .filter(
-            MediaFile.user_id == user_id,
-            text("metadata_raw->>'youtube_id' = :youtube_id"),
-        )
-        .params(youtube_id=video_id)
-        .first()
+
+# Placeholders are flushed in batches of this size while the playlist is enumerated
+PLAYLIST_FLUSH_BATCH_SIZE = 20
+
+
+def _report_playlist_progress(
+    progress_callback: Callable[[int, str, dict], None],
+    idx: int,
+    video_count: int,
+    video_title: str,
+) -> None:
+    """Report per-video progress (the expected count may be unknown for lazy playlists)."""
+    total = max(video_count, idx + 1)
+    progress = int(20 + (idx / total) * 70)
+    progress_callback(
+        progress,
+        f"Processing video {idx + 1} of {total}: {video_title[:50]}...",
+        {"current_video": idx + 1, "total_videos": total, "video_title": video_title},
     )
 
 
+def _flush_playlist_placeholders(db: Session, media_files: list[MediaFile]) -> None:
+    """Insert a batch of placeholder MediaFiles with a single flush."""
+    if not media_files:
+        return
+    db.add_all(media_files)
+    db.flush()
+    for media_file in media_files:
+        logger.info(
+            f"Created placeholder MediaFile {media_file.id} for playlist video: {media_file.title}"
+        )
+
+
 def _process_playlist_videos(
     db: Session,
     user_id: int,
-    videos: list[dict[str, Any]],
+    videos: Iterable[dict[str, Any]],
     playlist_info: dict[str, Any],
     playlist_url: str,
     video_count: int,
@@ -368,90 +807,108 @@ def _process_playlist_videos(
     """
     Process playlist videos and create placeholders.
 
+    The user's existing YouTube IDs are loaded once up front. Videos may be a
+    lazy iterator; entries are consumed in batches of PLAYLIST_FLUSH_BATCH_SIZE
+    and each batch is inserted with one flush, so placeholder creation starts
+    before the whole playlist has been enumerated.
+
     Args:
         db: Database session
         user_id: User ID
-        videos: List of video entries from playlist
+        videos: Video entries from playlist (list or iterator)
         playlist_info: Playlist metadata
         playlist_url: Original playlist URL
-        video_count: Total video count for progress
+        video_count: Expected video count for progress (0 if unknown)
         progress_callback: Optional progress callback
 
     Returns:
         Tuple of (created_media_files, skipped_videos)
     """
-    created_media_files = []
-    skipped_videos = []
+    created_media_files: list[MediaFile] = []
+    skipped_videos: list[dict[str, Any]] = []
+    # Videos listed more than once in the playlist point at the first placeholder
+    seen: dict[str, MediaFile] = {}
+    seen_duplicates: list[tuple[dict[str, Any], MediaFile]] = []
 
-    for idx, video_entry in enumerate(videos):
-        video_id = video_entry.get("video_id")
-        video_title = video_entry.get("title", "Unknown")
+    # Duplicate checks are in-memory lookups against the user's preloaded IDs
+    existing_ids = _get_existing_youtube_ids(db, user_id)
 
-        # Report progress
-        if progress_callback:
-            progress = int(20 + (idx / video_count) * 70)
-            progress_callback(
-                progress,
-                f"Processing video {idx + 1} of {video_count}: {video_title[:50]}...",
-                {"current_video": idx + 1, "total_videos": video_count, "video_title": video_title},
-            )
+    entries = enumerate(videos)
+    while batch := list(islice(entries, PLAYLIST_FLUSH_BATCH_SIZE)):
+        batch_files = []
+
+        for idx, video_entry in batch:
+            video_id = video_entry.get("video_id")
+            video_title = video_entry.get("title", "Unknown")
 
-        # Check for existing video
-        existing_video = _check_existing_youtube_video(db, user_id, video_id)
-        if existing_video:
-            logger.info(f"Video already exists in library: {video_title} (YouTube ID: {video_id})")
-            skipped_videos.append(
-                {
+            if progress_callback:
+                _report_playlist_progress(progress_callback, idx, video_count, video_title)
+
+            # Check for existing video
+            if video_id in existing_ids or video_id in seen:
+                logger.info(
+                    f"Video already exists in library: {video_title} (YouTube ID: {video_id})"
+                )
+                skipped = {
                     "video_id": video_id,
                     "title": video_title,
                     "reason": "duplicate",
-                    "existing_file_id": existing_video.id,
+                    "existing_file_id": existing_ids.get(video_id),
                 }
-            )
-            continue
+                skipped_videos.append(skipped)
+                if video_id in seen:
+                    seen_duplicates.append((skipped, seen[video_id]))
+                continue
 
-        # Create placeholder
-        try:
-            video_entry["playlist_index"] = video_entry.get("playlist_index", idx + 1)
-            media_file = _create_playlist_video_placeholder(
-                db, user_id, video_entry, playlist_info, playlist_url
-            )
-            created_media_files.append(media_file)
-            logger.info(
-                f"Created placeholder MediaFile {media_file.id} for playlist video: {video_title}"
-            )
-        except Exception as e:
-            logger.error(f"Error creating placeholder for video {video_title}: {e}")
-            skipped_videos.append(
-                {
-                    "video_id": video_id,
-                    "title": video_title,
-                    "reason": f"error: {str(e)}",
-                }
-            )
+            # Build placeholder
+            try:
+                video_entry["playlist_index"] = video_entry.get("playlist_index", idx + 1)
+                media_file = _build_playlist_video_placeholder(
+                    user_id, video_entry, playlist_info, playlist_url
+                )
+            except Exception as e:
+                logger.error(f"Error creating placeholder for video {video_title}: {e}")
+                skipped_videos.append(
+                    {
+                        "video_id": video_id,
+                        "title": video_title,
+                        "reason": f"error: {str(e)}",
+                    }
+                )
+                continue
+
+            batch_files.append(media_file)
+            if video_id:
+                seen[video_id] = media_file
+
+        _flush_playlist_placeholders(db, batch_files)
+        created_media_files.extend(batch_files)
+
+    for skipped, media_file in seen_duplicates:
+        skipped["existing_file_id"] = media_file.id
 
     return created_media_files, skipped_videos
 
 
-def _create_playlist_video_placeholder(
-    db: Session,
+def _build_playlist_video_placeholder(
     user_id: int,
     video_entry: dict[str, Any],
     playlist_info: dict[str, Any],
     playlist_url: str,
 ) -> MediaFile:
     """
-    Create a placeholder MediaFile for a playlist video.
+    Build a placeholder MediaFile for a playlist video.
+
+    The record is not added to the session; callers insert placeholders in bulk.
 
     Args:
-        db: Database session
         user_id: User ID
         video_entry: Video entry from playlist
         playlist_info: Playlist metadata
         playlist_url: Original playlist URL
 
     Returns:
-        Created MediaFile
+        Unsaved MediaFile
     """
     video_id = video_entry.get("video_id")
     video_url = video_entry.get("url")
@@ -470,7 +927,7 @@ def _create_playlist_video_placeholder(
         "playlist_index": playlist_index,
     }
 
-    media_file = MediaFile(
+    return MediaFile(
         user_id=user_id,
         filename=video_title[:255],
         storage_path="",
@@ -485,11 +942,6 @@ def _create_playlist_video_placeholder(
         metadata_important=placeholder_metadata,
     )
 
-    db.add(media_file)
-    db.flush()
-
-    return media_file
-
 
 def _update_media_file_with_download_data(
     media_file: MediaFile,
@@ -501,6 +953,7 @@ def _update_media_file_with_download_data(
     thumbnail_path: Optional[str],
     original_filename: str,
     source_url: str,
+    file_hash: Optional[str] = None,
 ) -> None:
     """
     Update MediaFile record with downloaded media and technical metadata.
@@ -515,10 +968,13 @@ def _update_media_file_with_download_data(
         thumbnail_path: Path to thumbnail
         original_filename: Original filename
         source_url: Original media URL
+        file_hash: SHA-256 hex digest of the downloaded file, if computed
     """
     media_file.filename = media_info.get("title", original_filename)[:255]
     media_file.storage_path = storage_path
     media_file.file_size = file_size
+    if file_hash:
+        media_file.file_hash = file_hash
     media_file.content_type = technical_metadata.get("content_type", "video/mp4")
     media_file.duration = technical_metadata.get("duration") or media_info.get("duration")
     media_file.status = FileStatus.PENDING
@@ -542,6 +998,146 @@ def _update_media_file_with_download_data(
     media_file.audio_sample_rate = technical_metadata.get("audio_sample_rate")
 
 
+# yt-dlp instances used for metadata-only extraction. Idle instances are kept
+# for the process lifetime so their HTTP connection pools (TLS sessions, DNS)
+# are reused across calls. YoutubeDL is not thread-safe, so each call checks
+# one out; when all are busy a new one is created rather than waiting.
+_YDL_OPTIONS: dict[str, dict[str, Any]] = {
+    "metadata": {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": False,
+        # Its info is reused by download_video()
+        **{key: _DOWNLOAD_YDL_OPTIONS[key] for key in _EXTRACTION_OPTION_KEYS},
+    },
+    "playlist": {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",  # Extract video info without downloading
+        "skip_download": True,
+        "cachedir": _YTDLP_CACHE_DIR,
+    },
+}
+# Maximum number of idle instances kept per kind
+YDL_POOL_SIZE = 4
+_YDL_POOL_LOCK = threading.Lock()
+_idle_ydl: dict[str, list[yt_dlp.YoutubeDL]] = {kind: [] for kind in _YDL_OPTIONS}
+
+
+@contextmanager
+def _pooled_youtube_dl(kind: str) -> Iterator[yt_dlp.YoutubeDL]:
+    """Yield an idle YoutubeDL instance for ``kind``, or a new one if none is idle."""
+    with _YDL_POOL_LOCK:
+        idle = _idle_ydl[kind]
+        ydl = idle.pop() if idle else None
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(_YDL_OPTIONS[kind])
+    try:
+        yield ydl
+    finally:
+        # Cookies set by one extraction must not be sent on another user's request
+        ydl.cookiejar.clear()
+        with _YDL_POOL_LOCK:
+            if len(idle) < YDL_POOL_SIZE:
+                idle.append(ydl)
+                ydl = None
+        if ydl is not None:
+            ydl.close()
+
+
+def close_cached_youtube_dl() -> None:
+    """Close the idle metadata YoutubeDL instances (call on shutdown)."""
+    with _YDL_POOL_LOCK:
+        instances = [ydl for idle in _idle_ydl.values() for ydl in idle]
+        for idle in _idle_ydl.values():
+            idle.clear()
+    for ydl in instances:
+        ydl.close()
+
+
+def _playlist_video_entry(entry: Optional[dict[str, Any]], idx: int) -> Optional[dict[str, Any]]:
+    """Convert a flat yt-dlp playlist entry into a video entry (None if unusable)."""
+    if not entry or not entry.get("id"):
+        return None
+    video_id = entry["id"]
+    return {
+        "video_id": video_id,
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "title": entry.get("title", "Unknown"),
+        "duration": entry.get("duration"),
+        "uploader": entry.get("uploader"),
+        "playlist_index": idx + 1,
+    }
+
+
+# Limit on url results followed when a playlist URL redirects elsewhere
+MAX_PLAYLIST_URL_RESOLUTIONS = 3
+
+
+def _resolve_playlist_result(
+    ydl: yt_dlp.YoutubeDL, info: Optional[dict[str, Any]]
+) -> Optional[dict[str, Any]]:
+    """Follow url results returned by an unprocessed extract_info() to the playlist."""
+    for _ in range(MAX_PLAYLIST_URL_RESOLUTIONS):
+        if not info or info.get("_type") not in ("url", "url_transparent"):
+            return info
+        info = ydl.extract_info(
+            info["url"], ie_key=info.get("ie_key"), download=False, process=False
+        )
+    if info and info.get("_type") in ("url", "url_transparent"):
+        raise ValueError("Playlist URL redirects too many times")
+    return info
+
+
+def _iter_lazy_playlist_videos(
+    ydl: yt_dlp.YoutubeDL, entries: Iterable[Optional[dict[str, Any]]], url: str
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield video entries while yt-dlp pages through the playlist.
+
+    Owns ydl and closes it once iteration ends. Extraction errors raised while
+    paging are reported as HTTPException, like those from extract_playlist_info().
+    """
+    try:
+        for idx, entry in enumerate(entries):
+            video = _playlist_video_entry(entry, idx)
+            if video is not None:
+                yield video
+    except Exception as e:
+        logger.error(f"Error listing playlist videos from {url}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to list playlist videos: {str(e)}",
+        ) from e
+    finally:
+        ydl.close()
+
+
+def _find_protected_provider(url: str) -> Optional[ProtectedMediaProvider]:
+    """Return the protected media provider that can handle url, if any.
+
+    find_provider() caches per URL; the cache is dropped by
+    refresh_protected_media_auth_config().
+    """
+    return find_provider(url)
+
+
+# Generic metadata keys mirrored under youtube_* names for backward compatibility
+_YOUTUBE_METADATA_ALIASES = (
+    ("video_id", "youtube_id"),
+    ("title", "youtube_title"),
+    ("description", "youtube_description"),
+    ("uploader", "youtube_uploader"),
+    ("upload_date", "youtube_upload_date"),
+    ("duration", "youtube_duration"),
+    ("view_count", "youtube_view_count"),
+    ("like_count", "youtube_like_count"),
+    ("thumbnail", "youtube_thumbnail"),
+    ("tags", "youtube_tags"),
+    ("categories", "youtube_categories"),
+)
+
+
 class MediaDownloadService:
     """Service for processing media from various platforms.
 
@@ -555,52 +1151,47 @@ class MediaDownloadService:
 
     def _get_protected_provider(self, url: str) -> Optional[ProtectedMediaProvider]:
         """Return a protected media provider that can handle this URL, if any."""
-        for provider in PROTECTED_MEDIA_PROVIDERS:
-            try:
-                if provider.can_handle(url):
-                    return provider
-            except Exception as e:
-                logger.warning(
-                    f"Protected media provider {provider.__class__.__name__} "
-                    f"failed in can_handle for {url}: {e}"
-                )
-        return None
+        return _find_protected_provider(url)
 
-    def is_valid_media_url(self, url: str) -> bool:
+    def is_valid_media_url(self, url: Union[str, _URLInfo]) -> bool:
         """
         Validate if URL is a valid media URL (any HTTP/HTTPS URL).
 
         Args:
-            url: URL to validate
+            url: URL to validate (raw string or pre-parsed _URLInfo)
 
         Returns:
             True if valid media URL, False otherwise
         """
-        return bool(GENERIC_URL_PATTERN.match(url.strip()))
+        info = _as_url_info(url)
+        # Cheap scheme check rejects most non-URLs before the regex runs
+        return (
+            info.scheme in ("http", "https") and GENERIC_URL_PATTERN.fullmatch(info.raw) is not None
+        )
 
-    def is_youtube_url(self, url: str) -> bool:
+    def is_youtube_url(self, url: Union[str, _URLInfo]) -> bool:
         """
         Check if URL is a YouTube URL (for backward compatibility and special handling).
 
         Args:
-            url: URL to check
+            url: URL to check (raw string or pre-parsed _URLInfo)
 
         Returns:
             True if YouTube URL, False otherwise
         """
-        return bool(YOUTUBE_URL_PATTERN.match(url.strip()))
+        return _as_url_info(url).is_youtube
 
-    def is_playlist_url(self, url: str) -> bool:
+    def is_playlist_url(self, url: Union[str, _URLInfo]) -> bool:
         """
         Check if URL is a YouTube playlist URL.
 
         Args:
-            url: URL to validate
+            url: URL to validate (raw string or pre-parsed _URLInfo)
 
         Returns:
             True if URL is a playlist, False if it's a single video
         """
-        return bool(YOUTUBE_PLAYLIST_PATTERN.match(url.strip()))
+        return _as_url_info(url).is_playlist
 
     def extract_video_info(
         self,
@@ -628,20 +1219,11 @@ class MediaDownloadService:
         # Try protected media providers first (authenticated corporate sites, etc.)
         provider = self._get_protected_provider(url)
         if provider is not None:
-            return provider.extract_info(
-                url, username=media_username, password=media_password
-            )
-
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": False,
-        }
+            return provider.extract_info(url, username=media_username, password=media_password)
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                return info
+            with _pooled_youtube_dl("metadata") as ydl:
+                return ydl.extract_info(url, download=False)
         except yt_dlp.DownloadError as e:
             error_msg = str(e)
             logger.error(f"Error extracting video info from {url}: {error_msg}")
@@ -659,12 +1241,16 @@ class MediaDownloadService:
                 detail=f"Failed to extract video information: {user_friendly_error}",
             ) from e
 
-    def extract_playlist_info(self, url: str) -> dict[str, Any]:
+    def extract_playlist_info(self, url: str, lazy: bool = False) -> dict[str, Any]:
         """
         Extract playlist metadata and video list without downloading.
 
         Args:
             url: YouTube playlist URL
+            lazy: If True, "videos" is an iterator that pages through the playlist
+                as it is consumed, and "video_count" is the count reported by the
+                site (None if unknown). Callers can start working on the first
+                entries before the whole playlist has been enumerated.
 
         Returns:
             Dictionary with playlist information including:
@@ -672,52 +1258,36 @@ class MediaDownloadService:
             - playlist_title: Playlist title
             - playlist_uploader: Playlist creator
             - video_count: Number of videos
-            - videos: List of video entries with URLs and basic info
+            - videos: List (or iterator, if lazy) of video entries with URLs and basic info
 
         Raises:
             HTTPException: If unable to extract playlist information
         """
-        ydl_opts = {
-            "quiet": True,
-            "no_warnings": True,
-            "extract_flat": "in_playlist",  # Extract video info without downloading
-            "skip_download": True,
-        }
-
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            if lazy:
+                info, videos = self._extract_lazy_playlist(url)
+            else:
+                with _pooled_youtube_dl("playlist") as ydl:
+                    info = ydl.extract_info(url, download=False)
 
                 if not info:
                     raise ValueError("No playlist information found")
 
-                # Extract video entries
-                entries = info.get("entries", [])
-                videos = []
-
-                for idx, entry in enumerate(entries):
-                    if entry:  # Some entries might be None (unavailable videos)
-                        video_id = entry.get("id")
-                        if video_id:
-                            videos.append(
-                                {
-                                    "video_id": video_id,
-                                    "url": f"https://www.youtube.com/watch?v={video_id}",
-                                    "title": entry.get("title", "Unknown"),
-                                    "duration": entry.get("duration"),
-                                    "uploader": entry.get("uploader"),
-                                    "playlist_index": idx + 1,
-                                }
-                            )
-
-                return {
-                    "playlist_id": info.get("id"),
-                    "playlist_title": info.get("title", "Unknown Playlist"),
-                    "playlist_uploader": info.get("uploader") or info.get("channel"),
-                    "playlist_description": info.get("description"),
-                    "video_count": len(videos),
-                    "videos": videos,
-                }
+                # Extract video entries (some entries might be None for unavailable videos)
+                videos = [
+                    video
+                    for idx, entry in enumerate(info.get("entries") or [])
+                    if (video := _playlist_video_entry(entry, idx)) is not None
+                ]
+
+            return {
+                "playlist_id": info.get("id"),
+                "playlist_title": info.get("title", "Unknown Playlist"),
+                "playlist_uploader": info.get("uploader") or info.get("channel"),
+                "playlist_description": info.get("description"),
+                "video_count": info.get("playlist_count") if lazy else len(videos),
+                "videos": videos,
+            }
 
         except Exception as e:
             logger.error(f"Error extracting playlist info from {url}: {e}")
@@ -726,6 +1296,35 @@ class MediaDownloadService:
                 detail=f"Failed to extract playlist information: {str(e)}",
             ) from e
 
+    def _extract_lazy_playlist(self, url: str) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+        """
+        Extract playlist metadata, leaving the entries to be paged in on iteration.
+
+        The info is left unprocessed, so the extractor's entries generator is
+        only advanced as the returned iterator is consumed. The iterator keeps
+        using a dedicated YoutubeDL (the shared locked instance cannot be held
+        that long) and closes it when iteration ends or the iterator is
+        discarded.
+
+        Returns:
+            Tuple of (playlist info, iterator of video entries)
+        """
+        ydl = yt_dlp.YoutubeDL(_YDL_OPTIONS["playlist"])
+        try:
+            info = _resolve_playlist_result(
+                ydl, ydl.extract_info(url, download=False, process=False)
+            )
+            if not info:
+                raise ValueError("No playlist information found")
+        except BaseException:
+            ydl.close()
+            raise
+
+        videos = _iter_lazy_playlist_videos(ydl, info.get("entries") or [], url)
+        # A generator that is never started does not run its finally block
+        weakref.finalize(videos, ydl.close)
+        return info, videos
+
     def download_video(
         self,
         url: str,
@@ -733,6 +1332,7 @@ class MediaDownloadService:
         progress_callback: Optional[Callable[[int, str], None]] = None,
         media_username: Optional[str] = None,
         media_password: Optional[str] = None,
+        info: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         """
         Download video from media URL.
@@ -744,6 +1344,8 @@ class MediaDownloadService:
             url: Media URL
             output_path: Directory to save downloaded file
             progress_callback: Optional callback for progress updates
+            info: Optional info dict already returned by extract_video_info()
+                for this URL; reused so yt-dlp does not extract it again
 
         Returns:
             Dictionary with file path, filename, and video info
@@ -776,49 +1378,10 @@ class MediaDownloadService:
                     )  # Map to 20-60% range
                     progress_callback(progress_percent, "Downloading video...")
 
-        # Configure yt-dlp options for highest quality with web-compatible output
-        ydl_opts = {
-            # Download best H.264 quality for maximum browser compatibility
-            # Prefer H.264 video codec over AV1 to ensure playback works across all browsers
-            "format": "bestvideo[vcodec^=avc1][ext=mp4]+bestaudio[ext=m4a]/bestvideo[vcodec*=h264][ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
-            "outtmpl": os.path.join(output_path, "%(title)s.%(ext)s"),
-            "restrictfilenames": True,  # Avoid special characters in filename
-            "no_warnings": False,
-            "extractaudio": False,
-            "embed_subs": True,  # Embed subtitles if available
-            "writesubtitles": False,  # Don't write separate subtitle files
-            "writeautomaticsub": False,  # Don't write auto-generated subs
-            "ignoreerrors": False,
-            "no_playlist": True,  # Only download single video
-            "max_filesize": 15 * 1024 * 1024 * 1024,  # 15GB limit (matches upload limit)
-            # Ensure web-compatible MP4 output
-            "merge_output_format": "mp4",
-            # Use configured temp directory for yt-dlp cache and temporary files
-            "cachedir": str(settings.TEMP_DIR / "yt-dlp-cache"),
-            "paths": {"temp": output_path},  # Use the provided output_path for temp files
-            # Anti-blocking measures for YouTube
-            "extractor_args": {
-                "youtube": {
-                    "player_client": [
-                        "android",
-                        "web",
-                    ],  # Try Android client first, fallback to web
-                    "player_skip": ["webpage", "configs"],  # Skip unnecessary requests
-                }
-            },
-            "http_headers": {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "en-us,en;q=0.5",
-                "Sec-Fetch-Mode": "navigate",
-            },
-            "postprocessors": [
-                {
-                    "key": "FFmpegVideoConvertor",
-                    "preferedformat": "mp4",
-                }
-            ],
-        }
+        # Only the output location varies per call; everything else is static
+        ydl_opts = dict(_DOWNLOAD_YDL_OPTIONS)
+        ydl_opts["outtmpl"] = os.path.join(output_path, "%(title)s.%(ext)s")
+        ydl_opts["paths"] = {"temp": output_path}  # Use the provided output_path for temp files
 
         # Add progress hook if callback is provided
         if progress_callback:
@@ -826,24 +1389,13 @@ class MediaDownloadService:
 
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first
-                info = ydl.extract_info(url, download=False)
-
-                # Check duration (optional limit)
-                duration = info.get("duration")
-                if duration and duration > 14400:  # 4 hours limit
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Video is too long. Maximum duration is 4 hours.",
-                    )
-
                 # Download the video
-                ydl.download([url])
+                info = _ydl_download(ydl, url, info)
 
                 # Find the downloaded file
                 title = info.get("title", "video")
                 ext = info.get("ext", "mp4")
-                clean_title = re.sub(r"[^\w\-_\.]", "_", title)[:100]
+                clean_title = _clean_download_title(title)
                 downloaded_file = _find_downloaded_file(output_path, clean_title, ext)
 
                 return {
@@ -880,7 +1432,8 @@ class MediaDownloadService:
             Dictionary with technical metadata
         """
         try:
-            # Use the existing metadata extraction service
+            # Imported lazily: the transcription package pulls in the whole
+            # transcription pipeline, which the API process never needs
             from app.tasks.transcription.metadata_extractor import extract_media_metadata
             from app.tasks.transcription.metadata_extractor import get_important_metadata
 
@@ -918,18 +1471,15 @@ class MediaDownloadService:
             Frame rate as float or None if invalid
         """
         try:
-            if "/" in frame_rate_str:
-                numerator, denominator = frame_rate_str.split("/")
-                return float(numerator) / float(denominator)
-            else:
-                return float(frame_rate_str)
+            # Fraction parses both "30000/1001" and "29.97" forms
+            return float(Fraction(frame_rate_str))
         except (ValueError, ZeroDivisionError):
             logger.warning(f"Invalid frame rate format: {frame_rate_str}")
             return None
 
     def _extract_basic_metadata(self, file_path: str) -> dict[str, Any]:
         """
-        Fallback method to extract basic metadata using ffprobe.
+        Fallback method to extract basic metadata using PyAV or ffprobe.
 
         Args:
             file_path: Path to the media file
@@ -938,9 +1488,11 @@ class MediaDownloadService:
             Dictionary with basic metadata
         """
         try:
-            import ffmpeg  # type: ignore[import-untyped]
+            metadata = _probe_with_pyav(file_path)
+            if metadata is not None:
+                return metadata
 
-            probe = ffmpeg.probe(file_path)
+            probe = _probe_media_file(file_path)
             format_info = probe.get("format", {})
             video_stream = next(
                 (stream for stream in probe["streams"] if stream["codec_type"] == "video"),
@@ -1016,21 +1568,7 @@ class MediaDownloadService:
 
         # Add YouTube-specific fields for backward compatibility
         if "youtube" in source:
-            metadata.update(
-                {
-                    "youtube_id": media_info.get("id"),
-                    "youtube_title": media_info.get("title"),
-                    "youtube_description": media_info.get("description"),
-                    "youtube_uploader": media_info.get("uploader"),
-                    "youtube_upload_date": media_info.get("upload_date"),
-                    "youtube_duration": media_info.get("duration"),
-                    "youtube_view_count": media_info.get("view_count"),
-                    "youtube_like_count": media_info.get("like_count"),
-                    "youtube_thumbnail": media_info.get("thumbnail"),
-                    "youtube_tags": media_info.get("tags", []),
-                    "youtube_categories": media_info.get("categories", []),
-                }
-            )
+            metadata.update({alias: metadata[key] for key, alias in _YOUTUBE_METADATA_ALIASES})
 
         return metadata
 
@@ -1052,14 +1590,18 @@ class MediaDownloadService:
                 logger.warning("No thumbnail URL found in media metadata")
                 return None
 
-            # Download the thumbnail
-            response = requests.get(thumbnail_url, timeout=30)
-            response.raise_for_status()
-            thumbnail_data = response.content
+            # Download the thumbnail straight into one buffer
+            thumbnail_data = io.BytesIO()
+            with _THUMBNAIL_SESSION.get(thumbnail_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, thumbnail_data)
 
-            if not thumbnail_data:
+            thumbnail_size = thumbnail_data.getbuffer().nbytes
+            if not thumbnail_size:
                 logger.warning("Empty thumbnail data received")
                 return None
+            thumbnail_data.seek(0)
 
             # Generate storage path and upload
             video_id = media_info.get("id", "unknown")
@@ -1067,8 +1609,8 @@ class MediaDownloadService:
             storage_path = f"user_{user_id}/{source}_{video_id}/thumbnail.jpg"
 
             upload_file(
-                file_content=io.BytesIO(thumbnail_data),
-                file_size=len(thumbnail_data),
+                file_content=thumbnail_data,
+                file_size=thumbnail_size,
                 object_name=storage_path,
                 content_type="image/jpeg",
             )
@@ -1140,6 +1682,7 @@ class MediaDownloadService:
                 progress_callback=progress_callback,
                 media_username=media_username,
                 media_password=media_password,
+                info=video_info,
             )
 
             if progress_callback:
@@ -1164,16 +1707,18 @@ class MediaDownloadService:
             file_extension = Path(downloaded_file).suffix
             storage_path = f"media/{user.id}/{file_uuid}{file_extension}"
 
-            # Upload to MinIO
+            # Upload to MinIO streaming from disk part by part, hashing the
+            # parts as they are read so duplicate detection needs no extra pass
             logger.info(f"Uploading downloaded video to MinIO: {storage_path}")
             with open(downloaded_file, "rb") as f:
-                file_content = io.BytesIO(f.read())
+                reader = _HashingReader(f)
                 upload_file(
-                    file_content=file_content,
+                    file_content=reader,
                     file_size=file_size,
                     object_name=storage_path,
                     content_type=technical_metadata.get("content_type", "video/mp4"),
                 )
+            file_hash = reader.hexdigest()
 
             if progress_callback:
                 progress_callback(85, "Processing thumbnails...")
@@ -1198,6 +1743,7 @@ class MediaDownloadService:
                 thumbnail_path=thumbnail_path,
                 original_filename=original_filename,
                 source_url=url,
+                file_hash=file_hash,
             )
 
             # Save updated record to database
@@ -1255,18 +1801,11 @@ class MediaDownloadService:
         if progress_callback:
             progress_callback(10, "Extracting playlist information...", {})
 
-        try:
-            playlist_info = self.extract_playlist_info(url)
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Error extracting playlist info: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to extract playlist information: {str(e)}",
-            ) from e
+        # extract_playlist_info() already reports every failure as an HTTPException
+        playlist_info = self.extract_playlist_info(url, lazy=True)
 
-        video_count = playlist_info.get("video_count", 0)
+        # Count reported by the site; entries are enumerated lazily below
+        video_count = playlist_info.get("video_count")
         if video_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1274,20 +1813,36 @@ class MediaDownloadService:
             )
 
         logger.info(
-            f"Found {video_count} videos in playlist: {playlist_info.get('playlist_title')}"
+            f"Found {video_count or 'unknown number of'} videos in playlist: "
+            f"{playlist_info.get('playlist_title')}"
         )
         if progress_callback:
             progress_callback(
                 20,
-                f"Found {video_count} videos in playlist...",
+                f"Found {video_count} videos in playlist..."
+                if video_count
+                else "Enumerating playlist videos...",
                 {"video_count": video_count, "playlist_title": playlist_info.get("playlist_title")},
             )
 
-        # Create placeholder MediaFile records for each video
-        videos = playlist_info.get("videos", [])
-        created_media_files, skipped_videos = _process_playlist_videos(
-            db, user.id, videos, playlist_info, url, video_count, progress_callback
-        )
+        # Create placeholder MediaFile records while the playlist is being paged in
+        videos = playlist_info.pop("videos")
+        try:
+            created_media_files, skipped_videos = _process_playlist_videos(
+                db, user.id, videos, playlist_info, url, video_count or 0, progress_callback
+            )
+        except Exception:
+            # Don't leave already-flushed placeholders behind without their tasks
+            db.rollback()
+            raise
+
+        video_count = len(created_media_files) + len(skipped_videos)
+        playlist_info["video_count"] = video_count
+        if video_count == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Playlist is empty or contains no accessible videos",
+            )
 
         # Commit and refresh all placeholder records
         db.commit()
@@ -38,7 +38,7 @@ def upload_file(file_content: BinaryIO, file_size: int, object_name: str, conten
     Upload a file to MinIO
 
     Args:
-        file_content: File content as a BytesIO object
+        file_content: Readable binary stream (BytesIO or an open file); read in parts
         file_size: Size of the file in bytes
         object_name: Object name in MinIO (path/filename)
         content_type: MIME type of the file
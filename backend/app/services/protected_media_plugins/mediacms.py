@@ -5,16 +5,104 @@ Handles password-protected MediaCMS installations configured via environment.
 
 from __future__ import annotations
 
+import hashlib
+import logging
 import os
 import re
-from typing import Any, Optional
-from urllib.parse import parse_qs, urlparse, urlunparse, urljoin
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, BinaryIO, Callable, Optional
+from urllib.parse import unquote_plus, urlparse, urljoin
 
 import requests
+import urllib3
 from fastapi import HTTPException
+from requests.adapters import HTTPAdapter
 
 from app.services.protected_media_providers import ProtectedMediaProvider
 
+logger = logging.getLogger(__name__)
+
+# Read size used when copying the media response body to disk
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Minimum time between download progress callbacks
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+# A MediaCMS media URL in one pass: scheme, host, then either the
+# /api/v1/media[/<token>] path form or a view URL carrying ?m=<token>.
+# The lazy "??" makes the first non-empty m= win, as parse_qs() did.
+_MEDIACMS_URL_RE = re.compile(
+    r"^(?P<scheme>(?i:https?))://(?P<host>[^/?#]+)"
+    r"(?:(?P<media_path>/+api/+v1/+media(?:/+(?P<path_token>[^/?#]+))?)(?=[/?#]|$))?"
+    r"[^?#]*"
+    r"(?:\?(?:[^#]*?&)??m=(?P<query_token>[^&#]+))?"
+)
+
+# How long a MediaCMS auth token is reused before logging in again
+TOKEN_CACHE_TTL_SECONDS = 600
+
+# Media info responses are reused briefly (e.g. retries, extract then download)
+INFO_CACHE_TTL_SECONDS = 60
+INFO_CACHE_MAX_ENTRIES = 256
+
+
+def _tls_verify_setting() -> bool | str:
+    """Resolve MEDIACMS_CA_BUNDLE into a requests ``verify`` value."""
+    ca_bundle = os.getenv("MEDIACMS_CA_BUNDLE", "").strip()
+    if not ca_bundle:
+        return True
+    if ca_bundle.lower() == "false":
+        logger.warning("TLS certificate verification is disabled for MediaCMS requests")
+        return False
+    return ca_bundle
+
+
+def _password_digest(password: str) -> str:
+    """Digest used in cache keys so cached auth is never shared across passwords."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+class _ProgressWriter:
+    """Write-only file wrapper reporting download progress as data is written.
+
+    Lets ``shutil.copyfileobj`` stream straight from the response into the
+    file while the download progress is still reported (mapped to 20-60%).
+    At most one report is sent per PROGRESS_INTERVAL_SECONDS, and only once
+    another 1/40th of the file (one percentage point) has arrived. The
+    position comes from the file itself, so nothing is counted per write.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        total_bytes: int,
+        progress_callback: Callable[[int, str], None],
+    ) -> None:
+        self._fileobj = fileobj
+        self._total_bytes = total_bytes
+        self._progress_callback = progress_callback
+        self._tick_bytes = max(total_bytes // 40, 1)
+        self._next_tick = self._tick_bytes
+        self._last_report = 0.0
+
+    def write(self, data: bytes) -> int:
+        written = self._fileobj.write(data)
+        now = time.monotonic()
+        if now - self._last_report < PROGRESS_INTERVAL_SECONDS:
+            return written
+        downloaded = self._fileobj.tell()
+        if downloaded < self._next_tick:
+            return written
+        self._last_report = now
+        self._next_tick = (downloaded // self._tick_bytes + 1) * self._tick_bytes
+        progress = 20 + downloaded * 40 // self._total_bytes
+        self._progress_callback(min(progress, 60), "Downloading media...")
+        return written
+
 
 class MediacmsProvider(ProtectedMediaProvider):
     """ProtectedMediaProvider for MediaCMS-based sites.
@@ -23,54 +111,50 @@ class MediacmsProvider(ProtectedMediaProvider):
     variable (comma-separated list, e.g. "media.example.com,mediacms.internal").
     """
 
-    @property
-    def allowed_hosts(self) -> set[str]:
+    def __init__(self) -> None:
+        # One pooled session so login, media info and download share connections
+        self._session = requests.Session()
+        # Verified TLS keeps keep-alive connections and session resumption usable
+        self._session.verify = _tls_verify_setting()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # (base_url, username, password digest) -> (auth token, expiry)
+        self._token_cache: dict[tuple[str, str, str], tuple[str, float]] = {}
+        # (base_url, media token, username, password digest) -> (info, expiry), LRU order
+        self._info_cache: OrderedDict[tuple[str, str, str, str], tuple[dict[str, Any], float]] = (
+            OrderedDict()
+        )
+        self._info_cache_lock = threading.Lock()
+
+    @cached_property
+    def allowed_hosts(self) -> frozenset[str]:
+        # Read once per provider instance; the environment is fixed at startup
         raw = os.getenv("MEDIACMS_ALLOWED_HOSTS", "")
-        return {h.strip() for h in raw.split(",") if h.strip()}
+        return frozenset(h.strip() for h in raw.split(",") if h.strip())
 
     def can_handle(self, url: str) -> bool:
-        try:
-            parsed = urlparse(url)
-            if parsed.scheme not in {"http", "https"}:
-                return False
-            if parsed.netloc not in self.allowed_hosts:
-                return False
-
-            # Either ?m=<token> query param or /api/v1/media/<token> path
-            query = parse_qs(parsed.query)
-            if "m" in query and query["m"]:
-                return True
-
-            path_parts = [p for p in parsed.path.split("/") if p]
-            if len(path_parts) >= 3 and path_parts[0] == "api" and path_parts[1] == "v1" and path_parts[2] == "media":
-                return True
-
-            return False
-        except Exception:
+        match = _MEDIACMS_URL_RE.match(url)
+        if not match or match.group("host") not in self.allowed_hosts:
             return False
 
+        # Either ?m=<token> query param or /api/v1/media/<token> path
+        return bool(match.group("query_token") or match.group("media_path"))
+
     # --- internal helpers -------------------------------------------------
 
     def _get_token_and_base_url(self, url: str) -> tuple[str, str]:
-        parsed = urlparse(url)
+        match = _MEDIACMS_URL_RE.match(url)
 
-        if parsed.netloc not in self.allowed_hosts:
+        if not match or match.group("host") not in self.allowed_hosts:
             raise HTTPException(
                 status_code=400,
                 detail=f"Bad MediaCMS URL: {url}",
             )
 
-        query = parse_qs(parsed.query)
-        friendly_token: Optional[str] = None
-
-        # Primary: view URL with ?m=<token>
-        if "m" in query and query["m"]:
-            friendly_token = query["m"][0]
-        else:
-            # Fallback: /api/v1/media/<token>
-            path_parts = [p for p in parsed.path.split("/") if p]
-            if len(path_parts) >= 3 and path_parts[0] == "api" and path_parts[1] == "v1" and path_parts[2] == "media":
-                friendly_token = path_parts[3] if len(path_parts) >= 4 else None
+        # Primary: view URL with ?m=<token>; fallback: /api/v1/media/<token>
+        query_token = match.group("query_token")
+        friendly_token = unquote_plus(query_token) if query_token else match.group("path_token")
 
         if not friendly_token:
             raise HTTPException(
@@ -78,7 +162,7 @@ class MediacmsProvider(ProtectedMediaProvider):
                 detail="Missing media token (m query param or /api/v1/media/<token>)",
             )
 
-        base_url = urlunparse((parsed.scheme, parsed.netloc, "", "", "", ""))
+        base_url = f"{match.group('scheme').lower()}://{match.group('host')}"
         return friendly_token, base_url
 
     def _login_and_get_info(
@@ -101,34 +185,18 @@ class MediacmsProvider(ProtectedMediaProvider):
             )
 
         friendly_token, base_url = self._get_token_and_base_url(url)
-        auth_payload = {"username": media_user, "password": media_pass}
+        info_key = (base_url, friendly_token, media_user, _password_digest(media_pass))
+        info = self._get_cached_info(info_key)
+        if info is not None:
+            return friendly_token, base_url, info
 
         try:
-            login_resp = requests.post(
-                url=f"{base_url}/api/v1/login",
-                data=auth_payload,
-                timeout=30,
-                verify=False,
-            )
-            login_resp.raise_for_status()
-            token_data = login_resp.json()
-            auth_token = token_data.get("token")
-            if not auth_token:
-                raise HTTPException(
-                    status_code=502,
-                    detail="MediaCMS login did not return an auth token",
-                )
-
-            headers = {
-                "authorization": f"Token {auth_token}",
-                "accept": "application/json",
-            }
-            info_resp = requests.get(
-                url=f"{base_url}/api/v1/media/{friendly_token}",
-                headers=headers,
-                timeout=30,
-                verify=False,
-            )
+            auth_token = self._get_auth_token(base_url, media_user, media_pass)
+            info_resp = self._get_media_info(base_url, friendly_token, auth_token)
+            if info_resp.status_code == 401:
+                # Cached token expired server-side; log in again once
+                auth_token = self._get_auth_token(base_url, media_user, media_pass, refresh=True)
+                info_resp = self._get_media_info(base_url, friendly_token, auth_token)
             info_resp.raise_for_status()
             info = info_resp.json()
 
@@ -141,45 +209,85 @@ class MediacmsProvider(ProtectedMediaProvider):
                 detail=f"Failed to fetch media information from MediaCMS: {e}",
             ) from e
 
+        self._cache_info(info_key, info)
         return friendly_token, base_url, info
 
-    # --- ProtectedMediaProvider implementation ---------------------------
+    def _get_cached_info(self, key: tuple[str, str, str, str]) -> Optional[dict[str, Any]]:
+        with self._info_cache_lock:
+            cached = self._info_cache.get(key)
+            if cached is None:
+                return None
+            if cached[1] <= time.monotonic():
+                del self._info_cache[key]
+                return None
+            self._info_cache.move_to_end(key)
+            return cached[0]
+
+    def _cache_info(self, key: tuple[str, str, str, str], info: dict[str, Any]) -> None:
+        with self._info_cache_lock:
+            self._info_cache[key] = (info, time.monotonic() + INFO_CACHE_TTL_SECONDS)
+            self._info_cache.move_to_end(key)
+            while len(self._info_cache) > INFO_CACHE_MAX_ENTRIES:
+                self._info_cache.popitem(last=False)
+
+    def _get_auth_token(
+        self,
+        base_url: str,
+        username: str,
+        password: str,
+        refresh: bool = False,
+    ) -> str:
+        """Return a MediaCMS auth token, logging in only when none is cached.
+
+        The cache key includes a digest of the password so that a cached token
+        is never handed out for a different password.
+        """
+        key = (base_url, username, _password_digest(password))
+        now = time.monotonic()
 
-    def get_public_auth_config(self) -> dict[str, Any]:
-        """Expose public auth configuration for this provider.
+        cached = self._token_cache.get(key)
+        if cached and not refresh and cached[1] > now:
+            return cached[0]
 
-        Currently uses username/password for all configured hosts.
-        """
-        hosts = sorted(self.allowed_hosts)
-        if not hosts:
-            return {}
-        return {
-            "hosts": hosts,
-            "auth_type": "user_password",
-            "fields": [
-                {
-                    "name": "media_username",
-                    "label": "Media username",
-                    "type": "text",
-                },
-                {
-                    "name": "media_password",
-                    "label": "Media password",
-                    "type": "password",
-                },
-            ],
+        login_resp = self._session.post(
+            url=f"{base_url}/api/v1/login",
+            data={"username": username, "password": password},
+            timeout=30,
+        )
+        login_resp.raise_for_status()
+        auth_token = login_resp.json().get("token")
+        if not auth_token:
+            raise HTTPException(
+                status_code=502,
+                detail="MediaCMS login did not return an auth token",
+            )
+
+        # Drop expired entries so the cache stays bounded by active logins
+        self._token_cache = {k: v for k, v in self._token_cache.items() if v[1] > now}
+        self._token_cache[key] = (auth_token, now + TOKEN_CACHE_TTL_SECONDS)
+        return auth_token
+
+    def _get_media_info(
+        self, base_url: str, friendly_token: str, auth_token: str
+    ) -> requests.Response:
+        headers = {
+            "authorization": f"Token {auth_token}",
+            "accept": "application/json",
         }
+        return self._session.get(
+            url=f"{base_url}/api/v1/media/{friendly_token}",
+            headers=headers,
+            timeout=30,
+        )
 
-    def extract_info(
+    def _build_media_info(
         self,
+        friendly_token: str,
+        base_url: str,
+        info: dict[str, Any],
         url: str,
-        username: Optional[str] = None,
-        password: Optional[str] = None,
     ) -> dict[str, Any]:
-        friendly_token, base_url, info = self._login_and_get_info(
-            url, username=username, password=password
-        )
-
+        """Build the yt-dlp-like info dict from MediaCMS media JSON."""
         title = info.get("title") or info.get("name") or friendly_token
 
         # MediaCMS may return relative thumbnail paths like
@@ -211,6 +319,45 @@ class MediacmsProvider(ProtectedMediaProvider):
         media_info["mediacms_base_url"] = base_url
         return media_info
 
+    # --- ProtectedMediaProvider implementation ---------------------------
+
+    def get_public_auth_config(self) -> dict[str, Any]:
+        """Expose public auth configuration for this provider.
+
+        Currently uses username/password for all configured hosts.
+        """
+        hosts = sorted(self.allowed_hosts)
+        if not hosts:
+            return {}
+        return {
+            "hosts": hosts,
+            "auth_type": "user_password",
+            "fields": [
+                {
+                    "name": "media_username",
+                    "label": "Media username",
+                    "type": "text",
+                },
+                {
+                    "name": "media_password",
+                    "label": "Media password",
+                    "type": "password",
+                },
+            ],
+        }
+
+    def extract_info(
+        self,
+        url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+    ) -> dict[str, Any]:
+        friendly_token, base_url, info = self._login_and_get_info(
+            url, username=username, password=password
+        )
+
+        return self._build_media_info(friendly_token, base_url, info, url)
+
     def download(
         self,
         url: str,
@@ -236,10 +383,11 @@ class MediacmsProvider(ProtectedMediaProvider):
             if progress_callback:
                 progress_callback(20, "Downloading media from authenticated source...")
 
-            with requests.get(download_url, stream=True, timeout=300, verify=False) as resp:
+            with self._session.get(download_url, stream=True, timeout=300) as resp:
                 resp.raise_for_status()
                 total_bytes = int(resp.headers.get("Content-Length", "0")) or None
-                downloaded = 0
+                # Let urllib3 undo any Content-Encoding while copying from the raw stream
+                resp.raw.decode_content = True
 
                 raw_title = info.get("title") or info.get("name") or friendly_token
                 clean_title = re.sub(r"[^\w\-_\. ]", "_", str(raw_title))[:200]
@@ -250,25 +398,25 @@ class MediacmsProvider(ProtectedMediaProvider):
 
                 file_path = os.path.join(output_path, filename)
                 with open(file_path, "wb") as f:
-                    for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                        if not chunk:
-                            continue
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback and total_bytes and total_bytes > 0:
-                            progress = int(20 + (downloaded / total_bytes) * 40)
-                            progress_callback(min(progress, 60), "Downloading media...")
+                    target = (
+                        _ProgressWriter(f, total_bytes, progress_callback)
+                        if progress_callback and total_bytes
+                        else f
+                    )
+                    shutil.copyfileobj(resp.raw, target, DOWNLOAD_CHUNK_SIZE)
 
         except HTTPException:
             raise
-        except requests.exceptions.RequestException as e:
+        # Reading resp.raw directly means a reset, read timeout or truncated body
+        # surfaces as a urllib3 error rather than a requests one
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
             raise HTTPException(
                 status_code=502,
-                detail=f"Failed to download media file from MediaCMS: {e}", 
+                detail=f"Failed to download media file from MediaCMS: {e}",
             ) from e
 
-        # Build info dict (consistent with extract_info)
-        media_info = self.extract_info(url, username=username, password=password)
+        # Build info dict (consistent with extract_info) from the info already fetched
+        media_info = self._build_media_info(friendly_token, base_url, info, url)
 
         return {
             "file_path": file_path,
@@ -14,7 +14,10 @@ from __future__ import annotations
 import importlib
 import logging
 import pkgutil
+import sys
+from functools import lru_cache
 from typing import Any, Callable, Optional, Protocol
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
@@ -104,10 +107,18 @@ def _load_providers() -> list[ProtectedMediaProvider]:
     prefix = plugin_pkg.__name__ + "."
 
     for module_info in pkgutil.iter_modules(package_path, prefix):
+        modules_before = set(sys.modules)
         try:
             module = importlib.import_module(module_info.name)
         except Exception as e:
             logger.warning(f"Failed to import protected media plugin {module_info.name}: {e}")
+            # Don't keep the half-initialized plugin (or its submodules) loaded.
+            # Shared modules it imported stay: importing those again would
+            # redefine their classes and SQLAlchemy tables.
+            plugin_prefix = module_info.name + "."
+            for name in set(sys.modules) - modules_before:
+                if name == module_info.name or name.startswith(plugin_prefix):
+                    sys.modules.pop(name, None)
             continue
 
         # Convention 1: module-level variable `provider`
@@ -128,21 +139,91 @@ def _load_providers() -> list[ProtectedMediaProvider]:
     return providers
 
 
-# Registry of all protected media providers (loaded at import time)
-PROTECTED_MEDIA_PROVIDERS: list[ProtectedMediaProvider] = _load_providers()
+@lru_cache(maxsize=1)
+def get_protected_media_providers() -> tuple[ProtectedMediaProvider, ...]:
+    """Return the registry of protected media providers, loading plugins on first use.
 
+    Discovery imports every plugin module (and their HTTP/cookie dependencies),
+    so it is deferred until a URL actually needs to be checked instead of
+    running whenever this module is imported. The registry is a tuple so the
+    shared, cached instance can't be mutated by callers.
+    """
+    return tuple(_load_providers())
 
-def get_protected_media_auth_config() -> list[dict[str, Any]]:
-    """Aggregate public auth config for all protected media providers.
 
-    Each entry is expected to have at minimum:
-      - hosts: list of hostnames
-      - auth_type: short string describing auth mechanism
-      - fields: optional list of field descriptors for UI
+# (host -> provider, providers that advertise no hosts)
+_HostIndex = tuple[dict[str, ProtectedMediaProvider], list[ProtectedMediaProvider]]
+
+
+@lru_cache(maxsize=1)
+def _provider_host_index() -> _HostIndex:
+    """Map each advertised host to its provider.
+
+    Hosts come from get_public_auth_config()["hosts"]. Providers that do not
+    advertise any host are returned separately and are always consulted.
     """
+    host_index: dict[str, ProtectedMediaProvider] = {}
+    unindexed: list[ProtectedMediaProvider] = []
+
+    for provider in get_protected_media_providers():
+        hosts: list[str] = []
+        get_config = getattr(provider, "get_public_auth_config", None)
+        if callable(get_config):
+            try:
+                hosts = (get_config() or {}).get("hosts") or []
+            except Exception as e:
+                logger.warning(
+                    f"get_public_auth_config() failed for {provider.__class__.__name__}: {e}"
+                )
+
+        if not hosts:
+            unindexed.append(provider)
+            continue
+        for host in hosts:
+            host_index.setdefault(host.lower(), provider)
+
+    return host_index, unindexed
+
+
+@lru_cache(maxsize=512)
+def find_provider(url: str) -> Optional[ProtectedMediaProvider]:
+    """Return the protected media provider that can handle url, if any.
+
+    The URL's host selects a candidate from the host index, so URLs for
+    unrelated sites only reach providers that do not advertise their hosts.
+    The candidate's can_handle() still has the final say. Results are cached
+    per URL (the same URL is resolved for both extraction and download);
+    providers also inspect the path and query, so the key is the full URL.
+    """
+    host_index, unindexed = _provider_host_index()
+    candidate = host_index.get(urlsplit(url).netloc.lower())
+    candidates = [candidate, *unindexed] if candidate is not None else unindexed
+
+    for provider in candidates:
+        try:
+            if provider.can_handle(url):
+                return provider
+        except Exception as e:
+            logger.warning(
+                f"Protected media provider {provider.__class__.__name__} "
+                f"failed in can_handle for {url}: {e}"
+            )
+    return None
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: keep ``PROTECTED_MEDIA_PROVIDERS`` working as a lazily loaded attribute
+    if name == "PROTECTED_MEDIA_PROVIDERS":
+        return get_protected_media_providers()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def _compute_auth_configs() -> tuple[dict[str, Any], ...]:
+    """Collect public auth config from every provider (computed once)."""
     configs: list[dict[str, Any]] = []
 
-    for provider in PROTECTED_MEDIA_PROVIDERS:
+    for provider in get_protected_media_providers():
         get_config = getattr(provider, "get_public_auth_config", None)
         if not callable(get_config):
             continue
@@ -155,4 +236,32 @@ def get_protected_media_auth_config() -> list[dict[str, Any]]:
                 f"get_public_auth_config() failed for {provider.__class__.__name__}: {e}"
             )
 
-    return configs
+    return tuple(configs)
+
+
+def get_protected_media_auth_config() -> list[dict[str, Any]]:
+    """Aggregate public auth config for all protected media providers.
+
+    Each entry is expected to have at minimum:
+      - hosts: list of hostnames
+      - auth_type: short string describing auth mechanism
+      - fields: optional list of field descriptors for UI
+
+    The provider registry and its configuration are fixed after startup, so
+    the result is computed once; use refresh_protected_media_auth_config()
+    to rebuild it.
+    """
+    return list(_compute_auth_configs())
+
+
+def refresh_protected_media_auth_config() -> list[dict[str, Any]]:
+    """Reload the providers and recompute their auth config and host index.
+
+    Drops every cache derived from the providers, so a configuration change
+    (for example to MEDIACMS_ALLOWED_HOSTS) also reaches URL dispatch.
+    """
+    get_protected_media_providers.cache_clear()
+    _provider_host_index.cache_clear()
+    find_provider.cache_clear()
+    _compute_auth_configs.cache_clear()
+    return get_protected_media_auth_config()
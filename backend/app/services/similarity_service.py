@@ -80,35 +80,25 @@ class SimilarityService:
         if not target_embeddings:
             return []
 
-        # Convert all inputs to torch tensors
-        if isinstance(query_embedding, np.ndarray):
-            query_tensor = torch.from_numpy(query_embedding).float()
+        # Convert the whole batch at once rather than one tensor per target
+        if all(isinstance(target, np.ndarray) for target in target_embeddings):
+            targets_matrix = torch.from_numpy(np.asarray(target_embeddings, dtype=np.float32))
         else:
-            query_tensor = query_embedding.float()
-
-        target_tensors = []
-        for target in target_embeddings:
-            if isinstance(target, np.ndarray):
-                target_tensors.append(torch.from_numpy(target).float())
-            else:
-                target_tensors.append(target.float())
+            targets_matrix = torch.stack(
+                [torch.as_tensor(target).float() for target in target_embeddings]
+            )
+        query_tensor = torch.as_tensor(query_embedding).float()
 
-        # Stack targets into a single tensor and move to device
-        targets_matrix = torch.stack(target_tensors).to(SimilarityService.device)
+        targets_matrix = targets_matrix.to(SimilarityService.device)
         query_tensor = query_tensor.to(SimilarityService.device)
 
-        # Compute all similarities at once using PyTorch's vectorized operations
+        # Compute all similarities at once; the query row broadcasts against every target
         similarities = nn_functional.cosine_similarity(
-            query_tensor.unsqueeze(0).expand(targets_matrix.size(0), -1), targets_matrix, dim=1
+            query_tensor.unsqueeze(0), targets_matrix, dim=1
         )
 
-        # Convert to Python floats and ensure valid range
-        result = []
-        for sim in similarities:
-            score = float(sim.item())
-            result.append(max(0.0, min(1.0, score)))
-
-        return result
+        # Clamp on the device and copy back once; .item() per score synchronizes each time
+        return similarities.clamp(0.0, 1.0).tolist()
 
     @staticmethod
     def opensearch_similarity_search(
@@ -1,19 +1,38 @@
+import contextlib
+import heapq
 import logging
 import os
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from typing import Optional
+from typing import Union
 
 import numpy as np
-import torch
-from pyannote.audio import Inference
-from pyannote.core import Segment
 
 from app.core.config import settings
 from app.utils.hardware_detection import detect_hardware
 
 logger = logging.getLogger(__name__)
 
+# The missing-token warning is logged once per process, not once per job
+_missing_hf_token_warned = False
+
+
+def _get_hf_token() -> Optional[str]:
+    """Return the configured Hugging Face token, warning once if it is missing."""
+    global _missing_hf_token_warned
+
+    hf_token = settings.HUGGINGFACE_TOKEN or None
+    # Only warn about missing token if not in offline mode (models pre-downloaded)
+    if not hf_token and not _missing_hf_token_warned and os.getenv("HF_HUB_OFFLINE") != "1":
+        logger.warning(
+            "No HUGGINGFACE_TOKEN found in settings. This may be required for gated models."
+        )
+        _missing_hf_token_warned = True
+    return hf_token
+
 
 class SpeakerEmbeddingService:
     """Service for extracting speaker embeddings using pyannote."""
@@ -35,21 +54,29 @@ class SpeakerEmbeddingService:
         # Hardware detection
         self.hardware_config = detect_hardware()
         pyannote_config = self.hardware_config.get_pyannote_config()
-        self.device = torch.device(pyannote_config["device"])
+        # torch and pyannote are imported lazily so API processes that only import
+        # this module (e.g. for type references) don't pay their startup cost
+        import torch
+
+        # get_pyannote_config() already returns a torch.device when torch is available
+        device = pyannote_config["device"]
+        self.device = device if isinstance(device, torch.device) else torch.device(device)
+
+        # Decoded audio keyed on (path, mtime), so repeated crops of the same file
+        # skip decoding. An entry is a whole waveform (about 920 MB for 4 hours),
+        # so only one is kept, and only until the call that loaded it returns.
+        self._decode_audio_cached = lru_cache(maxsize=1)(self._decode_audio)
 
         # Initialize the model
         self._initialize_model()
 
     def _initialize_model(self):
         """Initialize the pyannote embedding model."""
+        from pyannote.audio import Inference
+
         try:
             # Check if we have a Hugging Face token
-            hf_token = settings.HUGGINGFACE_TOKEN
-            # Only warn about missing token if not in offline mode (models pre-downloaded)
-            if not hf_token and os.getenv("HF_HUB_OFFLINE") != "1":
-                logger.warning(
-                    "No HUGGINGFACE_TOKEN found in settings. This may be required for gated models."
-                )
+            hf_token = _get_hf_token()
 
             # Log VRAM before loading embedding model
             self.hardware_config.log_vram_usage("before embedding model load")
@@ -67,14 +94,86 @@ class SpeakerEmbeddingService:
                 logger.info("Initializing pyannote embedding model without authentication")
                 self.inference = Inference(self.model_name, window="whole", device=self.device)
 
+            if settings.SPEAKER_EMBEDDING_COMPILE:
+                self._compile_model()
+
             self.hardware_config.log_vram_usage("after embedding model loaded")
             logger.info(f"Initialized pyannote embedding model on {self.device}")
         except Exception as e:
             logger.error(f"Error initializing pyannote embedding model: {e}")
             raise
 
+    def _compile_model(self) -> None:
+        """
+        Compile the embedding model's forward pass with torch.compile, if possible.
+
+        Segment lengths vary, so the graph is compiled with dynamic shapes to
+        avoid recompiling for every new duration. A short warm-up pass pays the
+        compile cost up front. Any failure falls back to eager mode.
+        """
+        import torch
+
+        if self.device.type != "cuda" or not hasattr(torch, "compile"):
+            logger.info("Skipping torch.compile for embedding model (requires CUDA and torch 2.x)")
+            return
+
+        model = self.inference.model
+        eager_forward = model.forward
+        try:
+            model.forward = torch.compile(eager_forward, dynamic=True)
+            warmup = torch.zeros(1, 1, model.audio.sample_rate * 5, device=self.device)
+            with self._inference_context():
+                model(warmup)
+            logger.info("Compiled pyannote embedding model with torch.compile")
+        except Exception as e:
+            model.forward = eager_forward
+            logger.warning(f"torch.compile failed for embedding model, using eager mode: {e}")
+
+    def _inference_context(self) -> contextlib.ExitStack:
+        """
+        Context for embedding forward passes: no autograd, and FP16 autocast on CUDA.
+
+        Autocast lets the backbone's convolutions and matmuls run on tensor
+        cores in half precision while keeping numerically sensitive ops in FP32.
+        """
+        import torch
+
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self.device.type == "cuda":
+            stack.enter_context(torch.autocast(device_type="cuda", dtype=torch.float16))
+        return stack
+
+    def _decode_audio(self, audio_path: str, mtime: float) -> dict[str, Any]:
+        """Decode an audio file; mtime only makes rewritten files miss the cache."""
+        waveform, sample_rate = self.inference.model.audio(audio_path)
+        return {"waveform": waveform, "sample_rate": sample_rate}
+
+    def _load_audio(self, audio_path: str) -> Optional[dict[str, Any]]:
+        """
+        Decode an audio file into the in-memory form pyannote accepts, with caching.
+
+        The waveform is resampled and downmixed the same way the embedding
+        model reads files, so crops of it give the same embeddings as crops
+        of the file.
+
+        Args:
+            audio_path: Path to the audio file
+
+        Returns:
+            Dict with 'waveform' and 'sample_rate', or None if decoding failed
+        """
+        try:
+            return self._decode_audio_cached(audio_path, os.stat(audio_path).st_mtime)
+        except Exception as e:
+            logger.warning(f"Could not preload {audio_path}, cropping from file instead: {e}")
+            return None
+
     def extract_embedding_from_file(
-        self, audio_path: str, segment: Optional[dict[str, float]] = None
+        self,
+        audio_path: str,
+        segment: Optional[dict[str, float]] = None,
+        audio: Optional[dict[str, Any]] = None,
     ) -> Optional[np.ndarray]:
         """
         Extract speaker embedding from an audio file or segment.
@@ -82,46 +181,50 @@ class SpeakerEmbeddingService:
         Args:
             audio_path: Path to the audio file
             segment: Optional segment dict with 'start' and 'end' times
+            audio: Optional audio_path already decoded by _load_audio(); loaded
+                (or taken from the decode cache) here when not given
 
         Returns:
             Numpy array of the embedding or None if failed
         """
-        try:
-            if segment:
-                # Extract embedding from a specific segment
-                excerpt = Segment(segment["start"], segment["end"])
-                embedding = self.inference.crop(audio_path, excerpt)
-            else:
-                # Extract embedding from the whole file
-                embedding = self.inference(audio_path)
+        from pyannote.core import Segment
 
-            return embedding
+        if audio is None:
+            audio = self._load_audio(audio_path)
+        source = audio if audio is not None else audio_path
+        try:
+            with self._inference_context():
+                if segment:
+                    # Extract embedding from a specific segment
+                    excerpt = Segment(segment["start"], segment["end"])
+                    embedding = self.inference.crop(source, excerpt)
+                else:
+                    # Extract embedding from the whole file
+                    embedding = self.inference(source)
+
+            # Autocast may yield float16; keep downstream similarity math in float32
+            return np.asarray(embedding, dtype=np.float32)
 
         except Exception as e:
             logger.error(f"Error extracting embedding from {audio_path}: {e}")
             return None
 
-    def extract_embeddings_for_segments(
-        self,
-        audio_path: str,
-        segments: list[dict[str, Any]],
-        speaker_mapping: dict[str, int],
-    ) -> dict[int, list[np.ndarray]]:
+    @staticmethod
+    def _group_segments_by_speaker(
+        segments: list[dict[str, Any]], speaker_mapping: dict[str, int]
+    ) -> dict[int, list[dict[str, Any]]]:
         """
-        Extract embeddings for all speaker segments in a transcription.
+        Collect the segments long enough to embed, grouped by speaker database ID.
 
         Args:
-            audio_path: Path to the audio file
             segments: List of transcript segments with speaker information
             speaker_mapping: Mapping of speaker labels to database IDs
 
         Returns:
-            Dictionary mapping speaker IDs to lists of embeddings
+            Dictionary mapping speaker IDs to their segments
         """
-        speaker_embeddings: dict[int, list[np.ndarray]] = {}
-        speaker_segments: dict[int, list[dict[str, Any]]] = {}  # Collect segments per speaker
+        speaker_segments: defaultdict[int, list[dict[str, Any]]] = defaultdict(list)
 
-        # First, collect all segments for each speaker
         for segment in segments:
             speaker_label = segment.get("speaker")
             if not speaker_label:
@@ -136,52 +239,164 @@ class SpeakerEmbeddingService:
             if duration < 0.5:
                 continue
 
-            if speaker_id not in speaker_segments:
-                speaker_segments[speaker_id] = []
             speaker_segments[speaker_id].append(segment)
 
-        # Now extract embeddings for each speaker, using their longest segments
-        for speaker_id, speaker_segs in speaker_segments.items():
-            # Sort segments by duration (longest first)
-            speaker_segs.sort(key=lambda x: x["end"] - x["start"], reverse=True)
+        return dict(speaker_segments)
 
-            # Use up to 5 longest segments for this speaker (to avoid too much processing)
-            selected_segments = speaker_segs[:5]
+    def extract_embeddings_for_segments(
+        self,
+        audio_path: str,
+        segments: list[dict[str, Any]],
+        speaker_mapping: dict[str, int],
+    ) -> dict[int, np.ndarray]:
+        """
+        Extract embeddings for all speaker segments in a transcription.
 
-            embeddings = []
-            for segment in selected_segments:
-                embedding = self.extract_embedding_from_file(
-                    audio_path, {"start": segment["start"], "end": segment["end"]}
-                )
+        Args:
+            audio_path: Path to the audio file
+            segments: List of transcript segments with speaker information
+            speaker_mapping: Mapping of speaker labels to database IDs
 
-                if embedding is not None:
-                    embeddings.append(embedding)
+        Returns:
+            Dictionary mapping speaker IDs to (N, D) arrays of embeddings
+        """
+        speaker_embeddings: dict[int, np.ndarray] = {}
+
+        # First, collect all segments for each speaker
+        speaker_segments = self._group_segments_by_speaker(segments, speaker_mapping)
+        if not speaker_segments:
+            return speaker_embeddings
+
+        # Decode the file once; every speaker's segments are cropped from memory
+        audio = self._load_audio(audio_path)
+
+        try:
+            # Now extract embeddings for each speaker, using their longest segments
+            for speaker_id, speaker_segs in speaker_segments.items():
+                # Use up to 5 longest segments for this speaker (to avoid too much processing)
+                selected_segments = heapq.nlargest(
+                    5, speaker_segs, key=lambda x: x["end"] - x["start"]
+                )
 
-            if embeddings:
-                speaker_embeddings[speaker_id] = embeddings
-                logger.info(f"Extracted {len(embeddings)} embeddings for speaker {speaker_id}")
+                embeddings = self._embed_segments(audio_path, selected_segments, audio)
+                if embeddings is not None:
+                    speaker_embeddings[speaker_id] = embeddings
+                    logger.info(f"Extracted {len(embeddings)} embeddings for speaker {speaker_id}")
+        finally:
+            # Don't hold the whole waveform in worker memory between jobs
+            self._decode_audio_cached.cache_clear()
 
         return speaker_embeddings
 
-    def aggregate_embeddings(self, embeddings: list[np.ndarray]) -> np.ndarray:
+    def _embed_segments(
+        self,
+        audio_path: str,
+        segments: list[dict[str, Any]],
+        audio: Optional[dict[str, Any]],
+    ) -> Optional[np.ndarray]:
+        """
+        Extract one embedding per segment into a single (N, D) float32 array.
+
+        With in-memory audio the segments go through the model as one batch.
+        Otherwise, or if the batch fails, rows are embedded one at a time and
+        written in place into a buffer sized for all segments, so no
+        per-speaker list has to be stacked again before aggregation.
+
+        Args:
+            audio_path: Path to the audio file
+            segments: Segments to embed
+            audio: Optional in-memory audio from _load_audio()
+
+        Returns:
+            Array with one row per successful segment, or None if all failed
+        """
+        if audio is not None:
+            embeddings = self._embed_segments_batched(audio, segments)
+            if embeddings is not None:
+                return embeddings
+
+        buffer: Optional[np.ndarray] = None
+        count = 0
+
+        for segment in segments:
+            embedding = self.extract_embedding_from_file(
+                audio_path, {"start": segment["start"], "end": segment["end"]}, audio=audio
+            )
+            if embedding is None:
+                continue
+            if buffer is None:
+                buffer = np.empty((len(segments), embedding.size), dtype=np.float32)
+            buffer[count] = embedding.reshape(-1)
+            count += 1
+
+        return buffer[:count] if buffer is not None else None
+
+    def _embed_segments_batched(
+        self, audio: dict[str, Any], segments: list[dict[str, Any]]
+    ) -> Optional[np.ndarray]:
+        """
+        Embed segments of in-memory audio with a single forward pass.
+
+        Each segment is cropped the way Inference.crop() does it, and the crops
+        are zero-padded to the longest one. The padding is masked out through
+        the model's ``weights`` input, so its statistics pooling only sees
+        real samples.
+
+        Args:
+            audio: In-memory audio from _load_audio()
+            segments: Segments to embed
+
+        Returns:
+            (N, D) float32 array, or None if the batched pass failed
+        """
+        import torch
+        from pyannote.core import Segment
+
+        try:
+            crops = []
+            for segment in segments:
+                # Decoded audio is downmixed to mono, so take the single channel
+                waveform, _ = self.inference.model.audio.crop(
+                    audio, Segment(segment["start"], segment["end"])
+                )
+                crops.append(waveform[0])
+            num_samples = max(crop.shape[-1] for crop in crops)
+            waveforms = torch.zeros(len(crops), 1, num_samples)
+            masks = torch.zeros(len(crops), num_samples)
+            for row, crop in enumerate(crops):
+                waveforms[row, 0, : crop.shape[-1]] = crop
+                masks[row, : crop.shape[-1]] = 1.0
+
+            with self._inference_context():
+                embeddings = self.inference.model(
+                    waveforms.to(self.device), weights=masks.to(self.device)
+                )
+
+            # Autocast may yield float16; keep downstream similarity math in float32
+            return embeddings.float().cpu().numpy()
+        except Exception as e:
+            logger.warning(f"Batched embedding failed, embedding segments one at a time: {e}")
+            return None
+
+    def aggregate_embeddings(self, embeddings: Union[list[np.ndarray], np.ndarray]) -> np.ndarray:
         """
         Aggregate multiple embeddings into a single representative embedding.
 
         Args:
-            embeddings: List of numpy arrays
+            embeddings: List of numpy arrays, or an already stacked (N, D) array
 
         Returns:
             Aggregated embedding (mean of all embeddings)
         """
-        if not embeddings:
+        if len(embeddings) == 0:
             raise ValueError("No embeddings to aggregate")
 
         if len(embeddings) == 1:
             return embeddings[0]
 
-        # Stack all embeddings and compute mean
-        stacked = np.vstack(embeddings)
-        return np.mean(stacked, axis=0)
+        # Stack (only when given a list) and compute mean
+        stacked = embeddings if isinstance(embeddings, np.ndarray) else np.vstack(embeddings)
+        return stacked.mean(axis=0)
 
     def compute_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -213,10 +428,13 @@ class SpeakerEmbeddingService:
         """
         embeddings = []
 
-        for audio_path in audio_paths:
-            embedding = self.extract_embedding_from_file(audio_path)
-            if embedding is not None:
-                embeddings.append(embedding)
+        try:
+            for audio_path in audio_paths:
+                embedding = self.extract_embedding_from_file(audio_path)
+                if embedding is not None:
+                    embeddings.append(embedding)
+        finally:
+            self._decode_audio_cached.cache_clear()
 
         if not embeddings:
             logger.error("Failed to extract any embeddings from reference audio")
@@ -238,17 +456,30 @@ class SpeakerEmbeddingService:
         """
         self.hardware_config.log_vram_usage("before embedding model cleanup")
 
+        # Drop cached waveforms along with the model
+        self._decode_audio_cached.cache_clear()
+
         if hasattr(self, "inference"):
             logger.info("Cleaning up PyAnnote embedding model")
+            # Move weights off the GPU first so VRAM is released even if another
+            # reference to the model (e.g. in pyannote internals) outlives this one
+            try:
+                self.inference.model.to("cpu")
+            except Exception as e:
+                logger.debug(f"Could not move embedding model to CPU before cleanup: {e}")
             del self.inference
 
         # Force aggressive memory cleanup
         import gc
 
+        import torch
+
         gc.collect()
 
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
+            # Release CUDA IPC handles still pinning freed blocks
+            torch.cuda.ipc_collect()
             torch.cuda.synchronize()
 
         self.hardware_config.log_vram_usage("after embedding model cleanup")
@@ -434,14 +434,14 @@ class SpeakerMatchingService:
         return results
 
     def _process_single_speaker(
-        self, speaker_id: int, embeddings: list[np.ndarray], user_id: int, media_file_id: int
+        self, speaker_id: int, embeddings: np.ndarray, user_id: int, media_file_id: int
     ) -> Optional[dict[str, Any]]:
         """
         Process a single speaker's embeddings and find matches.
 
         Args:
             speaker_id: Speaker ID
-            embeddings: List of embeddings for this speaker
+            embeddings: (N, D) array of embeddings for this speaker
             user_id: User ID
             media_file_id: Media file ID
 
@@ -449,7 +449,7 @@ class SpeakerMatchingService:
             Speaker processing result or None if failed
         """
 
-        if not embeddings:
+        if len(embeddings) == 0:
             logger.warning(f"No valid embeddings for speaker {speaker_id}")
             return None
 
@@ -10,9 +10,15 @@ import logging
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from typing import Optional
 
+from sqlalchemy import exists
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
+from app.core.celery import celery_app
 from app.core.task_config import task_recovery_config
 from app.models.media import FileStatus
 from app.models.media import MediaFile
@@ -21,6 +27,18 @@ from app.utils.task_utils import update_media_file_from_task_status
 
 logger = logging.getLogger(__name__)
 
+# Task statuses that mean a Celery task is still expected to make progress
+ACTIVE_TASK_STATUSES = ("pending", "in_progress")
+
+
+def _active_task_exists(*criteria):
+    """EXISTS clause for an active task of the MediaFile in the enclosing query."""
+    return exists().where(
+        Task.media_file_id == MediaFile.id,
+        Task.status.in_(ACTIVE_TASK_STATUSES),
+        *criteria,
+    )
+
 
 class TaskDetectionService:
     """Service for detecting task and file issues."""
@@ -72,8 +90,14 @@ class TaskDetectionService:
 
         This method identifies files that are marked as PROCESSING but have:
         1. No tasks in "pending" or "in_progress" state
-        2. Been in this state for longer than a threshold time
+        2. Been in this state for longer than STUCK_FILE_THRESHOLD
         3. No recent task updates (indicating Celery worker may have died)
+        4. No task that a Celery worker reports as running or reserved
+
+        Task progress is only written when a step reports it, so a long step can
+        look stale in the database while it is still running; the Celery check
+        keeps such files from being recovered. If the workers cannot be asked,
+        no files are reported.
 
         Args:
             db: Database session
@@ -82,98 +106,137 @@ class TaskDetectionService:
             List of stuck files that need recovery
         """
         now = datetime.now(timezone.utc)
-        stuck_threshold = now - timedelta(minutes=5)  # Files stuck for 5+ minutes
+        stuck_threshold = now - timedelta(seconds=self.config.STUCK_FILE_THRESHOLD)
+
+        # One query: PROCESSING files untouched for too long that have no recently
+        # updated active task, plus their active-task count and completed-task flag
+        active_task_count = (
+            select(func.count(Task.id))
+            .where(Task.media_file_id == MediaFile.id, Task.status.in_(ACTIVE_TASK_STATUSES))
+            .scalar_subquery()
+        )
+        has_completed_task = (
+            exists()
+            .where(Task.media_file_id == MediaFile.id, Task.status == "completed")
+            .label("has_completed_task")
+        )
+        # MediaFile has no updated_at; use the latest task activity recorded on it
+        last_update = func.coalesce(
+            MediaFile.task_last_update, MediaFile.task_started_at, MediaFile.upload_time
+        )
+        candidates = (
+            db.query(MediaFile, active_task_count, has_completed_task, last_update)
+            .filter(
+                MediaFile.status == FileStatus.PROCESSING,
+                last_update < stuck_threshold,
+                ~_active_task_exists(Task.updated_at > stuck_threshold),
+            )
+            .all()
+        )
+
+        if not candidates:
+            logger.info("Identified 0 stuck files without active Celery tasks")
+            return []
 
-        # Get all files currently in PROCESSING state
-        processing_files = (
-            db.query(MediaFile).filter(MediaFile.status == FileStatus.PROCESSING).all()
+        running_task_ids = self._get_running_celery_task_ids()
+        if running_task_ids is None:
+            logger.warning(
+                f"Could not get running tasks from Celery workers; skipping recovery of "
+                f"{len(candidates)} possibly stuck files"
+            )
+            return []
+        running_file_ids = self._find_files_with_running_tasks(
+            db, [row[0] for row in candidates], running_task_ids
         )
 
         stuck_files = []
-        for media_file in processing_files:
-            # Check if file has been processing for too long
-            if media_file.updated_at and media_file.updated_at < stuck_threshold:
-                # Check if there are any active tasks
-                active_tasks = (
-                    db.query(Task)
-                    .filter(
-                        Task.media_file_id == media_file.id,
-                        Task.status.in_(["pending", "in_progress"]),
-                    )
-                    .all()
+        for media_file, active_count, has_completed, file_last_update in candidates:
+            if media_file.id in running_file_ids:
+                logger.info(
+                    f"File {media_file.id} ({media_file.filename}) has no recent task updates "
+                    f"but its task is still running in Celery; skipping recovery."
                 )
-
-                if not active_tasks:
-                    # Before marking the file as stuck, try to reconcile its status from task history.
-                    # This prevents false positives where tasks completed but file status wasn't updated.
-                    refreshed_file = update_media_file_from_task_status(db, media_file.id)
-                    if refreshed_file and refreshed_file.status in [
-                        FileStatus.COMPLETED,
-                        FileStatus.ERROR,
-                    ]:
-                        logger.info(
-                            f"File {media_file.id} ({media_file.filename}) was marked as processing "
-                            f"but all tasks have finished with status {refreshed_file.status.value}; "
-                            f"skipping recovery."
-                        )
-                        continue
-
-                    # File is still marked as processing and has no active tasks - treat as stuck.
-                    stuck_files.append(media_file)
+                continue
+
+            # Before marking the file as stuck, try to reconcile its status from task
+            # history. This prevents false positives where tasks completed (or, with
+            # stale active tasks, some completed) but the file status wasn't updated.
+            if active_count == 0 or has_completed:
+                refreshed_file = update_media_file_from_task_status(db, media_file.id)
+                if refreshed_file and refreshed_file.status in [
+                    FileStatus.COMPLETED,
+                    FileStatus.ERROR,
+                ]:
                     logger.info(
-                        f"Found stuck file {media_file.id} ({media_file.filename}) - "
-                        f"processing for {(now - media_file.updated_at).total_seconds() / 60:.1f} minutes "
-                        f"with no active tasks"
+                        f"File {media_file.id} ({media_file.filename}) was marked as processing "
+                        f"but its tasks have finished with status {refreshed_file.status.value}; "
+                        f"skipping recovery."
                     )
-                else:
-                    # Check if tasks are truly stuck (no recent updates)
-                    all_tasks_stale = True
-                    for task in active_tasks:
-                        if task.updated_at and task.updated_at > stuck_threshold:
-                            all_tasks_stale = False
-                            break
-
-                    if all_tasks_stale:
-                        # Before marking as stuck, check if file has completed tasks
-                        # (e.g., transcription completed but file status wasn't updated)
-                        completed_tasks = (
-                            db.query(Task)
-                            .filter(
-                                Task.media_file_id == media_file.id,
-                                Task.status == "completed",
-                            )
-                            .order_by(Task.completed_at.desc())
-                            .first()
-                        )
-
-                        if completed_tasks:
-                            # File has completed tasks but status wasn't updated
-                            # Attempt to reconcile status and skip recovery
-                            refreshed_file = update_media_file_from_task_status(
-                                db, media_file.id
-                            )
-                            if refreshed_file and refreshed_file.status in [
-                                FileStatus.COMPLETED,
-                                FileStatus.ERROR,
-                            ]:
-                                logger.info(
-                                    f"File {media_file.id} ({media_file.filename}) has "
-                                    f"completed tasks but status was still PROCESSING. "
-                                    f"Reconciled to {refreshed_file.status.value}; "
-                                    f"skipping recovery."
-                                )
-                                continue
-
-                        # File is still marked as processing with stale tasks
-                        stuck_files.append(media_file)
-                        logger.info(
-                            f"Found stuck file {media_file.id} ({media_file.filename}) - "
-                            f"has {len(active_tasks)} stale tasks"
-                        )
+                    continue
+
+            # File is still marked as processing with no active or only stale tasks
+            stuck_files.append(media_file)
+            if active_count == 0:
+                logger.info(
+                    f"Found stuck file {media_file.id} ({media_file.filename}) - "
+                    f"processing for {(now - file_last_update).total_seconds() / 60:.1f} minutes "
+                    f"with no active tasks"
+                )
+            else:
+                logger.info(
+                    f"Found stuck file {media_file.id} ({media_file.filename}) - "
+                    f"has {active_count} stale tasks"
+                )
 
         logger.info(f"Identified {len(stuck_files)} stuck files without active Celery tasks")
         return stuck_files
 
+    def _get_running_celery_task_ids(self) -> Optional[set[str]]:
+        """
+        Ask the Celery workers which tasks they are executing or have reserved.
+
+        Returns:
+            Set of Celery task IDs, or None if no worker answered
+        """
+        try:
+            inspector = celery_app.control.inspect(timeout=self.config.CELERY_INSPECT_TIMEOUT)
+            active = inspector.active()
+            reserved = inspector.reserved()
+        except Exception as e:
+            logger.warning(f"Error inspecting Celery workers: {e}")
+            return None
+
+        if active is None:
+            return None
+
+        task_ids = set()
+        for worker_tasks in (active, reserved or {}):
+            for tasks in worker_tasks.values():
+                task_ids.update(task["id"] for task in tasks if task.get("id"))
+        return task_ids
+
+    def _find_files_with_running_tasks(
+        self, db: Session, media_files: list[MediaFile], running_task_ids: set[str]
+    ) -> set[int]:
+        """Return the IDs of media_files that have a task in running_task_ids."""
+        if not running_task_ids:
+            return set()
+
+        file_ids = {
+            media_file.id
+            for media_file in media_files
+            if media_file.active_task_id in running_task_ids
+        }
+        file_ids.update(
+            db.scalars(
+                select(Task.media_file_id).where(
+                    Task.media_file_id.in_([media_file.id for media_file in media_files]),
+                    Task.id.in_(running_task_ids),
+                )
+            )
+        )
+        return file_ids
+
     def identify_inconsistent_media_files(self, db: Session) -> list[MediaFile]:
         """
         Identify media files with inconsistent states.
@@ -202,31 +265,32 @@ class TaskDetectionService:
         logger.info(f"Identified {len(inconsistent_files)} inconsistent files")
         return inconsistent_files
 
-    def identify_orphaned_tasks(self, db: Session) -> list[Task]:
+    def identify_orphaned_tasks(self, db: Session) -> list[Row]:
         """
         Identify tasks that were orphaned during system shutdown.
 
+        Only the columns recovery needs are selected, so large sweeps don't
+        build a Task object per row.
+
         Args:
             db: Database session
 
         Returns:
-            List of orphaned tasks
+            List of orphaned task rows with id, task_type and media_file_id
         """
         cutoff_time = datetime.now(timezone.utc) - timedelta(
             hours=self.config.ORPHANED_TASK_THRESHOLD
         )
 
-        orphaned_tasks = (
-            db.query(Task)
-            .filter(
-                Task.status.in_(["pending", "in_progress"]),
+        orphaned_tasks = db.execute(
+            select(Task.id, Task.task_type, Task.media_file_id).where(
+                Task.status.in_(ACTIVE_TASK_STATUSES),
                 Task.updated_at < cutoff_time,
             )
-            .all()
-        )
+        ).all()
 
         logger.info(f"Identified {len(orphaned_tasks)} orphaned tasks")
-        return orphaned_tasks
+        return list(orphaned_tasks)
 
     def identify_abandoned_files(self, db: Session) -> list[MediaFile]:
         """
@@ -238,28 +302,39 @@ class TaskDetectionService:
         Returns:
             List of abandoned files
         """
-        abandoned_files = (
-            db.query(MediaFile).filter(MediaFile.status == FileStatus.PROCESSING).all()
+        # Single query: PROCESSING files with no pending/in-progress task
+        truly_abandoned = (
+            db.query(MediaFile)
+            .filter(MediaFile.status == FileStatus.PROCESSING, ~_active_task_exists())
+            .all()
         )
 
-        # Filter to only include files with no active tasks
-        truly_abandoned = []
-        for media_file in abandoned_files:
-            active_tasks = (
-                db.query(Task)
-                .filter(
-                    Task.media_file_id == media_file.id,
-                    Task.status.in_(["pending", "in_progress"]),
-                )
-                .count()
-            )
-
-            if active_tasks == 0:
-                truly_abandoned.append(media_file)
-
         logger.info(f"Identified {len(truly_abandoned)} abandoned files")
         return truly_abandoned
 
+    def identify_abandoned_file_ids(self, db: Session) -> list[int]:
+        """
+        Identify abandoned files by ID only.
+
+        Same criteria as identify_abandoned_files(), without loading MediaFile
+        objects, for callers that update the files in bulk.
+
+        Args:
+            db: Database session
+
+        Returns:
+            IDs of abandoned files
+        """
+        rows = (
+            db.query(MediaFile.id)
+            .filter(MediaFile.status == FileStatus.PROCESSING, ~_active_task_exists())
+            .all()
+        )
+        abandoned_ids = [row.id for row in rows]
+
+        logger.info(f"Identified {len(abandoned_ids)} abandoned files")
+        return abandoned_ids
+
     def find_user_problem_files(self, db: Session, user_id: int = None) -> list[MediaFile]:
         """
         Find files that may need recovery for a specific user or all users.
@@ -271,23 +346,20 @@ class TaskDetectionService:
         Returns:
             List of files that may need recovery
         """
+        # Compute the age cutoff once and let the database filter by it
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            hours=self.config.FILE_RECOVERY_AGE_THRESHOLD
+        )
+
         query = db.query(MediaFile)
         if user_id:
             query = query.filter(MediaFile.user_id == user_id)
 
-        problem_files = query.filter(
-            MediaFile.status.in_([FileStatus.PROCESSING, FileStatus.PENDING])
+        aged_files = query.filter(
+            MediaFile.status.in_([FileStatus.PROCESSING, FileStatus.PENDING]),
+            MediaFile.upload_time < cutoff,
         ).all()
 
-        # Filter by age
-        aged_files = []
-        age_threshold = timedelta(hours=self.config.FILE_RECOVERY_AGE_THRESHOLD)
-
-        for media_file in problem_files:
-            file_age = datetime.now(timezone.utc) - media_file.upload_time
-            if file_age > age_threshold:
-                aged_files.append(media_file)
-
         logger.info(f"Found {len(aged_files)} problem files for user {user_id or 'all'}")
         return aged_files
 
@@ -305,26 +377,12 @@ class TaskDetectionService:
 
     def _find_processing_files_without_tasks(self, db: Session) -> list[MediaFile]:
         """Find files in PROCESSING state with no active tasks."""
-        processing_files = (
-            db.query(MediaFile).filter(MediaFile.status == FileStatus.PROCESSING).all()
+        return (
+            db.query(MediaFile)
+            .filter(MediaFile.status == FileStatus.PROCESSING, ~_active_task_exists())
+            .all()
         )
 
-        files_without_tasks = []
-        for media_file in processing_files:
-            active_tasks = (
-                db.query(Task)
-                .filter(
-                    Task.media_file_id == media_file.id,
-                    Task.status.in_(["pending", "in_progress"]),
-                )
-                .count()
-            )
-
-            if active_tasks == 0:
-                files_without_tasks.append(media_file)
-
-        return files_without_tasks
-
     def _find_stale_pending_files(self, db: Session) -> list[MediaFile]:
         """Find files that have been in PENDING state for too long."""
         stale_time = datetime.now(timezone.utc) - timedelta(hours=1)
@@ -11,6 +11,8 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 
+from sqlalchemy import update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.core.task_config import task_recovery_config
@@ -100,65 +102,85 @@ class TaskRecoveryService:
             logger.error(f"Error fixing inconsistent media file {media_file.id}: {str(e)}")
             return False
 
-    def recover_orphaned_tasks(self, db: Session, orphaned_tasks: list[Task]) -> int:
+    def recover_orphaned_tasks(self, db: Session, orphaned_tasks: list[Row]) -> int:
         """
         Recover multiple orphaned tasks.
 
+        All tasks are marked failed with a single UPDATE. Tasks that finished
+        since they were detected are left alone.
+
         Args:
             db: Database session
-            orphaned_tasks: List of orphaned tasks
+            orphaned_tasks: Orphaned task rows from identify_orphaned_tasks()
 
         Returns:
             int: Number of successfully recovered tasks
         """
-        recovered_count = 0
-
-        for task in orphaned_tasks:
-            try:
-                logger.info(f"Marking orphaned task {task.id} as failed")
-
-                task.status = "failed"
-                task.error_message = "Task interrupted by system restart"
-                task.completed_at = datetime.now(timezone.utc)
-                task.updated_at = datetime.now(timezone.utc)
-
-                recovered_count += 1
+        task_ids = [task.id for task in orphaned_tasks]
+        if not task_ids:
+            return 0
 
-            except Exception as e:
-                logger.error(f"Error recovering orphaned task {task.id}: {e}")
+        logger.info(f"Marking {len(task_ids)} orphaned tasks as failed: {task_ids}")
+        now = datetime.now(timezone.utc)
 
         try:
+            result = db.execute(
+                update(Task)
+                .where(Task.id.in_(task_ids), Task.status.in_(["pending", "in_progress"]))
+                .values(
+                    status="failed",
+                    error_message="Task interrupted by system restart",
+                    completed_at=now,
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
             db.commit()
         except Exception as e:
             logger.error(f"Error committing orphaned task recovery: {e}")
             db.rollback()
             return 0
 
-        return recovered_count
+        return result.rowcount
 
-    def reset_abandoned_files(self, db: Session, abandoned_files: list[MediaFile]) -> int:
+    def reset_abandoned_files(self, db: Session, file_ids: list[int]) -> list[int]:
         """
         Reset abandoned files to PENDING status for retry.
 
+        Issues a single UPDATE for all files. Files that left PROCESSING since
+        they were detected are not touched.
+
         Args:
             db: Database session
-            abandoned_files: List of abandoned files
+            file_ids: IDs of abandoned files
 
         Returns:
-            int: Number of successfully reset files
+            list[int]: IDs of the files that were reset
         """
-        reset_count = 0
+        if not file_ids:
+            return []
 
-        for media_file in abandoned_files:
-            try:
-                logger.info(f"Resetting abandoned file {media_file.id}: {media_file.filename}")
-                update_media_file_status(db, media_file.id, FileStatus.PENDING)
-                reset_count += 1
-
-            except Exception as e:
-                logger.error(f"Error resetting abandoned file {media_file.id}: {e}")
+        try:
+            reset_ids = list(
+                db.execute(
+                    update(MediaFile)
+                    .where(
+                        MediaFile.id.in_(file_ids),
+                        MediaFile.status == FileStatus.PROCESSING,
+                    )
+                    .values(status=FileStatus.PENDING)
+                    .returning(MediaFile.id)
+                    .execution_options(synchronize_session=False)
+                ).scalars()
+            )
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error resetting abandoned files {file_ids}: {e}")
+            db.rollback()
+            return []
 
-        return reset_count
+        logger.info(f"Reset {len(reset_ids)} abandoned files to pending: {reset_ids}")
+        return reset_ids
 
     def schedule_file_retry(self, media_file_id: int) -> bool:
         """
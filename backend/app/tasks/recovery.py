@@ -41,17 +41,17 @@ def startup_recovery_task(self):
 
     try:
         with session_scope() as db:
-            # Step 1: Handle abandoned files
-            abandoned_files = task_detection_service.identify_abandoned_files(db)
-            summary["abandoned_files_found"] = len(abandoned_files)
+            # Step 1: Handle abandoned files (IDs only; they are reset in one UPDATE)
+            abandoned_file_ids = task_detection_service.identify_abandoned_file_ids(db)
+            summary["abandoned_files_found"] = len(abandoned_file_ids)
 
-            reset_count = task_recovery_service.reset_abandoned_files(db, abandoned_files)
-            summary["abandoned_files_reset"] = reset_count
+            reset_file_ids = task_recovery_service.reset_abandoned_files(db, abandoned_file_ids)
+            summary["abandoned_files_reset"] = len(reset_file_ids)
 
             # Step 2: Retry abandoned files
             retry_count = 0
-            for media_file in abandoned_files[:reset_count]:  # Only retry successfully reset files
-                if task_recovery_service.schedule_file_retry(media_file.id):
+            for file_id in reset_file_ids:  # Only retry successfully reset files
+                if task_recovery_service.schedule_file_retry(file_id):
                     retry_count += 1
             summary["files_retried"] = retry_count
 
@@ -80,10 +80,10 @@ def _get_user_llm_output_language(db: Session, user_id: int) -> str:
     return DEFAULT_LLM_OUTPUT_LANGUAGE
 
 
-def _create_llm_service(user_id: int | None) -> LLMService:
+def _create_llm_service(user_id: int | None, db: Session) -> LLMService:
     """Create LLM service based on user settings or system defaults."""
     if user_id:
-        llm_service = LLMService.create_from_user_settings(user_id)
+        llm_service = LLMService.create_from_user_settings(user_id, db=db)
     else:
         llm_service = LLMService.create_from_system_settings()
 
@@ -229,7 +229,7 @@ def _generate_predictions(
         )
         logger.info(f"Using LLM output language: {output_language}")
 
-        llm_service = _create_llm_service(user_id)
+        llm_service = _create_llm_service(user_id, db)
         predictions = _run_llm_identification(
             llm_service, full_transcript, speaker_segments, known_speakers, output_language
         )
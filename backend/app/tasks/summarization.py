@@ -402,7 +402,7 @@ def _generate_llm_summary(
 
     # Create LLM service using user settings or system settings
     if media_file.user_id:
-        llm_service = LLMService.create_from_user_settings(media_file.user_id)
+        llm_service = LLMService.create_from_user_settings(media_file.user_id, db=db)
         logger.info(f"Attempted to load user LLM settings for user {media_file.user_id}")
     else:
         llm_service = LLMService.create_from_system_settings()
@@ -225,6 +225,10 @@ class HardwareConfig:
         Args:
             context: Description of current operation for logging
         """
+        # Skip querying CUDA memory stats when nothing would be logged
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         vram = self.get_vram_usage()
         if "error" in vram:
             logger.debug(f"VRAM monitoring unavailable: {vram.get('error', 'unknown')}")
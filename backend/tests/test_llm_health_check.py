@@ -0,0 +1,57 @@
+"""
+Tests for the LLMService health check cache
+
+Covers how cached health results are keyed. The models endpoint probe is
+replaced with a mock, so no HTTP requests are made.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services import llm_service
+from app.services.llm_service import LLMConfig
+from app.services.llm_service import LLMProvider
+from app.services.llm_service import LLMService
+
+
+@pytest.fixture(autouse=True)
+def empty_health_cache(monkeypatch):
+    monkeypatch.setattr(llm_service, "_HEALTH_CACHE", {})
+
+
+def _service(api_key):
+    return LLMService(
+        LLMConfig(
+            provider=LLMProvider.OPENAI,
+            model="gpt-4o-mini",
+            base_url="https://api.openai.com/v1",
+            api_key=api_key,
+        )
+    )
+
+
+class TestHealthCheckCache:
+    """Test LLMService.health_check caching"""
+
+    def test_same_config_uses_cached_result(self):
+        """A second check with the same settings does not probe again"""
+        with patch.object(LLMService, "_probe_models_endpoint", return_value=True) as probe:
+            assert _service("sk-valid").health_check() is True
+            assert _service("sk-valid").health_check() is True
+
+        assert probe.call_count == 1
+
+    def test_result_is_not_shared_across_api_keys(self):
+        """A healthy result for one API key is not reused for another"""
+        with patch.object(LLMService, "_probe_models_endpoint", side_effect=[True, False]):
+            assert _service("sk-valid").health_check() is True
+            assert _service("sk-revoked").health_check() is False
+
+    def test_api_key_is_not_stored_in_cache_key(self):
+        """Only a digest of the API key is kept in the cache"""
+        with patch.object(LLMService, "_probe_models_endpoint", return_value=True):
+            _service("sk-secret").health_check()
+
+        (key,) = llm_service._HEALTH_CACHE
+        assert "sk-secret" not in key
@@ -0,0 +1,477 @@
+"""
+Tests for the media download service helpers
+
+Covers the pieces of MediaDownloadService that do not need network access:
+- yt-dlp retry backoff
+- the pool of metadata YoutubeDL instances
+- lazy playlist extraction
+- the maximum duration check before downloading
+- metadata and download extraction options matching
+- URL validation and YouTube URL detection
+- playlist placeholder de-duplication and batched inserts
+"""
+
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from requests.cookies import create_cookie
+from yt_dlp.utils import DownloadError
+from yt_dlp.utils import RetryManager
+
+from app.models.media import FileStatus
+from app.models.media import MediaFile
+from app.services.media_download_service import _DOWNLOAD_YDL_OPTIONS
+from app.services.media_download_service import _YDL_OPTIONS
+from app.services.media_download_service import MAX_VIDEO_DURATION_SECONDS
+from app.services.media_download_service import MediaDownloadService
+from app.services.media_download_service import _download_retry_sleep
+from app.services.media_download_service import _process_playlist_videos
+from app.services.media_download_service import _ydl_download
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL1234567890"
+
+
+class TestDownloadRetrySleep:
+    """Test the backoff function handed to yt-dlp as retry_sleep_functions"""
+
+    def test_backoff_grows_and_is_capped(self):
+        """Delays double per retry and never exceed one minute"""
+        assert _download_retry_sleep(n=0) == 1.0
+        assert _download_retry_sleep(n=3) == 8.0
+        assert _download_retry_sleep(n=10) == 60.0
+
+    def test_called_through_yt_dlp_retry_manager(self):
+        """yt-dlp passes the retry index as the keyword argument n"""
+        warnings = []
+        errors = []
+
+        def error_callback(err, count, retries):
+            RetryManager.report_retry(
+                err,
+                count,
+                retries,
+                sleep_func=_download_retry_sleep,
+                info=lambda _msg: None,
+                warn=warnings.append,
+            )
+
+        with patch("yt_dlp.utils._utils.time.sleep") as mock_sleep, pytest.raises(OSError):
+            for retry in RetryManager(2, error_callback):
+                try:
+                    raise OSError("HTTP Error 429: Too Many Requests")
+                except OSError as e:
+                    errors.append(e)
+                    retry.error = e
+
+        assert len(errors) == 3
+        assert len(warnings) == 2
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
+
+class _BlockingYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL whose extractions wait at a shared barrier"""
+
+    barrier = None
+    instances = []
+
+    def __init__(self, options):
+        self.cookiejar = CookieJar()
+        self.closed = False
+        _BlockingYoutubeDL.instances.append(self)
+
+    def extract_info(self, url, download=True):
+        self.cookiejar.set_cookie(create_cookie("session", url, domain="example.com"))
+        if self.barrier is not None:
+            self.barrier.wait()
+        return {"id": url}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def blocking_youtube_dl(monkeypatch):
+    """Patch the metadata YoutubeDL pool with empty pools of _BlockingYoutubeDL."""
+    _BlockingYoutubeDL.barrier = None
+    _BlockingYoutubeDL.instances = []
+    monkeypatch.setattr("app.services.media_download_service.yt_dlp.YoutubeDL", _BlockingYoutubeDL)
+    monkeypatch.setattr(
+        "app.services.media_download_service._idle_ydl", {"metadata": [], "playlist": []}
+    )
+    return _BlockingYoutubeDL
+
+
+class TestYoutubeDLPool:
+    """Test the pool of YoutubeDL instances used for metadata extraction"""
+
+    def test_extractions_run_concurrently(self, blocking_youtube_dl):
+        """Two extractions in flight at once each get their own instance"""
+        blocking_youtube_dl.barrier = threading.Barrier(2, timeout=5)
+        service = MediaDownloadService()
+        urls = ["https://example.com/a", "https://example.com/b"]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(service.extract_video_info, urls))
+
+        assert results == [{"id": url} for url in urls]
+        assert len(blocking_youtube_dl.instances) == 2
+
+    def test_idle_instance_is_reused_without_cookies(self, blocking_youtube_dl):
+        """A returned instance is reused by the next call with its cookies cleared"""
+        service = MediaDownloadService()
+
+        service.extract_video_info("https://example.com/a")
+        service.extract_video_info("https://example.com/b")
+
+        [ydl] = blocking_youtube_dl.instances
+        assert len(ydl.cookiejar) == 0
+        assert not ydl.closed
+
+    def test_pool_keeps_at_most_pool_size_idle(self, blocking_youtube_dl, monkeypatch):
+        """Instances beyond YDL_POOL_SIZE are closed when they are returned"""
+        monkeypatch.setattr("app.services.media_download_service.YDL_POOL_SIZE", 1)
+        blocking_youtube_dl.barrier = threading.Barrier(2, timeout=5)
+        service = MediaDownloadService()
+        urls = ["https://example.com/a", "https://example.com/b"]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(service.extract_video_info, urls))
+
+        assert sorted(ydl.closed for ydl in blocking_youtube_dl.instances) == [False, True]
+
+
+class _FakeYoutubeDL:
+    """Stand-in for yt_dlp.YoutubeDL returning canned unprocessed results per URL"""
+
+    instances = []
+
+    def __init__(self, results):
+        self.results = results
+        self.closed = 0
+        _FakeYoutubeDL.instances.append(self)
+
+    def extract_info(self, url, download=True, process=True, ie_key=None):
+        assert process is False
+        return self.results[url]
+
+    def close(self):
+        self.closed += 1
+
+
+def _playlist(entries):
+    return {"_type": "playlist", "id": "PL1234567890", "title": "Test", "entries": entries}
+
+
+def _entries(*video_ids, error=None):
+    for video_id in video_ids:
+        yield {"_type": "url", "id": video_id, "title": f"Video {video_id}"}
+    if error:
+        raise error
+
+
+@pytest.fixture
+def fake_youtube_dl():
+    """Patch yt_dlp.YoutubeDL in the service with _FakeYoutubeDL for given results."""
+    _FakeYoutubeDL.instances = []
+
+    def install(results):
+        return patch(
+            "app.services.media_download_service.yt_dlp.YoutubeDL",
+            lambda _options: _FakeYoutubeDL(results),
+        )
+
+    return install
+
+
+class TestLazyPlaylistExtraction:
+    """Test extract_playlist_info(lazy=True)"""
+
+    def test_entries_are_paged_and_instance_is_closed(self, fake_youtube_dl):
+        """Videos are yielded as consumed and the YoutubeDL is closed at the end"""
+        with fake_youtube_dl({PLAYLIST_URL: _playlist(_entries("aaaaaaaaaaa", "bbbbbbbbbbb"))}):
+            info = MediaDownloadService().extract_playlist_info(PLAYLIST_URL, lazy=True)
+            ydl = _FakeYoutubeDL.instances[0]
+
+            assert ydl.closed == 0
+            videos = list(info["videos"])
+
+        assert [video["video_id"] for video in videos] == ["aaaaaaaaaaa", "bbbbbbbbbbb"]
+        assert ydl.closed >= 1
+
+    def test_url_result_is_resolved(self, fake_youtube_dl):
+        """A URL that redirects to the playlist is followed instead of looking empty"""
+        redirect_url = "https://www.youtube.com/watch?v=aaaaaaaaaaa&list=PL1234567890"
+        results = {
+            redirect_url: {"_type": "url", "url": PLAYLIST_URL, "ie_key": "YoutubeTab"},
+            PLAYLIST_URL: _playlist(_entries("aaaaaaaaaaa")),
+        }
+        with fake_youtube_dl(results):
+            info = MediaDownloadService().extract_playlist_info(redirect_url, lazy=True)
+            videos = list(info["videos"])
+
+        assert info["playlist_id"] == "PL1234567890"
+        assert [video["video_id"] for video in videos] == ["aaaaaaaaaaa"]
+
+    def test_error_while_paging_is_http_exception(self, fake_youtube_dl):
+        """A yt-dlp error raised mid-iteration reaches callers as an HTTPException"""
+        entries = _entries("aaaaaaaaaaa", error=DownloadError("HTTP Error 503"))
+        with fake_youtube_dl({PLAYLIST_URL: _playlist(entries)}):
+            info = MediaDownloadService().extract_playlist_info(PLAYLIST_URL, lazy=True)
+            videos = info["videos"]
+
+            assert next(videos)["video_id"] == "aaaaaaaaaaa"
+            with pytest.raises(HTTPException) as exc_info:
+                next(videos)
+
+        assert exc_info.value.status_code == 502
+        assert _FakeYoutubeDL.instances[0].closed >= 1
+
+    def test_unconsumed_iterator_closes_instance(self, fake_youtube_dl):
+        """Discarding the iterator without consuming it still closes the YoutubeDL"""
+        with fake_youtube_dl({PLAYLIST_URL: _playlist(_entries("aaaaaaaaaaa"))}):
+            info = MediaDownloadService().extract_playlist_info(PLAYLIST_URL, lazy=True)
+            ydl = _FakeYoutubeDL.instances[0]
+            del info
+            gc.collect()
+
+        assert ydl.closed >= 1
+
+
+def _mock_ydl(extracted, resolved=None):
+    ydl = MagicMock()
+    ydl.extract_info.return_value = extracted
+    ydl.sanitize_info.side_effect = lambda info, **_kwargs: info
+
+    def process_ie_result(ie_result, download=True):
+        if ie_result.get("_type") in ("url", "url_transparent"):
+            return resolved
+        return {**ie_result, "downloaded": download}
+
+    ydl.process_ie_result.side_effect = process_ie_result
+    return ydl
+
+
+class TestDurationLimit:
+    """Test that _ydl_download rejects media over MAX_VIDEO_DURATION_SECONDS"""
+
+    def test_long_video_is_rejected_before_download(self):
+        """A directly extracted video over the limit is never downloaded"""
+        ydl = _mock_ydl({"id": "x", "duration": MAX_VIDEO_DURATION_SECONDS + 1})
+
+        with pytest.raises(HTTPException) as exc_info:
+            _ydl_download(ydl, "https://example.com/video")
+
+        assert exc_info.value.status_code == 400
+        ydl.process_ie_result.assert_not_called()
+
+    def test_url_result_is_resolved_before_duration_check(self):
+        """A url result without a duration is resolved, so the limit still applies"""
+        ydl = _mock_ydl(
+            {"_type": "url", "url": "https://example.com/embed/x"},
+            resolved={"id": "x", "duration": MAX_VIDEO_DURATION_SECONDS + 1},
+        )
+
+        with pytest.raises(HTTPException):
+            _ydl_download(ydl, "https://example.com/page")
+
+        ydl.process_ie_result.assert_called_once()
+        assert ydl.process_ie_result.call_args.kwargs["download"] is False
+
+    def test_resolved_url_result_within_limit_is_downloaded(self):
+        """A resolved url result within the limit is downloaded from the resolved info"""
+        ydl = _mock_ydl(
+            {"_type": "url_transparent", "url": "https://example.com/embed/x"},
+            resolved={"id": "x", "duration": 60},
+        )
+
+        result = _ydl_download(ydl, "https://example.com/page")
+
+        assert result == {"id": "x", "duration": 60, "downloaded": True}
+
+
+class TestExtractionOptions:
+    """Test that info reused by download_video() is extracted like the download"""
+
+    @pytest.mark.parametrize("key", ["cachedir", "extractor_args", "http_headers"])
+    def test_metadata_options_match_download(self, key):
+        """Player clients, headers and cache match, so both see the same formats"""
+        assert _YDL_OPTIONS["metadata"][key] == _DOWNLOAD_YDL_OPTIONS[key]
+
+
+class TestUrlDetection:
+    """Test is_valid_media_url, is_youtube_url and is_playlist_url"""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "http://youtube.com/watch?v=dQw4w9WgXcQ&t=42",
+            "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ",
+            "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ",
+            "https://www.youtube.com/v/dQw4w9WgXcQ",
+        ],
+    )
+    def test_youtube_video_urls(self, url):
+        """Single-video YouTube URLs are YouTube URLs but not playlists"""
+        service = MediaDownloadService()
+        assert service.is_valid_media_url(url)
+        assert service.is_youtube_url(url)
+        assert not service.is_playlist_url(url)
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf",
+            "http://youtube.com/playlist?list=PL-abc_123&index=2",
+        ],
+    )
+    def test_youtube_playlist_urls(self, url):
+        """Playlist URLs are detected as both YouTube and playlist URLs"""
+        service = MediaDownloadService()
+        assert service.is_youtube_url(url)
+        assert service.is_playlist_url(url)
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/watch",
+            "https://www.youtube.com/watch?v=",
+            "https://www.youtube.com/playlist",
+            "https://www.youtube.com/feed/subscriptions",
+            "https://youtu.be/",
+            "https://notyoutube.com/watch?v=dQw4w9WgXcQ",
+            "https://vimeo.com/123456",
+            "ftp://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        ],
+    )
+    def test_non_youtube_urls(self, url):
+        """URLs without a video or playlist ID, or on other hosts, are not YouTube URLs"""
+        service = MediaDownloadService()
+        assert not service.is_youtube_url(url)
+        assert not service.is_playlist_url(url)
+
+    @pytest.mark.parametrize(
+        ("url", "valid"),
+        [
+            ("https://vimeo.com/123456", True),
+            ("http://example.com/video.mp4", True),
+            ("https://", False),
+            ("ftp://example.com/video.mp4", False),
+            ("example.com/video.mp4", False),
+            ("https://example.com/video.mp4\nhttps://other.example.com", False),
+            (" https://example.com/video.mp4", False),
+            ("", False),
+        ],
+    )
+    def test_valid_media_url(self, url, valid):
+        """Only whole http(s) URLs are valid; whitespace and newlines are not stripped"""
+        assert MediaDownloadService().is_valid_media_url(url) is valid
+
+
+def _playlist_entries(*video_ids):
+    return [
+        {
+            "video_id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}",
+            "title": f"Video {video_id}",
+        }
+        for video_id in video_ids
+    ]
+
+
+class TestPlaylistPlaceholders:
+    """Test _process_playlist_videos duplicate handling and batched inserts"""
+
+    playlist_info = {"playlist_id": "PL1234567890", "playlist_title": "Test"}
+
+    def _process(self, db_session, user, videos):
+        return _process_playlist_videos(
+            db_session, user.id, iter(videos), self.playlist_info, PLAYLIST_URL, len(videos)
+        )
+
+    def test_skips_videos_already_in_library(self, db_session, normal_user):
+        """Videos whose YouTube ID the user already has are skipped with the existing file ID"""
+        existing = MediaFile(
+            user_id=normal_user.id,
+            filename="existing",
+            storage_path="existing",
+            file_size=1,
+            content_type="video/mp4",
+            status=FileStatus.COMPLETED,
+            metadata_raw={"youtube_id": "aaaaaaaaaaa"},
+        )
+        db_session.add(existing)
+        db_session.commit()
+
+        created, skipped = self._process(
+            db_session, normal_user, _playlist_entries("aaaaaaaaaaa", "bbbbbbbbbbb")
+        )
+
+        assert [media_file.metadata_raw["youtube_id"] for media_file in created] == ["bbbbbbbbbbb"]
+        assert skipped == [
+            {
+                "video_id": "aaaaaaaaaaa",
+                "title": "Video aaaaaaaaaaa",
+                "reason": "duplicate",
+                "existing_file_id": existing.id,
+            }
+        ]
+
+    def test_repeated_video_points_at_first_placeholder(self, db_session, normal_user):
+        """A video listed twice in the playlist gets one placeholder"""
+        created, skipped = self._process(
+            db_session, normal_user, _playlist_entries("aaaaaaaaaaa", "aaaaaaaaaaa")
+        )
+
+        assert len(created) == 1
+        assert skipped[0]["reason"] == "duplicate"
+        assert skipped[0]["existing_file_id"] == created[0].id
+
+    def test_other_users_videos_are_not_duplicates(self, db_session, normal_user, admin_user):
+        """Duplicate detection is scoped to the requesting user's library"""
+        db_session.add(
+            MediaFile(
+                user_id=admin_user.id,
+                filename="theirs",
+                storage_path="theirs",
+                file_size=1,
+                content_type="video/mp4",
+                status=FileStatus.COMPLETED,
+                metadata_raw={"youtube_id": "aaaaaaaaaaa"},
+            )
+        )
+        db_session.commit()
+
+        created, skipped = self._process(db_session, normal_user, _playlist_entries("aaaaaaaaaaa"))
+
+        assert len(created) == 1
+        assert skipped == []
+
+    def test_placeholders_are_flushed_in_batches(self, db_session, normal_user, monkeypatch):
+        """Placeholders get IDs from one flush per batch, in playlist order"""
+        video_ids = [f"video{index:06d}" for index in range(5)]
+
+        monkeypatch.setattr("app.services.media_download_service.PLAYLIST_FLUSH_BATCH_SIZE", 2)
+        with patch.object(db_session, "flush", wraps=db_session.flush) as flush:
+            created, skipped = self._process(db_session, normal_user, _playlist_entries(*video_ids))
+
+        assert flush.call_count == 3
+        assert skipped == []
+        assert [media_file.metadata_raw["youtube_id"] for media_file in created] == video_ids
+        assert [media_file.metadata_raw["playlist_index"] for media_file in created] == [
+            1,
+            2,
+            3,
+            4,
+            5,
+        ]
+        assert all(media_file.id is not None for media_file in created)
+        assert all(media_file.status == FileStatus.PROCESSING for media_file in created)
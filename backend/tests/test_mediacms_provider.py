@@ -0,0 +1,195 @@
+"""
+Tests for the MediaCMS protected media provider
+
+Covers URL recognition and media token extraction, which do not need a
+MediaCMS server, and download error handling against a faked response.
+"""
+
+import io
+
+import pytest
+import requests
+from fastapi import HTTPException
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.response import HTTPResponse
+
+from app.services.protected_media_plugins.mediacms import MediacmsProvider
+
+HOST = "media.example.com"
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """MediacmsProvider allowed to handle HOST only."""
+    monkeypatch.setenv("MEDIACMS_ALLOWED_HOSTS", f"{HOST}, mediacms.internal")
+    return MediacmsProvider()
+
+
+class TestCanHandle:
+    """Test MediacmsProvider.can_handle"""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            f"https://{HOST}/view?m=AbC123",
+            f"http://{HOST}/view?foo=1&m=AbC123",
+            f"https://{HOST}/api/v1/media/AbC123",
+            f"https://{HOST}/api/v1/media",
+            f"HTTPS://{HOST}/view?m=AbC123",
+            "https://mediacms.internal/view?m=AbC123",
+        ],
+    )
+    def test_handles_media_urls_on_allowed_hosts(self, provider, url):
+        """View URLs with ?m= and /api/v1/media paths on allowed hosts are handled"""
+        assert provider.can_handle(url)
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://other.example.com/view?m=AbC123",
+            f"https://{HOST}/view",
+            f"https://{HOST}/view?mm=AbC123",
+            f"https://{HOST}/view?m=",
+            f"https://{HOST}/api/v1/mediafiles/AbC123",
+            f"https://{HOST}/view#m=AbC123",
+            f"ftp://{HOST}/view?m=AbC123",
+            "not a url",
+        ],
+    )
+    def test_rejects_other_urls(self, provider, url):
+        """Other hosts, schemes and URLs without a media reference are not handled"""
+        assert not provider.can_handle(url)
+
+
+class TestGetTokenAndBaseUrl:
+    """Test MediacmsProvider._get_token_and_base_url"""
+
+    @pytest.mark.parametrize(
+        ("url", "token"),
+        [
+            (f"https://{HOST}/view?m=AbC123", "AbC123"),
+            (f"https://{HOST}/view?foo=1&m=AbC123&bar=2", "AbC123"),
+            (f"https://{HOST}/view?m=Ab%2BC+1", "Ab+C 1"),
+            (f"https://{HOST}/view?m=first&m=second", "first"),
+            (f"https://{HOST}/view?m=&m=second", "second"),
+            (f"https://{HOST}/api/v1/media/AbC123", "AbC123"),
+            (f"https://{HOST}/api/v1/media/AbC123/", "AbC123"),
+            (f"https://{HOST}//api//v1//media//AbC123", "AbC123"),
+        ],
+    )
+    def test_extracts_token(self, provider, url, token):
+        """The token comes from ?m= or the /api/v1/media/<token> path"""
+        assert provider._get_token_and_base_url(url) == (token, f"https://{HOST}")
+
+    def test_query_token_takes_precedence_over_path(self, provider):
+        """When both forms are present, ?m= wins as it did with parse_qs"""
+        url = f"https://{HOST}/api/v1/media/PathToken?m=QueryToken"
+
+        assert provider._get_token_and_base_url(url) == ("QueryToken", f"https://{HOST}")
+
+    def test_base_url_keeps_scheme_and_port(self, provider, monkeypatch):
+        """The API base URL is the scheme and host (with port) of the media URL"""
+        monkeypatch.setenv("MEDIACMS_ALLOWED_HOSTS", "media.example.com:8443")
+        provider = MediacmsProvider()
+
+        assert provider._get_token_and_base_url("HTTP://media.example.com:8443/view?m=x") == (
+            "x",
+            "http://media.example.com:8443",
+        )
+
+    def test_bare_media_path_has_no_token(self, provider):
+        """/api/v1/media without a token is recognised but rejected as missing a token"""
+        with pytest.raises(HTTPException) as exc_info:
+            provider._get_token_and_base_url(f"https://{HOST}/api/v1/media")
+
+        assert exc_info.value.status_code == 400
+        assert "Missing media token" in exc_info.value.detail
+
+    def test_disallowed_host_is_rejected(self, provider):
+        """URLs on hosts outside MEDIACMS_ALLOWED_HOSTS are rejected"""
+        with pytest.raises(HTTPException) as exc_info:
+            provider._get_token_and_base_url("https://other.example.com/view?m=AbC123")
+
+        assert exc_info.value.status_code == 400
+
+
+class _TimingOutStream(io.RawIOBase):
+    """Raw body that returns one chunk and then times out"""
+
+    def __init__(self):
+        self.reads = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.reads += 1
+        if self.reads > 1:
+            raise ReadTimeoutError(None, "/media/clip.mp4", "Read timed out.")
+        buffer[:4] = b"data"
+        return 4
+
+
+def _response(body, content_length):
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Length"] = str(content_length)
+    response.raw = HTTPResponse(
+        body=body,
+        headers={"Content-Length": str(content_length)},
+        status=200,
+        preload_content=False,
+        enforce_content_length=True,
+    )
+    return response
+
+
+class TestDownload:
+    """Test MediacmsProvider.download error handling"""
+
+    @pytest.fixture
+    def download(self, provider, monkeypatch, tmp_path):
+        """Download a media URL whose body is served by the given response."""
+        monkeypatch.setattr(
+            provider,
+            "_login_and_get_info",
+            lambda url, username=None, password=None: (
+                "AbC123",
+                f"https://{HOST}",
+                {"original_media_url": "/media/clip.mp4", "title": "clip"},
+            ),
+        )
+
+        def run(response, progress_callback=None):
+            monkeypatch.setattr(provider._session, "get", lambda *args, **kwargs: response)
+            return provider.download(
+                f"https://{HOST}/view?m=AbC123", str(tmp_path), progress_callback
+            )
+
+        return run
+
+    def test_body_is_written_to_disk(self, download, tmp_path):
+        """The response body is copied to a file named after the media title"""
+        result = download(_response(io.BytesIO(b"x" * 10), 10))
+
+        assert result["filename"] == "clip.mp4"
+        assert (tmp_path / "clip.mp4").read_bytes() == b"x" * 10
+
+    @pytest.mark.parametrize(
+        ("body", "content_length"),
+        [
+            (io.BytesIO(b"x" * 10), 100),
+            (_TimingOutStream(), 100),
+        ],
+        ids=["truncated", "read-timeout"],
+    )
+    @pytest.mark.parametrize("with_progress", [False, True])
+    def test_stream_failure_is_bad_gateway(self, download, body, content_length, with_progress):
+        """A body that ends early or times out mid-stream is reported as a 502"""
+        progress_callback = (lambda progress, message: None) if with_progress else None
+
+        with pytest.raises(HTTPException) as exc_info:
+            download(_response(body, content_length), progress_callback)
+
+        assert exc_info.value.status_code == 502
+        assert "Failed to download media file" in exc_info.value.detail
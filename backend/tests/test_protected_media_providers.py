@@ -0,0 +1,92 @@
+"""
+Tests for protected media provider dispatch
+
+Covers host-indexed provider lookup, refreshing the cached registry, and
+cleaning up after plugins that fail to import.
+"""
+
+import sys
+from urllib.parse import urlsplit
+
+import pytest
+
+import app.services.protected_media_plugins as plugin_pkg
+from app.services import protected_media_providers as pmp
+
+
+class _FakeProvider:
+    """Provider that handles URLs on the hosts it advertises"""
+
+    def __init__(self, hosts):
+        self.hosts = hosts
+
+    def can_handle(self, url):
+        return urlsplit(url).netloc in self.hosts
+
+    def get_public_auth_config(self):
+        return {"hosts": list(self.hosts), "auth_type": "user_password"}
+
+
+@pytest.fixture
+def providers(monkeypatch):
+    """Serve a mutable list of fake providers through the plugin loader."""
+    loaded = []
+    monkeypatch.setattr(pmp, "_load_providers", lambda: list(loaded))
+    pmp.refresh_protected_media_auth_config()
+    yield loaded
+    monkeypatch.undo()
+    pmp.refresh_protected_media_auth_config()
+
+
+class TestFindProvider:
+    """Test find_provider and refresh_protected_media_auth_config"""
+
+    def test_dispatches_by_host(self, providers):
+        """Only the provider advertising the URL's host is returned"""
+        media = _FakeProvider(["media.example.com"])
+        providers.append(media)
+        pmp.refresh_protected_media_auth_config()
+
+        assert pmp.find_provider("https://media.example.com/view?m=abc") is media
+        assert pmp.find_provider("https://www.youtube.com/watch?v=abc") is None
+
+    def test_refresh_updates_dispatch(self, providers):
+        """A refresh after a host change reaches URL dispatch, not only the public config"""
+        providers.append(_FakeProvider(["old.example.com"]))
+        pmp.refresh_protected_media_auth_config()
+        assert pmp.find_provider("https://new.example.com/view?m=abc") is None
+
+        providers[:] = [_FakeProvider(["new.example.com"])]
+        auth_config = pmp.refresh_protected_media_auth_config()
+
+        assert auth_config[0]["hosts"] == ["new.example.com"]
+        assert pmp.find_provider("https://new.example.com/view?m=abc") is providers[0]
+        assert pmp.find_provider("https://old.example.com/view?m=abc") is None
+
+
+class TestFailedPluginImport:
+    """Test _load_providers cleanup after a plugin fails to import"""
+
+    def test_only_the_plugins_own_modules_are_unloaded(self, tmp_path, monkeypatch):
+        """Submodules of the failed plugin are dropped; shared dependencies stay loaded"""
+        deps = tmp_path / "deps"
+        deps.mkdir()
+        (deps / "shared_plugin_dependency.py").write_text("VALUE = 1\n")
+        plugins = tmp_path / "plugins"
+        (plugins / "broken").mkdir(parents=True)
+        (plugins / "broken" / "helpers.py").write_text("")
+        (plugins / "broken" / "__init__.py").write_text(
+            "import shared_plugin_dependency\n"
+            "from . import helpers\n"
+            "raise RuntimeError('missing configuration')\n"
+        )
+        monkeypatch.syspath_prepend(str(deps))
+        monkeypatch.setattr(plugin_pkg, "__path__", [str(plugins)])
+        monkeypatch.delitem(sys.modules, "shared_plugin_dependency", raising=False)
+
+        assert pmp._load_providers() == []
+
+        broken = f"{plugin_pkg.__name__}.broken"
+        assert broken not in sys.modules
+        assert f"{broken}.helpers" not in sys.modules
+        assert "shared_plugin_dependency" in sys.modules
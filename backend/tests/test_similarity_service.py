@@ -0,0 +1,61 @@
+"""
+Tests for SimilarityService
+
+Covers batch_cosine_similarity, which scores one embedding against many
+targets in a single tensor operation.
+"""
+
+import numpy as np
+import pytest
+import torch
+
+from app.services.similarity_service import SimilarityService
+
+
+def _cosine(a, b):
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+class TestBatchCosineSimilarity:
+    """Test SimilarityService.batch_cosine_similarity"""
+
+    def test_matches_pairwise_cosine_similarity(self):
+        """Each score equals the pairwise cosine similarity, in target order"""
+        rng = np.random.default_rng(0)
+        query = rng.random(512)
+        targets = list(rng.random((4, 512)))
+
+        scores = SimilarityService.batch_cosine_similarity(query, targets)
+
+        assert scores == pytest.approx([_cosine(query, target) for target in targets], rel=1e-5)
+        assert all(isinstance(score, float) for score in scores)
+
+    def test_scores_are_clipped_to_unit_range(self):
+        """Opposite vectors score 0 and identical directions score 1"""
+        query = np.array([1.0, 2.0, 3.0])
+        targets = [np.array([2.0, 4.0, 6.0]), np.array([-1.0, -2.0, -3.0])]
+
+        scores = SimilarityService.batch_cosine_similarity(query, targets)
+
+        assert scores == pytest.approx([1.0, 0.0], abs=1e-6)
+
+    def test_tensor_and_array_inputs_agree(self):
+        """Tensors, arrays and a mix of both give the same scores"""
+        rng = np.random.default_rng(1)
+        query = rng.random(8)
+        targets = list(rng.random((3, 8)))
+        tensor_targets = [torch.from_numpy(target) for target in targets]
+        mixed_targets = [targets[0], tensor_targets[1], targets[2]]
+
+        expected = SimilarityService.batch_cosine_similarity(query, targets)
+
+        assert SimilarityService.batch_cosine_similarity(
+            torch.from_numpy(query), tensor_targets
+        ) == pytest.approx(expected)
+        assert SimilarityService.batch_cosine_similarity(query, mixed_targets) == pytest.approx(
+            expected
+        )
+
+    def test_empty_targets(self):
+        """No targets gives an empty result"""
+        assert SimilarityService.batch_cosine_similarity(np.ones(8), []) == []
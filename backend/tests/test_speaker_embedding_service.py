@@ -0,0 +1,123 @@
+"""
+Tests for SpeakerEmbeddingService
+
+Covers how long decoded audio is kept and batching segment embeddings into
+one forward pass. The model is replaced with a mock, so no weights are loaded.
+"""
+
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+
+from app.services.speaker_embedding_service import SpeakerEmbeddingService
+
+SEGMENTS = [
+    {"speaker": "SPEAKER_00", "start": 0.0, "end": 2.0},
+    {"speaker": "SPEAKER_01", "start": 2.0, "end": 5.0},
+    {"speaker": "SPEAKER_00", "start": 5.0, "end": 6.5},
+]
+SPEAKER_MAPPING = {"SPEAKER_00": 1, "SPEAKER_01": 2}
+
+
+@pytest.fixture
+def service(monkeypatch, tmp_path):
+    """SpeakerEmbeddingService on CPU with a mocked pyannote model."""
+    hardware_config = MagicMock()
+    hardware_config.get_pyannote_config.return_value = {"device": "cpu"}
+    monkeypatch.setattr(
+        "app.services.speaker_embedding_service.detect_hardware", lambda: hardware_config
+    )
+    monkeypatch.setattr(SpeakerEmbeddingService, "_initialize_model", lambda self: None)
+
+    service = SpeakerEmbeddingService(models_dir=str(tmp_path / "models"))
+    service.inference = MagicMock()
+    service.inference.model.audio.return_value = (np.zeros((1, 16000)), 16000)
+    return service
+
+
+@pytest.fixture
+def audio_path(tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"")
+    return str(path)
+
+
+class TestDecodedAudioLifetime:
+    """Test that decoded waveforms are not kept between jobs"""
+
+    def test_audio_is_decoded_once_and_released(self, service, audio_path):
+        """All speakers are cropped from one decode, which is dropped on return"""
+        with patch.object(service, "_embed_segments", return_value=np.ones((1, 4))) as embed:
+            embeddings = service.extract_embeddings_for_segments(
+                audio_path, SEGMENTS, SPEAKER_MAPPING
+            )
+
+        assert set(embeddings) == {1, 2}
+        service.inference.model.audio.assert_called_once_with(audio_path)
+        assert embed.call_count == 2
+        assert service._decode_audio_cached.cache_info().currsize == 0
+
+    def test_audio_is_released_when_extraction_fails(self, service, audio_path):
+        """An error while embedding still drops the decoded waveform"""
+        with (
+            patch.object(service, "_embed_segments", side_effect=RuntimeError("CUDA OOM")),
+            pytest.raises(RuntimeError),
+        ):
+            service.extract_embeddings_for_segments(audio_path, SEGMENTS, SPEAKER_MAPPING)
+
+        assert service._decode_audio_cached.cache_info().currsize == 0
+
+    def test_at_most_one_waveform_is_cached(self, service):
+        """Only one decoded waveform can be held at a time"""
+        assert service._decode_audio_cached.cache_info().maxsize == 1
+
+
+def _crop(audio, segment):
+    num_samples = round((segment.end - segment.start) * 16000)
+    return torch.full((1, num_samples), segment.start + 1.0), 16000
+
+
+class TestBatchedEmbeddings:
+    """Test _embed_segments with in-memory audio"""
+
+    segments = [
+        {"start": 0.0, "end": 2.0},
+        {"start": 3.0, "end": 4.5},
+        {"start": 5.0, "end": 5.5},
+    ]
+
+    def test_segments_share_one_forward_pass(self, service, audio_path):
+        """All segments go through the model once, with padding masked out"""
+        service.inference.model.audio.crop.side_effect = _crop
+        service.inference.model.side_effect = lambda waveforms, weights: torch.ones(
+            waveforms.shape[0], 4
+        )
+
+        embeddings = service._embed_segments(audio_path, self.segments, audio={"waveform": None})
+
+        service.inference.model.assert_called_once()
+        waveforms = service.inference.model.call_args.args[0]
+        masks = service.inference.model.call_args.kwargs["weights"]
+        assert waveforms.shape == (3, 1, 32000)
+        assert masks.sum(dim=1).tolist() == [32000, 24000, 8000]
+        assert waveforms[2, 0, 8000:].abs().sum() == 0
+        assert embeddings.shape == (3, 4)
+        assert embeddings.dtype == np.float32
+
+    def test_falls_back_to_one_segment_at_a_time(self, service, audio_path):
+        """A model that rejects the batch is called per segment instead"""
+        service.inference.model.audio.crop.side_effect = _crop
+        service.inference.model.side_effect = TypeError("unexpected keyword argument 'weights'")
+
+        with patch.object(
+            service, "extract_embedding_from_file", return_value=np.ones(4, dtype=np.float32)
+        ) as embed_one:
+            embeddings = service._embed_segments(
+                audio_path, self.segments, audio={"waveform": None}
+            )
+
+        assert embed_one.call_count == 3
+        assert embeddings.shape == (3, 4)
@@ -0,0 +1,130 @@
+"""
+Tests for speaker prediction validation
+
+Covers the SpeakerPrediction schema and how LLMService filters the speaker
+predictions returned by an LLM. No LLM requests are made.
+"""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.summary import SpeakerPrediction
+from app.services.llm_service import LLMConfig
+from app.services.llm_service import LLMProvider
+from app.services.llm_service import LLMResponse
+from app.services.llm_service import LLMService
+
+
+@pytest.fixture
+def llm_service():
+    """LLMService that is never asked to call its provider."""
+    return LLMService(
+        LLMConfig(provider=LLMProvider.OLLAMA, model="test-model", base_url="http://llm:11434")
+    )
+
+
+def _prediction(**overrides):
+    prediction = {
+        "speaker_label": "SPEAKER_1",
+        "predicted_name": "Ada Lovelace",
+        "confidence": 0.9,
+    }
+    prediction.update(overrides)
+    return prediction
+
+
+class TestSpeakerPredictionSchema:
+    """Test the SpeakerPrediction schema"""
+
+    def test_numeric_strings_are_coerced(self):
+        """Confidence given as a numeric string is accepted as a float"""
+        prediction = SpeakerPrediction.model_validate(_prediction(confidence="0.75"))
+
+        assert prediction.confidence == 0.75
+        assert prediction.reasoning is None
+        assert prediction.evidence_types == []
+
+    @pytest.mark.parametrize("field", ["speaker_label", "predicted_name", "confidence"])
+    def test_required_fields(self, field):
+        """Label, name and confidence are required"""
+        prediction = _prediction()
+        del prediction[field]
+
+        with pytest.raises(ValidationError):
+            SpeakerPrediction.model_validate(prediction)
+
+    def test_extra_fields_are_kept(self):
+        """Fields the schema does not declare are passed through"""
+        prediction = SpeakerPrediction.model_validate(_prediction(role="host"))
+
+        assert prediction.model_dump()["role"] == "host"
+
+
+class TestValidateSpeakerPrediction:
+    """Test LLMService._validate_speaker_prediction"""
+
+    def test_valid_prediction_keeps_only_given_fields(self, llm_service):
+        """Defaults for fields the LLM left out are not added to the result"""
+        prediction = _prediction(reasoning="Introduces herself", role="host")
+
+        assert llm_service._validate_speaker_prediction(prediction) == prediction
+
+    @pytest.mark.parametrize(
+        "prediction",
+        [
+            _prediction(confidence="high"),
+            _prediction(confidence=None),
+            _prediction(predicted_name=None),
+            _prediction(evidence_types="name"),
+            {"speaker_label": "SPEAKER_1"},
+            "SPEAKER_1 is Ada Lovelace",
+            None,
+        ],
+    )
+    def test_malformed_predictions_are_skipped(self, llm_service, prediction):
+        """Predictions that do not match the schema are dropped instead of raising"""
+        assert llm_service._validate_speaker_prediction(prediction) is None
+
+    @pytest.mark.parametrize(("confidence", "kept"), [(0.49, False), (0.5, True), (1.0, True)])
+    def test_low_confidence_is_skipped(self, llm_service, confidence, kept):
+        """Predictions below 0.5 confidence are dropped"""
+        result = llm_service._validate_speaker_prediction(_prediction(confidence=confidence))
+
+        assert (result is not None) == kept
+
+
+class TestParseSpeakerIdentificationResponse:
+    """Test LLMService._parse_speaker_identification_response"""
+
+    def test_invalid_predictions_are_filtered(self, llm_service):
+        """Only valid, confident predictions are returned, in their original order"""
+        content = json.dumps(
+            {
+                "speaker_predictions": [
+                    _prediction(speaker_label="SPEAKER_1"),
+                    _prediction(speaker_label="SPEAKER_2", confidence=0.2),
+                    _prediction(speaker_label="SPEAKER_3", confidence="unsure"),
+                    _prediction(speaker_label="SPEAKER_4", predicted_name="Grace Hopper"),
+                ],
+                "overall_confidence": "high",
+            }
+        )
+
+        result = llm_service._parse_speaker_identification_response(LLMResponse(content=content))
+
+        assert [p["speaker_label"] for p in result["speaker_predictions"]] == [
+            "SPEAKER_1",
+            "SPEAKER_4",
+        ]
+        assert result["overall_confidence"] == "high"
+
+    def test_non_list_predictions_are_rejected(self, llm_service):
+        """A speaker_predictions value that is not a list gives an error result"""
+        content = json.dumps({"speaker_predictions": _prediction()})
+
+        result = llm_service._parse_speaker_identification_response(LLMResponse(content=content))
+
+        assert result["speaker_predictions"] == []
+        assert "must be a list" in result["error"]
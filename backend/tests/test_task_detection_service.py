@@ -0,0 +1,239 @@
+"""
+Tests for task detection
+
+Covers detection of files stuck in PROCESSING without a live Celery task.
+Recovery of these files fails their tasks and requeues them, so detection must
+not report files whose task is still running. Also covers abandoned files and
+orphaned tasks, and the bulk updates that recover them.
+"""
+
+import itertools
+from datetime import datetime
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.models.media import FileStatus
+from app.models.media import MediaFile
+from app.models.media import Task
+from app.services.task_detection_service import TaskDetectionService
+from app.services.task_recovery_service import TaskRecoveryService
+
+_task_ids = itertools.count(1)
+
+
+class _NaiveUTCDatetime(datetime):
+    """SQLite returns naive datetimes, so compare against naive UTC in tests."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.utcnow()
+
+
+def _minutes_ago(minutes):
+    return datetime.utcnow() - timedelta(minutes=minutes)
+
+
+def _add_file(db, user, name, last_update, status=FileStatus.PROCESSING):
+    media_file = MediaFile(
+        user_id=user.id,
+        filename=name,
+        storage_path=name,
+        file_size=1,
+        content_type="video/mp4",
+        status=status,
+        upload_time=last_update,
+        task_last_update=last_update,
+    )
+    db.add(media_file)
+    db.flush()
+    return media_file
+
+
+def _add_task(db, user, media_file, status, updated_at):
+    task = Task(
+        id=f"celery-task-{next(_task_ids)}",
+        user_id=user.id,
+        media_file_id=media_file.id,
+        task_type="transcription",
+        status=status,
+    )
+    db.add(task)
+    db.flush()
+    task.updated_at = updated_at
+    db.flush()
+    return task
+
+
+def _mock_celery(active, reserved=None):
+    celery_app = MagicMock()
+    inspector = celery_app.control.inspect.return_value
+    inspector.active.return_value = active
+    inspector.reserved.return_value = reserved if reserved is not None else {}
+    return celery_app
+
+
+@pytest.fixture
+def detect_stuck_files(db_session, monkeypatch):
+    """Run stuck-file detection against a mocked set of Celery workers."""
+    monkeypatch.setattr("app.services.task_detection_service.datetime", _NaiveUTCDatetime)
+
+    def run(active, reserved=None):
+        celery_app = _mock_celery(active, reserved)
+        monkeypatch.setattr("app.services.task_detection_service.celery_app", celery_app)
+        files = TaskDetectionService().identify_stuck_files_without_active_celery_tasks(db_session)
+        return {media_file.filename for media_file in files}, celery_app
+
+    return run
+
+
+class TestStuckFilesWithoutActiveCeleryTasks:
+    """Test identify_stuck_files_without_active_celery_tasks"""
+
+    def test_stale_file_without_running_task_is_stuck(
+        self, db_session, normal_user, detect_stuck_files
+    ):
+        """A file with no task activity for hours and nothing running in Celery is stuck"""
+        no_tasks = _add_file(db_session, normal_user, "no_tasks", _minutes_ago(120))
+        stale = _add_file(db_session, normal_user, "stale_task", _minutes_ago(120))
+        _add_task(db_session, normal_user, stale, "in_progress", _minutes_ago(120))
+        db_session.commit()
+
+        stuck, _ = detect_stuck_files(active={"worker@gpu": []})
+
+        assert stuck == {no_tasks.filename, stale.filename}
+
+    def test_long_running_task_is_not_stuck(self, db_session, normal_user, detect_stuck_files):
+        """A step that runs for a long time without reporting progress is left alone"""
+        media_file = _add_file(db_session, normal_user, "long_running", _minutes_ago(120))
+        task = _add_task(db_session, normal_user, media_file, "in_progress", _minutes_ago(120))
+        db_session.commit()
+
+        stuck, _ = detect_stuck_files(active={"worker@gpu": [{"id": task.id}]})
+
+        assert stuck == set()
+
+    def test_reserved_task_is_not_stuck(self, db_session, normal_user, detect_stuck_files):
+        """A task a worker has prefetched but not started is still live"""
+        media_file = _add_file(db_session, normal_user, "queued", _minutes_ago(120))
+        task = _add_task(db_session, normal_user, media_file, "pending", _minutes_ago(120))
+        db_session.commit()
+
+        stuck, _ = detect_stuck_files(
+            active={"worker@gpu": []}, reserved={"worker@gpu": [{"id": task.id}]}
+        )
+
+        assert stuck == set()
+
+    def test_recent_activity_is_not_stuck(self, db_session, normal_user, detect_stuck_files):
+        """Files updated within STUCK_FILE_THRESHOLD are not checked against Celery"""
+        media_file = _add_file(db_session, normal_user, "recent", _minutes_ago(10))
+        _add_task(db_session, normal_user, media_file, "in_progress", _minutes_ago(10))
+        db_session.commit()
+
+        stuck, celery_app = detect_stuck_files(active={"worker@gpu": []})
+
+        assert stuck == set()
+        celery_app.control.inspect.assert_not_called()
+
+    def test_no_recovery_when_workers_do_not_answer(
+        self, db_session, normal_user, detect_stuck_files
+    ):
+        """Without an answer from Celery nothing is reported as stuck"""
+        _add_file(db_session, normal_user, "unknown", _minutes_ago(120))
+        db_session.commit()
+
+        stuck, _ = detect_stuck_files(active=None)
+
+        assert stuck == set()
+
+
+class TestAbandonedFiles:
+    """Test abandoned file detection and TaskRecoveryService.reset_abandoned_files"""
+
+    def test_processing_files_without_active_tasks_are_abandoned(self, db_session, normal_user):
+        """Only PROCESSING files with no pending or in-progress task are abandoned"""
+        no_tasks = _add_file(db_session, normal_user, "no_tasks", _minutes_ago(5))
+        finished = _add_file(db_session, normal_user, "finished_tasks", _minutes_ago(5))
+        _add_task(db_session, normal_user, finished, "failed", _minutes_ago(5))
+        running = _add_file(db_session, normal_user, "running", _minutes_ago(5))
+        _add_task(db_session, normal_user, running, "in_progress", _minutes_ago(5))
+        _add_file(db_session, normal_user, "done", _minutes_ago(5), status=FileStatus.COMPLETED)
+        db_session.commit()
+
+        service = TaskDetectionService()
+
+        assert sorted(service.identify_abandoned_file_ids(db_session)) == sorted(
+            [no_tasks.id, finished.id]
+        )
+        assert {f.filename for f in service.identify_abandoned_files(db_session)} == {
+            "no_tasks",
+            "finished_tasks",
+        }
+
+    def test_reset_only_touches_files_still_processing(self, db_session, normal_user):
+        """Files that left PROCESSING after detection are not reset"""
+        abandoned = _add_file(db_session, normal_user, "abandoned", _minutes_ago(5))
+        completed_since = _add_file(db_session, normal_user, "completed_since", _minutes_ago(5))
+        db_session.commit()
+        file_ids = TaskDetectionService().identify_abandoned_file_ids(db_session)
+
+        completed_since.status = FileStatus.COMPLETED
+        db_session.commit()
+
+        reset_ids = TaskRecoveryService().reset_abandoned_files(db_session, file_ids)
+
+        assert reset_ids == [abandoned.id]
+        db_session.expire_all()
+        assert db_session.get(MediaFile, abandoned.id).status == FileStatus.PENDING
+        assert db_session.get(MediaFile, completed_since.id).status == FileStatus.COMPLETED
+
+    def test_reset_with_no_files_is_a_no_op(self, db_session):
+        """An empty ID list issues no update"""
+        assert TaskRecoveryService().reset_abandoned_files(db_session, []) == []
+
+
+class TestOrphanedTasks:
+    """Test orphaned task detection and TaskRecoveryService.recover_orphaned_tasks"""
+
+    def test_only_old_active_tasks_are_orphaned(self, db_session, normal_user, monkeypatch):
+        """Active tasks not updated within ORPHANED_TASK_THRESHOLD are orphaned"""
+        monkeypatch.setattr("app.services.task_detection_service.datetime", _NaiveUTCDatetime)
+        media_file = _add_file(db_session, normal_user, "file", _minutes_ago(120))
+        old = _add_task(db_session, normal_user, media_file, "in_progress", _minutes_ago(120))
+        _add_task(db_session, normal_user, media_file, "pending", _minutes_ago(10))
+        _add_task(db_session, normal_user, media_file, "completed", _minutes_ago(120))
+        db_session.commit()
+
+        rows = TaskDetectionService().identify_orphaned_tasks(db_session)
+
+        assert [(row.id, row.task_type, row.media_file_id) for row in rows] == [
+            (old.id, "transcription", media_file.id)
+        ]
+
+    def test_recovery_fails_tasks_with_one_update(self, db_session, normal_user, monkeypatch):
+        """Orphaned tasks are marked failed, except ones that finished since detection"""
+        monkeypatch.setattr("app.services.task_detection_service.datetime", _NaiveUTCDatetime)
+        media_file = _add_file(db_session, normal_user, "file", _minutes_ago(120))
+        orphaned = _add_task(db_session, normal_user, media_file, "in_progress", _minutes_ago(120))
+        finished = _add_task(db_session, normal_user, media_file, "pending", _minutes_ago(120))
+        db_session.commit()
+        rows = TaskDetectionService().identify_orphaned_tasks(db_session)
+
+        finished.status = "completed"
+        db_session.commit()
+
+        recovered = TaskRecoveryService().recover_orphaned_tasks(db_session, rows)
+
+        assert recovered == 1
+        db_session.expire_all()
+        orphaned = db_session.get(Task, orphaned.id)
+        assert orphaned.status == "failed"
+        assert orphaned.error_message == "Task interrupted by system restart"
+        assert orphaned.completed_at is not None
+        assert db_session.get(Task, finished.id).status == "completed"
+
+    def test_recovery_with_no_tasks_is_a_no_op(self, db_session):
+        """An empty row list issues no update"""
+        assert TaskRecoveryService().recover_orphaned_tasks(db_session, []) == 0
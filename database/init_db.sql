@@ -231,11 +231,14 @@ CREATE TABLE IF NOT EXISTS collection_member (
 CREATE INDEX IF NOT EXISTS idx_media_file_user_id ON media_file(user_id);
 CREATE INDEX IF NOT EXISTS idx_media_file_status ON media_file(status);
 CREATE INDEX IF NOT EXISTS idx_media_file_upload_time ON media_file(upload_time);
+CREATE INDEX IF NOT EXISTS idx_media_file_status_upload_time ON media_file(status, upload_time);
 CREATE INDEX IF NOT EXISTS idx_media_file_hash ON media_file(file_hash);
 CREATE INDEX IF NOT EXISTS idx_media_file_active_task_id ON media_file(active_task_id);
 CREATE INDEX IF NOT EXISTS idx_media_file_task_last_update ON media_file(task_last_update);
 CREATE INDEX IF NOT EXISTS idx_media_file_force_delete_eligible ON media_file(force_delete_eligible);
 CREATE INDEX IF NOT EXISTS idx_media_file_retry_count ON media_file(retry_count);
+CREATE INDEX IF NOT EXISTS idx_media_file_user_youtube_id ON media_file(user_id, (metadata_raw->>'youtube_id'))
+    WHERE (metadata_raw->>'youtube_id') IS NOT NULL;
 
 -- UUID indexes for fast external API lookups
 CREATE INDEX IF NOT EXISTS idx_user_uuid ON "user"(uuid);
@@ -260,6 +263,8 @@ CREATE INDEX IF NOT EXISTS idx_transcript_segment_speaker_id ON transcript_segme
 CREATE INDEX IF NOT EXISTS idx_task_user_id ON task(user_id);
 CREATE INDEX IF NOT EXISTS idx_task_status ON task(status);
 CREATE INDEX IF NOT EXISTS idx_task_media_file_id ON task(media_file_id);
+CREATE INDEX IF NOT EXISTS idx_task_active_updated_at ON task(updated_at)
+    WHERE status IN ('pending', 'in_progress');
 
 CREATE INDEX IF NOT EXISTS idx_collection_user_id ON collection(user_id);
 CREATE INDEX IF NOT EXISTS idx_collection_member_collection_id ON collection_member(collection_id);